@@ -1,5 +1,22 @@
 import random
 from typing import List, Dict, Optional
+from .intents import IntentMatcher
+
+# Keywords for intent detection, in priority order
+KEYWORDS = {
+    "greeting": ["hello", "hi", "hey", "good morning", "good afternoon", "sup", "what's up"],
+    "stress": ["stress", "stressed", "pressure", "tension", "overwhelm"],
+    "anxious": ["anxious", "anxiety", "panic", "worried", "nervous", "scared"],
+    "overwhelmed": ["overwhelmed", "too much", "can't handle", "drowning", "buried", "swamped"],
+    "tired": ["tired", "exhausted", "fatigue", "drained", "sleepy", "no energy", "can't sleep", "insomnia"],
+    "sad": ["sad", "unhappy", "cry", "crying", "depressed", "down", "blue", "lonely", "alone"],
+    "burnout": ["burnout", "burned out", "hate work", "quit", "give up"],
+    "positive": ["good", "great", "happy", "better", "well", "fine", "awesome", "amazing", "excited"],
+    "joke_request": ["joke", "funny", "laugh", "humor", "fun", "crack", "entertain", "cheer me up"],
+    "coffee": ["coffee", "caffeine", "espresso", "latte"]
+}
+
+_matcher = IntentMatcher(KEYWORDS)
 
 class MentalHealthBot:
     """Mental health support chatbot for burnout prevention - warm, empathetic companion"""
@@ -113,18 +130,7 @@ class MentalHealthBot:
         }
         
         # Keywords for intent detection
-        self.keywords = {
-            "greeting": ["hello", "hi", "hey", "good morning", "good afternoon", "sup", "what's up"],
-            "stress": ["stress", "stressed", "pressure", "tension", "overwhelm"],
-            "anxious": ["anxious", "anxiety", "panic", "worried", "nervous", "scared"],
-            "overwhelmed": ["overwhelmed", "too much", "can't handle", "drowning", "buried", "swamped"],
-            "tired": ["tired", "exhausted", "fatigue", "drained", "sleepy", "no energy", "can't sleep", "insomnia"],
-            "sad": ["sad", "unhappy", "cry", "crying", "depressed", "down", "blue", "lonely", "alone"],
-            "burnout": ["burnout", "burned out", "hate work", "quit", "give up"],
-            "positive": ["good", "great", "happy", "better", "well", "fine", "awesome", "amazing", "excited"],
-            "joke_request": ["joke", "funny", "laugh", "humor", "fun", "crack", "entertain", "cheer me up"],
-            "coffee": ["coffee", "caffeine", "espresso", "latte"]
-        }
+        self.keywords = KEYWORDS
     
     def generate_response(self, user_message: str, user_context: Optional[Dict] = None, history: List[Dict] = None) -> str:
         """
@@ -300,13 +306,7 @@ class MentalHealthBot:
     
     def _detect_intent(self, message: str) -> str:
         """Detect user intent from message"""
-        import re
-        for intent, keywords in self.keywords.items():
-            for keyword in keywords:
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                if re.search(pattern, message):
-                    return intent
-        return "general"
+        return _matcher.match(message).intent
     
     def analyze_sentiment(self, message: str) -> str:
         """Analyze sentiment of user message"""
@@ -0,0 +1,126 @@
+import os
+import time
+import threading
+from typing import Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for the LLM call.
+
+    - closed: calls go through; failure_threshold consecutive failures or
+      slow calls (slower than slow_call_seconds) open the circuit.
+    - open: calls are rejected immediately for recovery_seconds, so callers
+      serve their fallback without paying the upstream timeout.
+    - half_open: up to half_open_max_calls probes are let through;
+      success_threshold successful probes close it, any failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, slow_call_seconds: float = 6.0, recovery_seconds: float = 30.0,
+                 half_open_max_calls: int = 1, success_threshold: int = 2, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._probe_successes = 0
+        self._probes_in_flight = 0
+        self.rejected = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_seconds:
+            self._state = HALF_OPEN
+            self._probe_successes = 0
+            self._probes_in_flight = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Ask permission to make a call; every True must be followed by record_*"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, duration: float) -> None:
+        if duration > self.slow_call_seconds:
+            with self._lock:
+                self.slow_calls += 1
+                self._on_failure()
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._probe_successes += 1
+                if self._probe_successes >= self.success_threshold:
+                    self._state = CLOSED
+                    self._consecutive_failures = 0
+            else:
+                self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._on_failure()
+
+    def release(self) -> None:
+        """Give back a permit without an outcome (e.g. the caller was cancelled)"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _on_failure(self) -> None:
+        if self._state == HALF_OPEN:
+            self._open()
+            return
+        self._consecutive_failures += 1
+        if self._state == CLOSED and self._consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.times_opened += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._consecutive_failures,
+                "failures": self.failures,
+                "slow_calls": self.slow_calls,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+            }
+
+
+LLM_BREAKER = CircuitBreaker(
+    failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+    slow_call_seconds=float(os.getenv("LLM_BREAKER_SLOW_SECONDS", "6")),
+    recovery_seconds=float(os.getenv("LLM_BREAKER_RECOVERY_SECONDS", "30")),
+    half_open_max_calls=int(os.getenv("LLM_BREAKER_PROBES", "1")),
+    success_threshold=int(os.getenv("LLM_BREAKER_CLOSE_AFTER", "2")),
+)
@@ -0,0 +1,92 @@
+import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict
+
+
+class BulkheadRejected(Exception):
+    """The call was not admitted to the bulkhead"""
+
+
+class BulkheadFull(BulkheadRejected):
+    """Every slot is busy and the wait queue is full"""
+
+
+class BulkheadTimeout(BulkheadRejected):
+    """Waited in the queue longer than the queue deadline"""
+
+
+class Bulkhead:
+    """
+    Caps concurrent outbound LLM calls in this process. Up to max_concurrent
+    calls run at once, up to max_queue more wait (each for at most
+    queue_timeout seconds) and anything beyond that is rejected immediately.
+    """
+
+    def __init__(self, max_concurrent: int = 8, max_queue: int = 32, queue_timeout: float = 5.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        if not self._semaphore.locked():
+            # Free slot: acquire() returns without suspending
+            await self._semaphore.acquire()
+            waited = 0.0
+        else:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise BulkheadFull()
+            self.queued += 1
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                raise BulkheadTimeout()
+            finally:
+                self.queued -= 1
+                waited = time.monotonic() - started
+                self.max_wait = max(self.max_wait, waited)
+
+        self.last_wait = waited
+        self.admitted += 1
+        self.total_wait += waited
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_queue_wait_ms": round(self.total_wait / self.admitted * 1000, 2) if self.admitted else 0.0,
+            "max_queue_wait_ms": round(self.max_wait * 1000, 2),
+            "last_queue_wait_ms": round(self.last_wait * 1000, 2),
+        }
+
+
+LLM_BULKHEAD = Bulkhead(
+    max_concurrent=int(os.getenv("LLM_MAX_CONCURRENT", "8")),
+    max_queue=int(os.getenv("LLM_MAX_QUEUE", "32")),
+    queue_timeout=float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "5")),
+)
@@ -1,5 +1,8 @@
 import os
+import time
+import asyncio
 import logging
+from typing import AsyncIterator
 
 try:
     from dotenv import load_dotenv
@@ -7,8 +10,18 @@ try:
 except ImportError:
     pass  # On Render, env vars are set via dashboard
 
+import httpx
 from google import genai
-from .memory import save_message
+from google.genai import types
+from .memory import MEMORY, MemoryStore
+from .router import ROUTER, ReplyRouter
+from .breaker import LLM_BREAKER, CircuitBreaker
+from .reply_cache import REPLY_CACHE, ReplyCache
+from .bulkhead import LLM_BULKHEAD, Bulkhead, BulkheadFull, BulkheadRejected
+from .prompt import PROMPT_BUILDER, PromptBuilder
+from .intents import detect_intent
+from .templates import pick_template
+from .knowledge import get_tip
 
 logger = logging.getLogger(__name__)
 
@@ -16,40 +29,256 @@ _api_key = os.getenv("GEMINI_API_KEY")
 if not _api_key:
     logger.error("GEMINI_API_KEY is not set! Chatbot will use fallback responses.")
 
-_client = genai.Client(api_key=_api_key)
+# One pooled async HTTP connection set shared by every request in this worker,
+# so concurrent chats reuse keep-alive connections instead of opening new ones.
+_pool_limits = httpx.Limits(
+    max_connections=int(os.getenv("GEMINI_MAX_CONNECTIONS", "50")),
+    max_keepalive_connections=int(os.getenv("GEMINI_MAX_KEEPALIVE", "20")),
+)
+
+# Hard per-call deadline for the LLM; the breaker treats calls slower than
+# LLM_BREAKER_SLOW_SECONDS as failures well before this is reached.
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "10"))
+
+_client = genai.Client(
+    api_key=_api_key,
+    http_options=types.HttpOptions(
+        timeout=int(LLM_DEADLINE_SECONDS * 1000),
+        async_client_args={"limits": _pool_limits},
+    ),
+)
+
+MODEL_NAME = "gemini-2.0-flash"
+
+FALLBACK_REPLY = "I'm here with you. It sounds like a lot is going on — take a breath, one thing at a time."
+
+
+async def _until_deadline(stream, deadline: float) -> AsyncIterator:
+    """
+    Iterate an LLM stream until the loop-time `deadline`, then raise
+    TimeoutError. Time the caller spends between chunks counts too. (An
+    asyncio.timeout() block can't span the caller's yields: it would cancel
+    whatever the consumer is awaiting instead of this stream.)
+    """
+    loop = asyncio.get_running_loop()
+    iterator = stream.__aiter__()
+    try:
+        while True:
+            left = deadline - loop.time()
+            if left <= 0:
+                raise asyncio.TimeoutError()
+            try:
+                chunk = await asyncio.wait_for(iterator.__anext__(), timeout=left)
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def close_client():
+    """Release the pooled async connections (called on app shutdown)"""
+    try:
+        await _client.aio.aclose()
+    except Exception as e:
+        logger.warning(f"Closing Gemini async client failed: {type(e).__name__}: {e}")
 
 
 class BurnAwareChatbot:
 
-    def generate_reply(self, user_id: str, user_data: dict, message: str) -> str:
-        name = user_data.get("name", "friend")
-        mood = user_data.get("mood", "okay")
-        stress = user_data.get("stress", 5)
-
-        system_prompt = f"""You are Ember, a warm and empathetic wellness assistant inside an app called BurnAware.
-You are talking to {name}.
-Their current mood is: {mood}.
-Their stress level is: {stress} out of 10.
-
-Your job is to:
-- Respond with empathy and warmth, not clinical advice.
-- Keep responses short: 2-3 sentences max.
-- Offer ONE gentle, practical suggestion when appropriate.
-- Match the energy — if they're venting, validate first. If they're doing well, celebrate with them.
-- Never use bullet points or headers. Sound like a caring friend, not a therapist.
-- If stress is above 7, prioritize emotional support over tips.
-- Do not repeat the user's name too often."""
+    def __init__(self, memory: MemoryStore = None, router: ReplyRouter = None, breaker: CircuitBreaker = None,
+                 reply_cache: ReplyCache = None, bulkhead: Bulkhead = None, prompt_builder: PromptBuilder = None):
+        self.memory = memory if memory is not None else MEMORY
+        self.router = router if router is not None else ROUTER
+        self.breaker = breaker if breaker is not None else LLM_BREAKER
+        self.reply_cache = reply_cache if reply_cache is not None else REPLY_CACHE
+        self.bulkhead = bulkhead if bulkhead is not None else LLM_BULKHEAD
+        self.prompt_builder = prompt_builder if prompt_builder is not None else PROMPT_BUILDER
+
+    def _answer_without_llm(self, user_id: str, user_data: dict, message: str):
+        """Local template or cached reply, plus the reply-cache key for this message"""
+        local_reply = self.router.route(user_data, message)
+        if local_reply is not None:
+            return local_reply, None
+        # The prompt will quote this user's earlier turns, so the reply isn't theirs to share
+        has_context = bool(self.memory.get_turns(user_id) or self.memory.get_summary(user_id))
+        cache_key = self.reply_cache.key_for(user_data, message, has_context=has_context)
+        return self.reply_cache.get(cache_key, user_data), cache_key
 
+    def _fallback_reply(self, user_data: dict, message: str) -> str:
+        """Template reply used when the LLM is unavailable"""
+        intent = detect_intent(message)
         try:
-            response = _client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=f"{system_prompt}\n\nUser: {message}\nEmber:"
+            reply = pick_template(intent).format(
+                name=user_data.get("name", "friend"),
+                stress=user_data.get("stress", 5)
             )
-            reply = response.text.strip()
-        except Exception as e:
-            logger.error(f"Gemini API call failed: {type(e).__name__}: {e}")
-            reply = "I'm here with you. It sounds like a lot is going on — take a breath, one thing at a time."
+        except (KeyError, IndexError):
+            return FALLBACK_REPLY
+        tip = get_tip(intent)
+        return f"{reply} {tip}" if tip else f"{reply} {FALLBACK_REPLY}"
+
+    def _build_prompt(self, user_id: str, user_data: dict, message: str) -> str:
+        prompt = self.prompt_builder.build(
+            user_data,
+            message,
+            turns=self.memory.get_turns(user_id),
+            summary=self.memory.get_summary(user_id)
+        )
+        logger.debug(
+            f"Prompt for user {user_id}: ~{prompt.tokens} tokens, "
+            f"{prompt.turns_included} turns included, {prompt.turns_dropped} summarized"
+        )
+        return prompt.text
+
+    def generate_reply(self, user_id: str, user_data: dict, message: str) -> str:
+        reply, cache_key = self._answer_without_llm(user_id, user_data, message)
+        if reply is not None:
+            self.memory.save_message(user_id, message, reply)
+            return reply
+
+        if not self.breaker.allow():
+            reply = self._fallback_reply(user_data, message)
+        else:
+            started = time.monotonic()
+            try:
+                response = _client.models.generate_content(
+                    model=MODEL_NAME,
+                    contents=self._build_prompt(user_id, user_data, message)
+                )
+                reply = (response.text or "").strip()
+                if reply:
+                    self.breaker.record_success(time.monotonic() - started)
+                    self.reply_cache.put(cache_key, user_data, reply)
+                else:
+                    # No text (e.g. a safety block): answered, but nothing usable
+                    self.breaker.release()
+                    reply = self._fallback_reply(user_data, message)
+            except Exception as e:
+                self.breaker.record_failure()
+                logger.error(f"Gemini API call failed: {type(e).__name__}: {e}")
+                reply = self._fallback_reply(user_data, message)
 
         # Save to memory
-        save_message(user_id, message, reply)
+        self.memory.save_message(user_id, message, reply)
+        return reply
+
+    async def agenerate_reply(self, user_id: str, user_data: dict, message: str) -> str:
+        """
+        Async variant of generate_reply that never blocks the event loop.
+        Raises BulkheadFull when too many LLM calls are already queued.
+        """
+        reply, cache_key = self._answer_without_llm(user_id, user_data, message)
+        if reply is not None:
+            self.memory.save_message(user_id, message, reply)
+            return reply
+
+        if not self.breaker.allow():
+            reply = self._fallback_reply(user_data, message)
+        else:
+            recorded = False
+            try:
+                async with self.bulkhead.slot():
+                    started = time.monotonic()
+                    response = await asyncio.wait_for(
+                        _client.aio.models.generate_content(
+                            model=MODEL_NAME,
+                            contents=self._build_prompt(user_id, user_data, message)
+                        ),
+                        timeout=LLM_DEADLINE_SECONDS
+                    )
+                reply = (response.text or "").strip()
+                if reply:
+                    self.breaker.record_success(time.monotonic() - started)
+                    recorded = True
+                    self.reply_cache.put(cache_key, user_data, reply)
+                else:
+                    # No text (e.g. a safety block): answered, but nothing usable
+                    reply = self._fallback_reply(user_data, message)
+            except BulkheadFull:
+                raise
+            except BulkheadRejected:
+                # Waited too long for a slot; the upstream itself wasn't at fault
+                reply = self._fallback_reply(user_data, message)
+            except Exception as e:
+                self.breaker.record_failure()
+                recorded = True
+                logger.error(f"Gemini API call failed: {type(e).__name__}: {e}")
+                reply = self._fallback_reply(user_data, message)
+            finally:
+                if not recorded:
+                    self.breaker.release()
+
+        self.memory.save_message(user_id, message, reply)
         return reply
+
+    async def astream_reply(self, user_id: str, user_data: dict, message: str) -> AsyncIterator[str]:
+        """Yield the reply chunk by chunk as Gemini produces it"""
+        reply, cache_key = self._answer_without_llm(user_id, user_data, message)
+        if reply is not None:
+            self.memory.save_message(user_id, message, reply)
+            yield reply
+            return
+
+        if not self.breaker.allow():
+            reply = self._fallback_reply(user_data, message)
+            self.memory.save_message(user_id, message, reply)
+            yield reply
+            return
+
+        chunks = []
+        recorded = False
+        try:
+            async with self.bulkhead.slot():
+                started = time.monotonic()
+                first_chunk_after = None
+                # The deadline covers the whole reply, not just opening the stream
+                deadline = asyncio.get_running_loop().time() + LLM_DEADLINE_SECONDS
+                stream = await asyncio.wait_for(
+                    _client.aio.models.generate_content_stream(
+                        model=MODEL_NAME,
+                        contents=self._build_prompt(user_id, user_data, message)
+                    ),
+                    timeout=LLM_DEADLINE_SECONDS
+                )
+                async for chunk in _until_deadline(stream, deadline):
+                    if first_chunk_after is None:
+                        first_chunk_after = time.monotonic() - started
+                    text = chunk.text or ""
+                    if not chunks:
+                        text = text.lstrip()
+                    if not text:
+                        continue
+                    chunks.append(text)
+                    yield text
+            if chunks:
+                # Streams are judged on time to first token, not total length
+                self.breaker.record_success(first_chunk_after or 0.0)
+                recorded = True
+                self.reply_cache.put(cache_key, user_data, "".join(chunks).strip())
+            else:
+                # The stream ended without text (e.g. a safety block); neither
+                # cache nor persist a blank reply. The permit is released below.
+                chunks.append(self._fallback_reply(user_data, message))
+                yield chunks[-1]
+        except BulkheadRejected:
+            # Headers are already sent, so a busy bulkhead degrades to the fallback
+            chunks.append(self._fallback_reply(user_data, message))
+            yield chunks[-1]
+        except Exception as e:
+            self.breaker.record_failure()
+            recorded = True
+            logger.error(f"Gemini streaming call failed: {type(e).__name__}: {e}")
+            if not chunks:
+                fallback = self._fallback_reply(user_data, message)
+                chunks.append(fallback)
+                yield fallback
+        finally:
+            # Client went away mid-stream: free the permit without judging upstream
+            if not recorded:
+                self.breaker.release()
+
+        reply = "".join(chunks).strip()
+        self.memory.save_message(user_id, message, reply)
@@ -1,34 +1,124 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Intent rules in priority order: when a message contains keywords from several
+# intents, the first intent listed here wins.
+RULES = {
+    "greeting": ["hi", "hello", "hey", "greetings", "good morning", "good evening", "yo", "hiya"],
+    "farewell": ["bye", "goodbye", "see you", "cya", "night", "good night"],
+    "agreement": ["yes", "yeah", "yep", "sure", "okay", "ok", "please", "do it"],
+    "disagreement": ["no", "nope", "nah", "not really", "don't"],
+    "stress_high": ["stressed", "overwhelmed", "tired", "burnout", "exhausted", "pressure", "heavy", "anxious", "panic"],
+    "study_help": ["exam", "study", "assignment", "deadline", "test", "homework", "project"],
+    "sleep_problem": ["sleep", "insomnia", "awake", "late night", "tired", "can't sleep"],
+    "motivation": ["lazy", "unmotivated", "can't focus", "procrastinating", "stuck", "bored"],
+    "venting": ["hate", "frustrated", "angry", "annoyed", "upset", "mad", "sad", "cry"],
+    "gratitude": ["thanks", "thank you", "appreciate", "cool", "nice"]
+}
+
+# Whole-message shortcuts checked before keyword matching
+EXACT = {
+    "no": "disagreement", "nah": "disagreement", "nope": "disagreement",
+    "yes": "agreement", "yeah": "agreement", "yep": "agreement", "ok": "agreement", "okay": "agreement",
+}
+
+
+class IntentMatch(NamedTuple):
+    intent: str
+    # (intent, start, end) for every keyword hit, in text order
+    spans: List[Tuple[str, int, int]]
+    confidence: float
+
+
+class IntentMatcher:
+    """
+    Single-pass keyword intent detector.
+
+    All keywords are compiled into one alternation wrapped in a lookahead, so a
+    single finditer over the text reports every keyword hit (including ones that
+    overlap, e.g. "night" inside "late night") with the same word-boundary rules
+    as a per-keyword r'\\bkw\\b' search. At each position the alternatives are
+    tried in priority order, so the best intent starting there is never shadowed.
+    """
+
+    def __init__(self, rules: Dict[str, List[str]], exact: Optional[Dict[str, str]] = None, default: str = "general"):
+        self.default = default
+        self.exact = exact or {}
+        self.priority = {intent: rank for rank, intent in enumerate(rules)}
+
+        # A keyword listed under several intents belongs to the highest-priority one
+        self.keyword_intent: Dict[str, str] = {}
+        for intent, keywords in rules.items():
+            for k in keywords:
+                self.keyword_intent.setdefault(k.lower(), intent)
+
+        ordered = sorted(
+            self.keyword_intent,
+            key=lambda k: (self.priority[self.keyword_intent[k]], -len(k))
+        )
+        alternation = "|".join(re.escape(k) for k in ordered)
+        self.pattern = re.compile(r"\b(?=(" + alternation + r")\b)")
+
+    def match(self, text: str) -> IntentMatch:
+        """Return the winning intent, all keyword spans and a confidence score"""
+        text = text.lower()
+
+        exact = self.exact.get(text)
+        if exact:
+            return IntentMatch(exact, [(exact, 0, len(text))], 1.0)
+
+        spans = []
+        best = None
+        for m in self.pattern.finditer(text):
+            keyword = m.group(1)
+            intent = self.keyword_intent[keyword]
+            start = m.start()
+            spans.append((intent, start, start + len(keyword)))
+            if best is None or self.priority[intent] < self.priority[best]:
+                best = intent
+
+        if best is None:
+            return IntentMatch(self.default, spans, 0.0)
+
+        return IntentMatch(best, spans, self._confidence(text, best, spans))
+
+    def match_many(self, texts: List[str]) -> List[IntentMatch]:
+        """Batch variant of match for scoring many messages at once"""
+        match = self.match
+        return [match(t) for t in texts]
+
+    @staticmethod
+    def _confidence(text: str, intent: str, spans: List[Tuple[str, int, int]]) -> float:
+        """
+        0.5 for any keyword hit, rising towards 1.0 as the winning intent's
+        keywords cover more of the message.
+        """
+        covered = 0
+        reach = 0
+        for span_intent, start, end in spans:  # spans are sorted by start
+            if span_intent != intent or end <= reach:
+                continue
+            covered += end - max(start, reach)
+            reach = end
+        total = len(text.strip()) or 1
+        return round(0.5 + 0.5 * min(covered / total, 1.0), 3)
+
+
+# Built once at import and shared by every caller
+_matcher = IntentMatcher(RULES, EXACT)
+
+
+def match_intent(text: str) -> IntentMatch:
+    return _matcher.match(text)
+
+
+def match_intents(texts: List[str]) -> List[IntentMatch]:
+    return _matcher.match_many(texts)
+
 
 def detect_intent(text: str) -> str:
-    text = text.lower()
-
-    rules = {
-        "greeting": ["hi", "hello", "hey", "greetings", "good morning", "good evening", "yo", "hiya"],
-        "farewell": ["bye", "goodbye", "see you", "cya", "night", "good night"],
-        "agreement": ["yes", "yeah", "yep", "sure", "okay", "ok", "please", "do it"],
-        "disagreement": ["no", "nope", "nah", "not really", "don't"],
-        "stress_high": ["stressed", "overwhelmed", "tired", "burnout", "exhausted", "pressure", "heavy", "anxious", "panic"],
-        "study_help": ["exam", "study", "assignment", "deadline", "test", "homework", "project"],
-        "sleep_problem": ["sleep", "insomnia", "awake", "late night", "tired", "can't sleep"],
-        "motivation": ["lazy", "unmotivated", "can't focus", "procrastinating", "stuck", "bored"],
-        "venting": ["hate", "frustrated", "angry", "annoyed", "upset", "mad", "sad", "cry"],
-        "gratitude": ["thanks", "thank you", "appreciate", "cool", "nice"]
-    }
-
-    import re
-    
-    # Check for exact matches first for short words
-    if text in ["no", "nah", "nope"]:
-        return "disagreement"
-    if text in ["yes", "yeah", "yep", "ok", "okay"]:
-        return "agreement"
-
-    for intent, keywords in rules.items():
-        for k in keywords:
-            # Escape keyword to safely use in regex
-            # Word boundary check to avoid partial matches (e.g. "hell" in "hello")
-            pattern = r'\b' + re.escape(k) + r'\b'
-            if re.search(pattern, text):
-                return intent
-
-    return "general"
+    return _matcher.match(text).intent
+
+
+def detect_intents(texts: List[str]) -> List[str]:
+    return [m.intent for m in _matcher.match_many(texts)]
@@ -1,15 +1,183 @@
-from collections import defaultdict, deque
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Dict, List, Tuple
 
-MEMORY = defaultdict(lambda: deque(maxlen=5))
+from .intents import detect_intent
+
+Turn = Tuple[str, str]  # (user message, bot reply)
+
+# How folded-away turns are described in the running summary
+TOPIC_LABELS = {
+    "stress_high": "feeling stressed or overwhelmed",
+    "study_help": "studies and deadlines",
+    "sleep_problem": "sleep trouble",
+    "motivation": "low motivation",
+    "venting": "frustration",
+}
+
+
+class ConversationSummary:
+    """
+    Compact, extractive summary of turns that no longer fit in memory: the
+    topics raised so far plus a few short quotes. Built without an LLM call,
+    so folding a turn costs microseconds.
+    """
+
+    def __init__(self, max_topics: int = 6, max_notes: int = 3, note_chars: int = 80):
+        self.max_topics = max_topics
+        self.note_chars = note_chars
+        self.topics: List[str] = []
+        self.notes: deque = deque(maxlen=max_notes)
+        self.turns_folded = 0
+
+    def fold(self, turn: Turn) -> None:
+        message = turn[0].strip()
+        label = TOPIC_LABELS.get(detect_intent(message))
+        if label and label not in self.topics:
+            self.topics.append(label)
+            del self.topics[:-self.max_topics]
+        if len(message.split()) > 3:
+            note = message if len(message) <= self.note_chars else message[:self.note_chars - 3].rstrip() + "..."
+            self.notes.append(note)
+        self.turns_folded += 1
+
+    def render(self) -> str:
+        if not self.turns_folded:
+            return ""
+        parts = []
+        if self.topics:
+            parts.append("They have talked about " + ", ".join(self.topics) + ".")
+        if self.notes:
+            parts.append("Earlier they said: " + " / ".join(f'"{n}"' for n in self.notes))
+        return " ".join(parts)
+
+
+class MemoryStore(ABC):
+    """Interface the chatbot engine uses for short-term conversation memory"""
+
+    @abstractmethod
+    def save_message(self, user_id: str, message: str, reply: str) -> None:
+        ...
+
+    @abstractmethod
+    def get_turns(self, user_id: str) -> List[Turn]:
+        ...
+
+    def get_summary(self, user_id: str) -> str:
+        """Running summary of turns that have been folded out of memory"""
+        return ""
+
+    @abstractmethod
+    def clear(self, user_id: str) -> None:
+        ...
+
+    def get_history(self, user_id: str) -> str:
+        turns = self.get_turns(user_id)
+        if not turns:
+            return ""
+        # Join the last few messages to provide context
+        return " ".join([f"User: {m} Bot: {r}" for m, r in turns])
+
+
+class BoundedMemoryStore(MemoryStore):
+    """
+    In-process memory with a global user cap, LRU + idle-TTL eviction and a
+    per-user turn limit; turns pushed out by the limit are folded into a
+    per-user ConversationSummary. Entries are kept in an OrderedDict in
+    last-access order, so both LRU eviction and TTL expiry only ever look at
+    the front: every operation is O(1) (amortized for expiry).
+    """
+
+    def __init__(self, max_users: int = 10000, ttl_seconds: float = 3600, max_turns: int = 5, clock=time.monotonic):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self.max_turns = max_turns
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, deque, ConversationSummary]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.ttl_seconds
+        while self._entries:
+            user_id, (last_seen, _, _) = next(iter(self._entries.items()))
+            if last_seen > cutoff:
+                break
+            self._entries.popitem(last=False)
+            self.expirations += 1
+
+    def save_message(self, user_id: str, message: str, reply: str) -> None:
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            entry = self._entries.pop(user_id, None)
+            if entry:
+                _, turns, summary = entry
+            else:
+                turns, summary = deque(maxlen=self.max_turns), ConversationSummary()
+            if len(turns) == turns.maxlen:
+                summary.fold(turns[0])
+            turns.append((message, reply))
+            self._entries[user_id] = (now, turns, summary)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_turns(self, user_id: str) -> List[Turn]:
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            entry = self._entries.get(user_id)
+            if entry is None:
+                # Reading never creates an entry
+                self.misses += 1
+                return []
+            self.hits += 1
+            self._entries[user_id] = (now, entry[1], entry[2])
+            self._entries.move_to_end(user_id)
+            return list(entry[1])
+
+    def get_summary(self, user_id: str) -> str:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            return entry[2].render() if entry else ""
+
+    def clear(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "users": len(self._entries),
+            "max_users": self.max_users,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+MEMORY = BoundedMemoryStore(
+    max_users=int(os.getenv("CHAT_MEMORY_MAX_USERS", "10000")),
+    ttl_seconds=float(os.getenv("CHAT_MEMORY_TTL_SECONDS", "3600")),
+    max_turns=int(os.getenv("CHAT_MEMORY_TURNS", "5")),
+)
 
 
 def save_message(user_id, message, reply):
-    MEMORY[user_id].append((message, reply))
+    MEMORY.save_message(user_id, message, reply)
 
 
 def get_history(user_id):
-    history = MEMORY[user_id]
-    if not history:
-        return ""
-    # Join the last few messages to provide context
-    return " ".join([f"User: {m} Bot: {r}" for m, r in history])
+    return MEMORY.get_history(user_id)
@@ -0,0 +1,114 @@
+import os
+import threading
+from typing import Dict, List, NamedTuple
+
+from .memory import ConversationSummary, Turn
+
+# Identical for every request, so it always comes first in the prompt
+STATIC_PREFIX = """You are Ember, a warm and empathetic wellness assistant inside an app called BurnAware.
+
+Your job is to:
+- Respond with empathy and warmth, not clinical advice.
+- Keep responses short: 2-3 sentences max.
+- Offer ONE gentle, practical suggestion when appropriate.
+- Match the energy — if they're venting, validate first. If they're doing well, celebrate with them.
+- Never use bullet points or headers. Sound like a caring friend, not a therapist.
+- If stress is above 7, prioritize emotional support over tips.
+- Do not repeat the user's name too often."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+class BuiltPrompt(NamedTuple):
+    text: str
+    tokens: int
+    turns_included: int
+    turns_dropped: int
+
+
+class PromptBuilder:
+    """
+    Assembles the LLM prompt: static prefix, per-user context, a running
+    summary of older turns, as many recent turns as fit in history_tokens and
+    finally the new message. Input size stays flat however long the
+    conversation gets.
+    """
+
+    def __init__(self, history_tokens: int = 400, summary_tokens: int = 120):
+        self.history_tokens = history_tokens
+        self.summary_tokens = summary_tokens
+        self._prefix_tokens = estimate_tokens(STATIC_PREFIX)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.total_tokens = 0
+        self.max_tokens = 0
+        self.last_tokens = 0
+
+    def build(self, user_data: dict, message: str, turns: List[Turn] = (), summary: str = "") -> BuiltPrompt:
+        name = user_data.get("name", "friend")
+        mood = user_data.get("mood", "okay")
+        stress = user_data.get("stress", 5)
+
+        context = f"""You are talking to {name}.
+Their current mood is: {mood}.
+Their stress level is: {stress} out of 10."""
+
+        # Newest turns first until the history budget is spent
+        kept: List[str] = []
+        budget = self.history_tokens
+        for message_text, reply in reversed(list(turns)):
+            line = f"User: {message_text}\nEmber: {reply}"
+            cost = estimate_tokens(line)
+            if cost > budget:
+                break
+            kept.append(line)
+            budget -= cost
+        kept.reverse()
+        dropped = len(turns) - len(kept)
+        if dropped:
+            # Turns that didn't fit are folded into this prompt's summary
+            overflow = ConversationSummary()
+            for turn in list(turns)[:dropped]:
+                overflow.fold(turn)
+            summary = f"{summary} {overflow.render()}".strip()
+
+        if summary and estimate_tokens(summary) > self.summary_tokens:
+            summary = summary[:self.summary_tokens * 4 - 3].rstrip() + "..."
+
+        sections = [STATIC_PREFIX, context]
+        if summary:
+            sections.append(f"Summary of earlier conversation: {summary}")
+        if kept:
+            sections.append("Recent conversation:\n" + "\n".join(kept))
+        sections.append(f"User: {message}\nEmber:")
+
+        text = "\n\n".join(sections)
+        tokens = estimate_tokens(text)
+        self._record(tokens)
+        return BuiltPrompt(text, tokens, len(kept), dropped)
+
+    def _record(self, tokens: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.total_tokens += tokens
+            self.max_tokens = max(self.max_tokens, tokens)
+            self.last_tokens = tokens
+
+    def stats(self) -> Dict:
+        return {
+            "history_token_budget": self.history_tokens,
+            "static_prefix_tokens": self._prefix_tokens,
+            "prompts_built": self.requests,
+            "avg_prompt_tokens": round(self.total_tokens / self.requests, 1) if self.requests else 0.0,
+            "max_prompt_tokens": self.max_tokens,
+            "last_prompt_tokens": self.last_tokens,
+        }
+
+
+PROMPT_BUILDER = PromptBuilder(
+    history_tokens=int(os.getenv("CHAT_PROMPT_HISTORY_TOKENS", "400")),
+    summary_tokens=int(os.getenv("CHAT_PROMPT_SUMMARY_TOKENS", "120")),
+)
@@ -0,0 +1,155 @@
+import os
+import re
+import time
+import random
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .intents import IntentMatcher, detect_intent
+
+# Messages mentioning any of these always get a fresh, individual reply
+DISTRESS_KEYWORDS = [
+    "suicide", "suicidal", "kill myself", "killing myself", "end it all", "end my life", "want to die",
+    "wanna die", "die", "dying", "dead", "better off dead", "overdose", "od", "pills",
+    "self harm", "self-harm", "hurt myself", "hurting myself", "harm myself", "cutting", "cut myself",
+    "no reason to live", "nothing to live for", "can't go on", "cant go on", "give up on life",
+    "don't want to be here", "dont want to be here", "don't want to live", "dont want to live",
+    "disappear", "not worth living", "hopeless", "worthless", "panic attack", "abuse", "abused",
+    "emergency",
+]
+
+_distress = IntentMatcher({"distress": DISTRESS_KEYWORDS})
+
+_NON_WORD = re.compile(r"[^\w\s']+")
+_SPACES = re.compile(r"\s+")
+
+# Stands in for the user's name inside cached replies
+_NAME_SLOT = "\x00name\x00"
+
+CacheKey = Tuple[str, str, str, str]
+
+
+def is_distress(message: str) -> bool:
+    return _distress.match(message).intent == "distress"
+
+
+def normalize(message: str) -> str:
+    text = _NON_WORD.sub(" ", message.lower())
+    return _SPACES.sub(" ", text).strip()
+
+
+def stress_bucket(stress) -> str:
+    try:
+        stress = float(stress)
+    except (TypeError, ValueError):
+        return "mid"
+    if stress <= 3:
+        return "low"
+    if stress <= 6:
+        return "mid"
+    return "high"
+
+
+class ReplyCache:
+    """
+    LRU + TTL cache of LLM replies keyed on (normalized text, intent, mood,
+    stress bucket). Each key holds a small pool of LLM replies: the first
+    pool_size lookups for a key miss (so the LLM fills the pool), later ones
+    are served a random reply from it. Only replies to context-free prompts
+    are shareable: once a conversation has earlier turns the prompt carries
+    them, so those messages are never cached.
+    """
+
+    def __init__(self, max_entries: int = 2000, ttl_seconds: float = 3600, pool_size: int = 3,
+                 enabled: bool = True, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.pool_size = pool_size
+        self.enabled = enabled
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.bypassed_context = 0
+        self.evictions = 0
+
+    def key_for(self, user_data: dict, message: str, has_context: bool = False) -> Optional[CacheKey]:
+        """Cache key for a message, or None if it must not be cached"""
+        if not self.enabled:
+            return None
+        if has_context:
+            with self._lock:
+                self.bypassed_context += 1
+            return None
+        if is_distress(message):
+            with self._lock:
+                self.bypassed += 1
+            return None
+        return (
+            normalize(message),
+            detect_intent(message),
+            str(user_data.get("mood", "okay")).lower(),
+            stress_bucket(user_data.get("stress", 5)),
+        )
+
+    def get(self, key: Optional[CacheKey], user_data: dict) -> Optional[str]:
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None or len(entry[1]) < self.pool_size:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            reply = random.choice(entry[1])
+        return reply.replace(_NAME_SLOT, str(user_data.get("name", "friend")))
+
+    def put(self, key: Optional[CacheKey], user_data: dict, reply: str) -> None:
+        if key is None or not reply:
+            return
+        name = str(user_data.get("name", ""))
+        if len(name) > 1 and name != "friend":
+            reply = re.sub(rf"\b{re.escape(name)}\b", _NAME_SLOT, reply)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._clock() - entry[0] > self.ttl_seconds:
+                entry = (self._clock(), [])
+                self._entries[key] = entry
+            if len(entry[1]) < self.pool_size:
+                entry[1].append(reply)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "bypassed_distress": self.bypassed,
+            "bypassed_context": self.bypassed_context,
+            "evictions": self.evictions,
+        }
+
+
+REPLY_CACHE = ReplyCache(
+    max_entries=int(os.getenv("CHAT_REPLY_CACHE_SIZE", "2000")),
+    ttl_seconds=float(os.getenv("CHAT_REPLY_CACHE_TTL_SECONDS", "3600")),
+    pool_size=int(os.getenv("CHAT_REPLY_CACHE_POOL", "3")),
+    enabled=os.getenv("CHAT_REPLY_CACHE", "false").lower() == "true",
+)
@@ -0,0 +1,101 @@
+import os
+import re
+import threading
+from typing import Dict, Iterable, Optional
+
+from .intents import match_intent
+from .templates import pick_template
+from .knowledge import get_tip
+from .reply_cache import is_distress
+
+DEFAULT_LOCAL_INTENTS = ("greeting", "farewell", "agreement", "disagreement", "gratitude")
+
+# A canned reply can't read these right ("not ok" is not agreement), so any
+# message containing one goes to the LLM
+NEGATIONS = ["not", "never", "no longer", "nothing", "nobody", "dont", "cant", "wont", "isnt", "aint"]
+FEELING_WORDS = [
+    "feel", "feeling", "feelings", "felt", "sad", "alone", "lonely", "scared", "afraid", "worried",
+    "hurt", "hurting", "depressed", "anxious", "cry", "crying", "awful", "terrible", "bad", "sick",
+    "lost", "empty", "help",
+]
+
+_NEEDS_LLM = re.compile(
+    r"n't\b|\b(?:" + "|".join(re.escape(w) for w in NEGATIONS + FEELING_WORDS) + r")\b"
+)
+
+
+class ReplyRouter:
+    """
+    Decides whether a message can be answered from local templates or needs
+    the LLM. A message is served locally only when its intent is in
+    local_intents, every keyword it contains belongs to a local intent (so
+    "hey, I'm so overwhelmed" still goes to the LLM), it has no negation,
+    feeling or distress words (so "I'm not ok" does too), it is short and
+    the intent keywords make up enough of it (min_confidence).
+    """
+
+    def __init__(self, local_intents: Iterable[str] = DEFAULT_LOCAL_INTENTS, max_words: int = 5,
+                 min_confidence: float = 0.6, enabled: bool = True):
+        self.local_intents = frozenset(local_intents)
+        self.max_words = max_words
+        self.min_confidence = min_confidence
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.local_count = 0
+        self.llm_count = 0
+
+    def route(self, user_data: dict, message: str) -> Optional[str]:
+        """Return a local reply, or None if the message should go to the LLM"""
+        reply = self._local_reply(user_data, message) if self.enabled else None
+        with self._lock:
+            if reply is None:
+                self.llm_count += 1
+            else:
+                self.local_count += 1
+        return reply
+
+    def _local_reply(self, user_data: dict, message: str) -> Optional[str]:
+        if len(message.split()) > self.max_words:
+            return None
+        if _NEEDS_LLM.search(message.lower().replace("\u2019", "'")) or is_distress(message):
+            return None
+
+        match = match_intent(message.strip())
+        if match.intent not in self.local_intents or match.confidence < self.min_confidence:
+            return None
+        if any(intent not in self.local_intents for intent, _, _ in match.spans):
+            return None
+
+        reply = pick_template(match.intent).format(
+            name=user_data.get("name", "friend"),
+            stress=user_data.get("stress", 5)
+        )
+        tip = get_tip(match.intent)
+        if tip:
+            reply = f"{reply} {tip}"
+        return reply
+
+    def stats(self) -> Dict:
+        total = self.local_count + self.llm_count
+        return {
+            "enabled": self.enabled,
+            "local_intents": sorted(self.local_intents),
+            "served_locally": self.local_count,
+            "sent_to_llm": self.llm_count,
+            "local_fraction": round(self.local_count / total, 4) if total else 0.0,
+        }
+
+
+def _env_intents() -> Iterable[str]:
+    raw = os.getenv("CHAT_LOCAL_INTENTS")
+    if raw is None:
+        return DEFAULT_LOCAL_INTENTS
+    return [i.strip() for i in raw.split(",") if i.strip()]
+
+
+ROUTER = ReplyRouter(
+    local_intents=_env_intents(),
+    max_words=int(os.getenv("CHAT_LOCAL_MAX_WORDS", "5")),
+    min_confidence=float(os.getenv("CHAT_LOCAL_MIN_CONFIDENCE", "0.6")),
+    enabled=os.getenv("CHAT_LOCAL_ROUTING", "true").lower() != "false",
+)
@@ -0,0 +1,85 @@
+"""
+Shared helpers for the test_*.py scripts. pytest loads this file
+automatically; the scripts also import from it directly, so they still run
+with `python test_x.py`.
+"""
+import os
+import asyncio
+import tempfile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Every model module, so Base.metadata knows all the tables
+from models.user import Base
+import models.gamification
+import models.coaching
+import models.mood
+import models.prediction
+import models.chat_history
+from services.database import to_async_url
+
+
+class FakeClock:
+    """A clock for anything taking `clock=`; move time by setting `now`"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TempDatabase:
+    """
+    A throwaway SQLite file with every table created, plus sync and async
+    session factories bound to it. Use as a context manager; async users
+    go through run() or dispose of `async_engine` inside their own event loop. in_memory=True
+    keeps the database in one shared in-memory connection (sync only).
+    """
+
+    def __init__(self, name: str = "test.db", in_memory: bool = False):
+        self._dir = tempfile.TemporaryDirectory()
+        self.in_memory = in_memory
+        self.path = None if in_memory else os.path.join(self._dir.name, name)
+        self.url = "sqlite://" if in_memory else f"sqlite:///{self.path}"
+        self.engine = create_engine(
+            self.url,
+            connect_args={"check_same_thread": False},
+            **({"poolclass": StaticPool} if in_memory else {})
+        )
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(bind=self.engine, autoflush=False)
+        self._async_engine = None
+
+    @property
+    def async_engine(self):
+        if self.in_memory:
+            raise ValueError("in-memory test databases are sync only")
+        if self._async_engine is None:
+            self._async_engine = create_async_engine(to_async_url(self.url))
+        return self._async_engine
+
+    @property
+    def AsyncSession(self):
+        return async_sessionmaker(self.async_engine, expire_on_commit=False, autoflush=False)
+
+    def run(self, check):
+        """asyncio.run `await check(db)` on an AsyncSession, then dispose of the async engine"""
+        async def run():
+            async with self.AsyncSession() as db:
+                result = await check(db)
+            await self.async_engine.dispose()
+            return result
+        return asyncio.run(run())
+
+    def close(self) -> None:
+        self.engine.dispose()
+        self._dir.cleanup()
+
+    def __enter__(self) -> "TempDatabase":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
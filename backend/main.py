@@ -2,15 +2,27 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from routes import user_routes, prediction_routes, chatbot_routes, gamification_routes, mood_routes
-from services.database import init_db
+from services.database import init_db, close_async_db, pool_stats
+from services.pagination import NEXT_CURSOR_HEADER
+from chatbot.engine import close_client
+from ml.registry import model_registry
+from services.executors import executor_stats, shutdown_executors
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
     print("Database initialized successfully!")
+    loaded = model_registry.load()
+    if loaded:
+        print(f"Model {loaded.version} loaded from {loaded.path} in {loaded.load_seconds * 1000:.1f} ms")
+    else:
+        print("No model artifact loaded; using rule-based burnout scoring.")
     yield
     print("Shutting down...")
+    await close_client()
+    shutdown_executors()
+    await close_async_db()
 
 
 # ✅ CREATE APP FIRST
@@ -29,6 +41,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # routers
@@ -50,6 +63,16 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/executors")
+async def executors_health():
+    """Occupancy and queue metrics of the CPU executor pools"""
+    return executor_stats()
+
+@app.get("/health/database")
+async def database_health():
+    """Engine profiles and connection-pool checkout metrics"""
+    return pool_stats()
+
 @app.get("/health-check")
 async def health_check_render():
     return {"status": "healthy", "message": "Service is running"}
@@ -0,0 +1,133 @@
+"""
+Pickle-free, memory-mappable model artifacts.
+
+An artifact is a directory holding a JSON manifest plus one .npy file per
+array (the compiled forest's node arrays and the scaler). Arrays are opened
+with mmap_mode='r', so loading takes milliseconds and every worker process
+on the machine shares the same physical pages instead of unpickling its
+own copy.
+
+Array files carry the artifact version in their name and manifest.json is
+replaced last, atomically: a reader sees either the old artifact or the new
+one, never a mix, and workers still mapping old files keep their pages.
+
+Convert an existing pickle/joblib model:
+    python -m ml.artifact burnout.pkl burnout_model
+"""
+import os
+import json
+import hashlib
+import argparse
+import numpy as np
+from typing import Dict
+
+from .compiled import CompiledForest
+from .registry import LoadedModel, load_artifact
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+
+def _content_version(arrays: Dict[str, np.ndarray], meta: Dict) -> str:
+    digest = hashlib.sha256(json.dumps(meta, sort_keys=True).encode())
+    for name in sorted(arrays):
+        digest.update(name.encode())
+        digest.update(str(arrays[name].dtype).encode())
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return digest.hexdigest()[:12]
+
+
+def save_mmap_artifact(loaded: LoadedModel, directory: str) -> Dict:
+    """Write a loaded model as an artifact directory; returns the manifest"""
+    if loaded.compiled is None:
+        raise ValueError(f"{loaded.estimator} can't be compiled, so it has no pickle-free form")
+
+    arrays = dict(loaded.compiled.arrays())
+    if loaded.scale_mean is not None:
+        arrays["scale_mean"] = loaded.scale_mean
+        arrays["scale_std"] = loaded.scale_std
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "estimator": loaded.estimator,
+        "positive_index": loaded.positive_index,
+        "max_depth": loaded.compiled.max_depth,
+        "feature_columns": loaded.feature_columns,
+    }
+    version = _content_version(arrays, meta)
+
+    os.makedirs(directory, exist_ok=True)
+    files = {}
+    for name, array in arrays.items():
+        filename = f"{name}.{version}.npy"
+        tmp = os.path.join(directory, f".{filename}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp, os.path.join(directory, filename))
+        files[name] = filename
+
+    manifest = {**meta, "version": version, "source_version": loaded.version, "arrays": files}
+    tmp = os.path.join(directory, f".{MANIFEST}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(directory, MANIFEST))
+
+    # Drop array files from earlier versions; processes that still map them
+    # keep their pages until they reload
+    current = set(files.values())
+    for filename in os.listdir(directory):
+        if filename.endswith(".npy") and filename not in current:
+            os.remove(os.path.join(directory, filename))
+    return manifest
+
+
+def load_mmap_artifact(directory: str) -> LoadedModel:
+    """Open an artifact directory with every array memory-mapped read-only"""
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format version {manifest.get('format_version')}")
+
+    arrays = {
+        name: np.load(os.path.join(directory, filename), mmap_mode="r")
+        for name, filename in manifest["arrays"].items()
+    }
+    positive_index = manifest["positive_index"]
+    compiled = CompiledForest(
+        **{name: arrays[name] for name in CompiledForest.ARRAYS},
+        max_depth=manifest["max_depth"],
+        is_classifier=positive_index is not None,
+    )
+    return LoadedModel(
+        compiled=compiled,
+        scale_mean=arrays.get("scale_mean"),
+        scale_std=arrays.get("scale_std"),
+        feature_columns=manifest.get("feature_columns"),
+        estimator=manifest["estimator"],
+        positive_index=positive_index,
+        path=directory,
+        version=manifest["version"],
+        artifact_format="mmap",
+    )
+
+
+def convert(source: str, directory: str) -> Dict:
+    """Convert a pickle/joblib model file into an artifact directory"""
+    return save_mmap_artifact(load_artifact(source), directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a pickled burnout model into a memory-mappable artifact")
+    parser.add_argument("source", help="pickle or joblib model file, e.g. burnout.pkl")
+    parser.add_argument("directory", help="artifact directory to write, e.g. burnout_model")
+    args = parser.parse_args()
+
+    manifest = convert(args.source, args.directory)
+    size = sum(os.path.getsize(os.path.join(args.directory, f)) for f in manifest["arrays"].values())
+    print(f"✅ Wrote {manifest['estimator']} artifact {manifest['version']} to {args.directory}")
+    print(f"   Arrays: {len(manifest['arrays'])} files, {size / 1024:.2f} KB")
+    print(f"   Set MODEL_PATH={args.directory} to serve it")
+
+
+if __name__ == "__main__":
+    main()
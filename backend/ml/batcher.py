@@ -0,0 +1,122 @@
+import time
+import asyncio
+from typing import Callable, Dict, List, Tuple
+
+from .predictor import BurnoutPredictor
+from .registry import RULES_VERSION, model_registry
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-record predictions for up to max_wait seconds
+    (or until max_batch_size records are waiting), scores them with one
+    vectorized call and hands every caller its own result. Under light load
+    a request waits at most max_wait; under a burst, N requests cost one
+    model call instead of N. With an executor (anything with an async
+    run(fn, *args), e.g. services.executors.ExecutorPool) the scoring call
+    runs there instead of on the event loop.
+    """
+
+    def __init__(self, score_batch: Callable[[List[Dict]], List[tuple]],
+                 max_batch_size: int = 32, max_wait: float = 0.002, enabled: bool = True, executor=None):
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.enabled = enabled
+        self.executor = executor
+        self._pending: List[Tuple[Dict, asyncio.Future, float]] = []
+        self._timer = None
+        self._tasks = set()
+        self.batches = 0
+        self.items = 0
+        self.max_batch = 0
+        self.last_batch = 0
+        self.full_batches = 0
+        self.errors = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    async def predict(self, features: Dict) -> tuple:
+        if not self.enabled:
+            return (await self._score([features]))[0]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((features, future, time.monotonic()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    async def _score(self, records: List[Dict]) -> List[tuple]:
+        if self.executor is None:
+            return self.score_batch(records)
+        return await self.executor.run(self.score_batch, records)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Keep a reference so the task isn't garbage-collected mid-run
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Dict, asyncio.Future, float]]) -> None:
+        flushed_at = time.monotonic()
+        try:
+            results = await self._score([features for features, _, _ in batch])
+        except Exception as e:
+            self.errors += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            # A caller that disconnected has a cancelled future
+            if not future.done():
+                future.set_result(result)
+        self._record(len(batch), [flushed_at - enqueued_at for _, _, enqueued_at in batch])
+
+    def _record(self, size: int, waits: List[float]) -> None:
+        self.batches += 1
+        self.items += size
+        self.last_batch = size
+        self.max_batch = max(self.max_batch, size)
+        if size >= self.max_batch_size:
+            self.full_batches += 1
+        self.total_wait += sum(waits)
+        self.max_wait_seen = max(self.max_wait_seen, max(waits))
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "max_batch_size": self.max_batch_size,
+            "window_ms": round(self.max_wait * 1000, 2),
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size_seen": self.max_batch,
+            "last_batch_size": self.last_batch,
+            "full_batches": self.full_batches,
+            "errors": self.errors,
+            "avg_queue_wait_ms": round(self.total_wait / self.items * 1000, 3) if self.items else 0.0,
+            "max_queue_wait_ms": round(self.max_wait_seen * 1000, 3),
+        }
+
+
+def score_records(records: List[Dict]) -> List[Tuple[float, str, str]]:
+    """
+    (score, risk level, model version) per record, scored with whichever
+    model the registry serves right now; the version says which one that was.
+    """
+    loaded = model_registry.get()
+    version = loaded.version if loaded else RULES_VERSION
+    return [(score, risk_level, version)
+            for score, risk_level in BurnoutPredictor(loaded_model=loaded).predict_batch(records)]
+
@@ -0,0 +1,129 @@
+import numpy as np
+from typing import Dict
+
+# Tree ensembles whose prediction is the plain average of their trees
+SUPPORTED_ESTIMATORS = (
+    "RandomForestRegressor",
+    "RandomForestClassifier",
+    "ExtraTreesRegressor",
+    "ExtraTreesClassifier",
+    "DecisionTreeRegressor",
+    "DecisionTreeClassifier",
+)
+
+
+class CompiledForest:
+    """
+    A fitted tree ensemble flattened into contiguous node arrays.
+
+    Every tree's nodes are concatenated into one set of arrays (feature,
+    threshold, children, value) and `roots` holds each tree's first node;
+    `children` interleaves left/right so one gather at 2 * node + go_right
+    picks the next node. Leaves point to themselves, so inference is a fixed
+    number of vectorized steps (the deepest tree's depth) over all rows and
+    trees at once, with no per-tree Python calls or input validation.
+    Regressor values are 1-D; classifier values are (n_nodes, n_classes)
+    class probabilities.
+    """
+
+    # Node arrays, in the order they are stored in an artifact
+    ARRAYS = ("feature", "threshold", "children", "value", "roots")
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, max_depth: int, is_classifier: bool):
+        # Arrays are only ever read, so they may be read-only memory maps
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.is_classifier = is_classifier
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    def leaves(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node index reached in every tree, shape (n_rows, n_trees)"""
+        # sklearn compares float32 inputs against its thresholds; do the same
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        row_base = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        node = np.broadcast_to(self.roots, (n_rows, self.n_trees))
+        for _ in range(self.max_depth):
+            go_right = flat.take(row_base + self.feature.take(node)) > self.threshold.take(node)
+            node = self.children.take(2 * node + go_right)
+        return node
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Ensemble output per row: the mean over trees of the leaf values, i.e.
+        predict() for regressors and predict_proba() for classifiers
+        """
+        return self.value.take(self.leaves(X), axis=0).mean(axis=1)
+
+    def info(self) -> Dict:
+        return {
+            "trees": self.n_trees,
+            "nodes": self.n_nodes,
+            "max_depth": self.max_depth,
+            "bytes": sum(a.nbytes for a in self.arrays().values()),
+        }
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+
+def compile_forest(model) -> CompiledForest:
+    """
+    Flatten a fitted sklearn forest (or single tree) into a CompiledForest.
+    Raises ValueError for estimators it can't reproduce exactly.
+    """
+    name = type(model).__name__
+    if name not in SUPPORTED_ESTIMATORS:
+        raise ValueError(f"Cannot compile {name}")
+    is_classifier = name.endswith("Classifier")
+    trees = [est.tree_ for est in model.estimators_] if hasattr(model, "estimators_") else [model.tree_]
+    if trees[0].n_outputs != 1:
+        raise ValueError("Cannot compile multi-output models")
+
+    features, thresholds, children, values, roots = [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        n = tree.node_count
+        index = np.arange(n)
+        leaf = tree.children_left == -1
+
+        # Leaves loop back to themselves; their feature/threshold are never decisive
+        features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(np.where(leaf, 0.0, tree.threshold))
+        pairs = np.empty(2 * n, dtype=np.intp)
+        pairs[0::2] = np.where(leaf, index, tree.children_left) + offset
+        pairs[1::2] = np.where(leaf, index, tree.children_right) + offset
+        children.append(pairs)
+
+        value = tree.value[:, 0, :].astype(np.float64)
+        if is_classifier:
+            # Older sklearn stores class counts, newer stores fractions
+            value = value / value.sum(axis=1, keepdims=True)
+        else:
+            value = value[:, 0]
+        values.append(value)
+        roots.append(offset)
+        offset += n
+
+    return CompiledForest(
+        feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+        threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+        children=np.ascontiguousarray(np.concatenate(children), dtype=np.intp),
+        value=np.ascontiguousarray(np.concatenate(values)),
+        roots=np.asarray(roots, dtype=np.intp),
+        max_depth=max(int(tree.max_depth) for tree in trees),
+        is_classifier=is_classifier,
+    )
@@ -1,14 +1,47 @@
 import numpy as np
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List
 import pickle
 import os
+from .registry import LoadedModel, load_artifact
+
+# Model input order, with the defaults used when a feature is missing
+FEATURES = (
+    ("work_hours_per_week", 40),
+    ("sleep_hours_per_day", 7),
+    ("stress_level", 5),
+    ("job_satisfaction", 5),
+    ("work_life_balance", 5),
+    ("physical_activity_hours", 2),
+    ("social_support", 5),
+)
+
+# The training CSV's names for the same inputs, in the same order
+TRAINING_COLUMNS = (
+    "study_hours_per_week",
+    "sleep_hours_per_day",
+    "stress_level",
+    "academic_satisfaction",
+    "social_life_balance",
+    "physical_activity_hours",
+    "family_support",
+)
+
+
+def feature_matrix(records: List[Dict]) -> np.ndarray:
+    """Stack feature dicts into an (n, 7) float array in model input order"""
+    return np.array(
+        [[record.get(name, default) for name, default in FEATURES] for record in records],
+        dtype=np.float64,
+    ).reshape(len(records), len(FEATURES))
+
 
 class BurnoutPredictor:
     """Machine learning model for predicting burnout risk"""
     
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, loaded_model: LoadedModel = None):
         self.model_path = model_path
-        self.model = None
+        self.loaded_model = loaded_model
+        self.model = loaded_model.model if loaded_model else None
         self.scaler = None
         
         # Load model if path is provided
@@ -25,44 +58,51 @@ class BurnoutPredictor:
         Returns:
             Tuple of (burnout_score, risk_level)
         """
-        # Extract features in the correct order
-        feature_vector = np.array([
-            features.get("work_hours_per_week", 40),
-            features.get("sleep_hours_per_day", 7),
-            features.get("stress_level", 5),
-            features.get("job_satisfaction", 5),
-            features.get("work_life_balance", 5),
-            features.get("physical_activity_hours", 2),
-            features.get("social_support", 5)
-        ]).reshape(1, -1)
-        
+        burnout_score = self.predict_scores(feature_matrix([features]))[0]
+        return burnout_score, self._get_risk_level(burnout_score)
+    
+    def predict_batch(self, records: List[Dict]) -> List[Tuple[float, str]]:
+        """
+        Predict burnout score and risk level for many inputs with a single
+        vectorized scoring call
+        """
+        if not records:
+            return []
+        scores = self.predict_scores(feature_matrix(records))
+        return [(score, self._get_risk_level(score)) for score in scores]
+    
+    def predict_scores(self, X: np.ndarray) -> List[float]:
+        """Burnout scores (0-100, 2 decimals) for an (n, 7) feature array"""
         # If model is loaded, use it; otherwise use rule-based approach
-        if self.model:
-            burnout_score = float(self.model.predict(feature_vector)[0])
+        if self.loaded_model:
+            scores = np.clip(self.loaded_model.predict_scores(X), 0.0, 100.0)
         else:
-            burnout_score = self._calculate_burnout_score(features)
-        
-        # Determine risk level
-        risk_level = self._get_risk_level(burnout_score)
-        
-        return burnout_score, risk_level
+            scores = self._calculate_burnout_scores(X)
+        return [round(score, 2) for score in scores.tolist()]
     
     def _calculate_burnout_score(self, features: Dict) -> float:
         """
         Calculate burnout score using a rule-based approach
         This is a placeholder until a trained model is available
         """
+        score = self._calculate_burnout_scores(feature_matrix([features]))[0]
+        return round(float(score), 2)
+    
+    def _calculate_burnout_scores(self, X: np.ndarray) -> np.ndarray:
+        """Rule-based scores for every row of an (n, 7) feature array (unrounded)"""
+        work_hours, sleep, stress, job_sat, wlb, activity, social = X.T
+        
         # Normalize features to 0-1 scale
-        work_hours_norm = min(features.get("work_hours_per_week", 40) / 80, 1.0)
-        sleep_deficit = max(0, (8 - features.get("sleep_hours_per_day", 7)) / 8)
-        stress_norm = features.get("stress_level", 5) / 10
-        job_sat_norm = 1 - (features.get("job_satisfaction", 5) / 10)
-        wlb_norm = 1 - (features.get("work_life_balance", 5) / 10)
-        exercise_deficit = max(0, (3 - features.get("physical_activity_hours", 2)) / 3)
-        social_deficit = 1 - (features.get("social_support", 5) / 10)
+        work_hours_norm = np.minimum(work_hours / 80, 1.0)
+        sleep_deficit = np.maximum(0, (8 - sleep) / 8)
+        stress_norm = stress / 10
+        job_sat_norm = 1 - (job_sat / 10)
+        wlb_norm = 1 - (wlb / 10)
+        exercise_deficit = np.maximum(0, (3 - activity) / 3)
+        social_deficit = 1 - (social / 10)
         
         # Weighted average
-        burnout_score = (
+        return (
             work_hours_norm * 0.20 +
             sleep_deficit * 0.15 +
             stress_norm * 0.25 +
@@ -71,8 +111,6 @@ class BurnoutPredictor:
             exercise_deficit * 0.10 +
             social_deficit * 0.05
         ) * 100
-        
-        return round(burnout_score, 2)
     
     def _get_risk_level(self, burnout_score: float) -> str:
         """Determine risk level based on burnout score"""
@@ -84,9 +122,9 @@ class BurnoutPredictor:
             return "high"
     
     def load_model(self, model_path: str):
-        """Load a trained model from disk"""
-        with open(model_path, 'rb') as f:
-            self.model = pickle.load(f)
+        """Load a trained model from disk (raw pickle or training.py joblib dict)"""
+        self.loaded_model = load_artifact(model_path)
+        self.model = self.loaded_model.model
     
     def save_model(self, model_path: str):
         """Save the trained model to disk"""
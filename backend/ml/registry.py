@@ -0,0 +1,260 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+import numpy as np
+import joblib
+from typing import Dict, List, Optional
+from .compiled import CompiledForest, compile_forest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "burnout.pkl")
+
+# Version reported for scores from the rule-based fallback (no model loaded)
+RULES_VERSION = "rules"
+
+
+class LoadedModel:
+    """
+    A trained model artifact plus everything needed to score with it.
+
+    Supports every artifact format in this repo:
+    - raw pickle of an estimator (create_model.py)
+    - joblib dict with 'model', 'scaler' and 'feature_columns' (training.py)
+    - memory-mapped artifact directory (ml/artifact.py), which carries only
+      the compiled forest and no sklearn object
+    Regressors are expected to output a 0-100 burnout score directly;
+    classifiers are scored as P(burnout) * 100. Tree ensembles are compiled
+    to flat node arrays at load time and scored without going through sklearn.
+    """
+
+    def __init__(self, model=None, compiled: Optional[CompiledForest] = None,
+                 scale_mean: Optional[np.ndarray] = None, scale_std: Optional[np.ndarray] = None,
+                 feature_columns: Optional[List[str]] = None, estimator: str = None,
+                 positive_index: Optional[int] = None, path: str = None, version: str = None,
+                 artifact_format: str = "pickle"):
+        self.model = model
+        self.compiled = compiled
+        # Scaler applied as plain arrays: cheaper than scaler.transform per
+        # call and avoids sklearn's feature-name checks on ndarray input
+        self.scale_mean = scale_mean
+        self.scale_std = scale_std
+        self.feature_columns = feature_columns
+        self.estimator = estimator or type(model).__name__
+        self.is_classifier = positive_index is not None
+        self._positive_index = positive_index
+        self.path = path
+        self.version = version
+        self.artifact_format = artifact_format
+        self.loaded_at = time.time()
+        self.load_seconds = 0.0
+
+    @classmethod
+    def from_estimator(cls, model, scaler=None, compile: bool = True, **kwargs) -> "LoadedModel":
+        """Wrap a fitted sklearn estimator (and optional StandardScaler)"""
+        positive_index = None
+        if hasattr(model, "predict_proba") and hasattr(model, "classes_"):
+            classes = list(model.classes_)
+            positive_index = classes.index(1) if 1 in classes else len(classes) - 1
+
+        compiled = None
+        if compile:
+            try:
+                compiled = compile_forest(model)
+            except ValueError as e:
+                logger.info(f"Scoring with sklearn: {e}")
+
+        return cls(
+            model,
+            compiled=compiled,
+            scale_mean=np.asarray(scaler.mean_, dtype=np.float64) if scaler is not None else None,
+            scale_std=np.asarray(scaler.scale_, dtype=np.float64) if scaler is not None else None,
+            positive_index=positive_index,
+            **kwargs,
+        )
+
+    @property
+    def positive_index(self) -> Optional[int]:
+        return self._positive_index
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        if self.scale_mean is None:
+            return X
+        return (X - self.scale_mean) / self.scale_std
+
+    def predict_scores(self, X: np.ndarray) -> np.ndarray:
+        """Burnout scores (0-100) for a 2-D feature array in predictor order"""
+        X = self.transform(np.asarray(X, dtype=np.float64))
+        if self.compiled is not None:
+            out = self.compiled.predict(X)
+            return out[:, self._positive_index] * 100 if self.is_classifier else out
+        if self.is_classifier:
+            return self.model.predict_proba(X)[:, self._positive_index] * 100
+        return np.asarray(self.model.predict(X), dtype=np.float64)
+
+    def info(self) -> Dict:
+        return {
+            "path": self.path,
+            "version": self.version,
+            "format": self.artifact_format,
+            "estimator": self.estimator,
+            "kind": "classifier" if self.is_classifier else "regressor",
+            "compiled": self.compiled.info() if self.compiled else None,
+            "feature_columns": self.feature_columns,
+            "loaded_at": self.loaded_at,
+            "load_ms": round(self.load_seconds * 1000, 2),
+        }
+
+
+def check_feature_columns(loaded: LoadedModel) -> None:
+    """
+    Raise ValueError unless the model takes the predictor's inputs in its
+    order: under the API's names or the training CSV's names for them.
+    """
+    from .predictor import FEATURES, TRAINING_COLUMNS
+
+    expected = [name for name, _ in FEATURES]
+    columns = loaded.feature_columns
+    if columns is not None and list(columns) not in (expected, list(TRAINING_COLUMNS)):
+        raise ValueError(
+            f"Model expects columns {list(columns)}, not {expected} (or {list(TRAINING_COLUMNS)} in training)"
+        )
+
+    width = getattr(loaded.model, "n_features_in_", None)
+    if width is None and loaded.scale_mean is not None:
+        width = len(loaded.scale_mean)
+    if width is not None and width != len(expected):
+        raise ValueError(f"Model expects {width} features, but {len(expected)} are supplied")
+
+
+def load_artifact(path: str, compile: bool = True) -> LoadedModel:
+    """Load a model artifact from disk in any supported format"""
+    started = time.perf_counter()
+    if os.path.isdir(path):
+        from .artifact import load_mmap_artifact
+        loaded = load_mmap_artifact(path)
+        check_feature_columns(loaded)
+        loaded.load_seconds = time.perf_counter() - started
+        return loaded
+
+    with open(path, "rb") as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:12]
+
+    # joblib.load also reads plain pickles
+    obj = joblib.load(path)
+    if isinstance(obj, dict):
+        loaded = LoadedModel.from_estimator(
+            obj["model"],
+            scaler=obj.get("scaler"),
+            compile=compile,
+            feature_columns=obj.get("feature_columns"),
+            path=path,
+            version=version,
+            artifact_format="joblib",
+        )
+    else:
+        loaded = LoadedModel.from_estimator(obj, compile=compile, path=path, version=version, artifact_format="pickle")
+
+    check_feature_columns(loaded)
+    loaded.load_seconds = time.perf_counter() - started
+    return loaded
+
+
+def watched_path(path: str) -> str:
+    """File whose mtime signals a new artifact (the manifest, for artifact directories)"""
+    if os.path.isdir(path):
+        from .artifact import MANIFEST
+        return os.path.join(path, MANIFEST)
+    return path
+
+
+class ModelRegistry:
+    """
+    Process-wide holder for the active model. Loaded once at startup and
+    shared by every request; when the artifact's mtime changes the new file is
+    loaded in full on a background thread and then swapped in with a single
+    reference assignment, so requests never wait for a load or see a
+    half-loaded model. An artifact that fails to load (or takes different
+    feature columns) is rejected and the current model stays active.
+    """
+
+    def __init__(self, path: str = DEFAULT_MODEL_PATH, check_interval: float = 5.0, compile: bool = True):
+        self.path = path
+        self.check_interval = check_interval
+        self.compile = compile
+        self._current: Optional[LoadedModel] = None
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+        self.reloads = 0
+        self.load_errors = 0
+
+    def load(self) -> Optional[LoadedModel]:
+        """(Re)load the artifact now; keeps the previous model if loading fails"""
+        with self._reload_lock:
+            return self._load_locked()
+
+    def _load_locked(self) -> Optional[LoadedModel]:
+        try:
+            mtime = os.path.getmtime(watched_path(self.path))
+            loaded = load_artifact(self.path, compile=self.compile)
+        except Exception as e:
+            self.load_errors += 1
+            logger.error(f"Loading model from {self.path} failed: {type(e).__name__}: {e}")
+            return self._current
+
+        if self._current is not None:
+            self.reloads += 1
+        self._current = loaded
+        self._mtime = mtime
+        self._last_check = time.monotonic()
+        logger.info(f"Model {loaded.version} loaded from {self.path} in {loaded.load_seconds * 1000:.1f} ms")
+        return loaded
+
+    def get(self) -> Optional[LoadedModel]:
+        """Active model (None if no artifact could be loaded); starts a hot swap if the file changed"""
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            self._maybe_reload()
+        return self._current
+
+    def _maybe_reload(self) -> None:
+        try:
+            mtime = os.path.getmtime(watched_path(self.path))
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        # Only one reload at a time; every request keeps the current model meanwhile
+        if self._reload_lock.acquire(blocking=False):
+            self._reload_thread = threading.Thread(
+                target=self._reload_in_background, args=(mtime,), name="model-reload", daemon=True
+            )
+            self._reload_thread.start()
+
+    def _reload_in_background(self, mtime: float) -> None:
+        try:
+            if mtime != self._mtime:
+                self._load_locked()
+        finally:
+            self._reload_lock.release()
+
+    def stats(self) -> Dict:
+        current = self._current
+        return {
+            "loaded": current is not None,
+            "model": current.info() if current else None,
+            "reloads": self.reloads,
+            "load_errors": self.load_errors,
+        }
+
+
+model_registry = ModelRegistry(
+    path=os.getenv("MODEL_PATH", DEFAULT_MODEL_PATH),
+    check_interval=float(os.getenv("MODEL_RELOAD_CHECK_SECONDS", "5")),
+    compile=os.getenv("MODEL_COMPILED", "true").lower() == "true",
+)
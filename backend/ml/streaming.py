@@ -0,0 +1,95 @@
+"""
+Out-of-core training for survey CSVs too large to load at once.
+
+The CSV is read in chunks with compact dtypes. A first pass fits the
+StandardScaler incrementally; later passes train an SGD logistic-regression
+classifier chunk by chunk with partial_fit. Only one chunk is in memory at
+a time, so peak memory depends on the chunk size, not on the file size.
+Every `holdout_every`-th row is held out for evaluation.
+"""
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, Tuple
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from .predictor import TRAINING_COLUMNS
+
+FEATURE_COLUMNS = list(TRAINING_COLUMNS)
+TARGET = "burnout"
+
+# Hours are fractional; sliders and the target fit in a byte
+SURVEY_DTYPES = {
+    "study_hours_per_week": np.float32,
+    "sleep_hours_per_day": np.float32,
+    "stress_level": np.int8,
+    "academic_satisfaction": np.int8,
+    "social_life_balance": np.int8,
+    "physical_activity_hours": np.float32,
+    "family_support": np.int8,
+    TARGET: np.int8,
+}
+
+
+def iter_chunks(path: str, chunksize: int = 100_000) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Yield (X float32, y int8, global row index) per chunk"""
+    offset = 0
+    reader = pd.read_csv(path, usecols=FEATURE_COLUMNS + [TARGET], dtype=SURVEY_DTYPES, chunksize=chunksize)
+    for chunk in reader:
+        X = chunk[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+        y = chunk[TARGET].to_numpy(dtype=np.int8)
+        rows = np.arange(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield X, y, rows
+
+
+def _split(rows: np.ndarray, holdout_every: int) -> np.ndarray:
+    """Mask of training rows (every holdout_every-th row is held out)"""
+    return rows % holdout_every != 0
+
+
+def train_streaming(path: str, chunksize: int = 100_000, epochs: int = 3,
+                    holdout_every: int = 5, random_state: int = 42) -> Tuple[SGDClassifier, StandardScaler, Dict]:
+    """Fit scaler and classifier chunk by chunk; returns (model, scaler, metrics)"""
+    started = time.perf_counter()
+    scaler = StandardScaler()
+    rows_seen = 0
+    for X, _, rows in iter_chunks(path, chunksize):
+        scaler.partial_fit(X[_split(rows, holdout_every)])
+        rows_seen += len(X)
+    if rows_seen == 0:
+        raise ValueError(f"No rows in {path}")
+
+    model = SGDClassifier(loss="log_loss", alpha=1e-4, random_state=random_state)
+    classes = np.array([0, 1])
+    trained_rows = 0
+    for _ in range(epochs):
+        for X, y, rows in iter_chunks(path, chunksize):
+            train = _split(rows, holdout_every)
+            if train.any():
+                model.partial_fit(scaler.transform(X[train]), y[train], classes=classes)
+                trained_rows += int(train.sum())
+
+    correct = tested = 0
+    for X, y, rows in iter_chunks(path, chunksize):
+        test = ~_split(rows, holdout_every)
+        if test.any():
+            correct += int((model.predict(scaler.transform(X[test])) == y[test]).sum())
+            tested += int(test.sum())
+
+    seconds = time.perf_counter() - started
+    # Rows read across all passes: scaler, `epochs` training passes, evaluation
+    rows_read = rows_seen * (epochs + 2)
+    metrics = {
+        "rows": rows_seen,
+        "train_rows_per_epoch": trained_rows // max(epochs, 1),
+        "test_rows": tested,
+        "test_accuracy": correct / tested if tested else None,
+        "epochs": epochs,
+        "chunksize": chunksize,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows_read / seconds),
+    }
+    return model, scaler, metrics
+
@@ -1,9 +1,11 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from datetime import datetime
 from .user import Base
 
 class ChatHistory(Base):
     __tablename__ = "chat_history"
+    # get_chat_history: newest messages for one user
+    __table_args__ = (Index("ix_chat_history_user_id_created_at", "user_id", "created_at"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
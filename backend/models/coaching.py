@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .user import Base
@@ -12,6 +12,8 @@ class GoalCategory(str, enum.Enum):
 
 class Goal(Base):
     __tablename__ = "goals"
+    # get_goals lists a user's goals newest first
+    __table_args__ = (Index("ix_goals_user_id_created_at", "user_id", "created_at"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
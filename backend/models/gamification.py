@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .user import Base
@@ -16,6 +16,8 @@ class Achievement(Base):
     
 class UserAchievement(Base):
     __tablename__ = "user_achievements"
+    # get_profile joins a user's earned achievements
+    __table_args__ = (Index("ix_user_achievements_user_id_achievement_id", "user_id", "achievement_id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
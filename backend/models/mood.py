@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .user import Base
 
 class MoodEntry(Base):
     __tablename__ = "mood_entries"
+    # The chatbot's context snapshot reads a user's latest mood
+    __table_args__ = (Index("ix_mood_entries_user_id_created_at", "user_id", "created_at"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
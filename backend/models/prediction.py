@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .user import Base
 
 class Prediction(Base):
     __tablename__ = "predictions"
+    # Latest stress level for chat context, and prediction history
+    __table_args__ = (Index("ix_predictions_user_id_created_at", "user_id", "created_at"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
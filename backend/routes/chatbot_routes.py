@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import json
 from schemas.chatbot import ChatMessage, ChatResponse
 from services.chatbot_service import ChatbotService
-from services.database import get_db
+from services.database import get_async_db
+from services.pagination import page_response
+from services.context_cache import user_context_cache
+from services.single_flight import chat_single_flight
+from chatbot.memory import MEMORY
+from chatbot.router import ROUTER
+from chatbot.breaker import LLM_BREAKER
+from chatbot.reply_cache import REPLY_CACHE
+from chatbot.bulkhead import LLM_BULKHEAD
+from chatbot.prompt import PROMPT_BUILDER
 
 router = APIRouter()
 
@@ -11,23 +22,68 @@ router = APIRouter()
 async def send_message(
     chat_message: ChatMessage,
     user_id: int,  # TODO: Get from JWT token
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Send a message to the chatbot and get a response"""
     chatbot_service = ChatbotService(db)
-    return chatbot_service.process_message(user_id, chat_message)
+    return await chatbot_service.process_message(user_id, chat_message)
+
+@router.post("/chat/stream")
+async def stream_message(
+    chat_message: ChatMessage,
+    user_id: int,  # TODO: Get from JWT token
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream the chatbot reply token by token over Server-Sent Events"""
+    chatbot_service = ChatbotService(db)
+
+    async def event_stream():
+        async for event in chatbot_service.stream_message(user_id, chat_message):
+            if "token" in event:
+                yield f"data: {json.dumps({'token': event['token']})}\n\n"
+            else:
+                record = ChatResponse.model_validate(event["done"])
+                yield f"event: done\ndata: {record.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.get("/history/{user_id}", response_model=List[ChatResponse])
-async def get_chat_history(user_id: int, db: Session = Depends(get_db)):
-    """Get chat history for a specific user"""
+async def get_chat_history(
+    user_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. message,sentiment"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Chat history for a user, newest first; send X-Next-Cursor back as `cursor` for older messages"""
     chatbot_service = ChatbotService(db)
-    return chatbot_service.get_chat_history(user_id)
+    page = await chatbot_service.get_chat_history_page(user_id, limit, cursor, fields)
+    return page_response(page, response)
 
 @router.delete("/history/{chat_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_chat_message(chat_id: int, db: Session = Depends(get_db)):
+async def delete_chat_message(chat_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a specific chat message"""
     chatbot_service = ChatbotService(db)
-    success = chatbot_service.delete_message(chat_id)
+    success = await chatbot_service.delete_message(chat_id)
     if not success:
         raise HTTPException(status_code=404, detail="Chat message not found")
     return None
+
+@router.get("/stats")
+async def get_chatbot_stats():
+    """Runtime counters for the chatbot engine (routing, LLM breaker and bulkhead, prompt size, caches, memory)"""
+    return {
+        "routing": ROUTER.stats(),
+        "llm_breaker": LLM_BREAKER.stats(),
+        "reply_cache": REPLY_CACHE.stats(),
+        "llm_bulkhead": LLM_BULKHEAD.stats(),
+        "prompt": PROMPT_BUILDER.stats(),
+        "memory": MEMORY.stats(),
+        "context_cache": user_context_cache.stats(),
+        "dedup": chat_single_flight.stats()
+    }
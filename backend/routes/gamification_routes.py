@@ -1,31 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from schemas.gamification import GamificationProfile, GoalCreate, GoalResponse, GoalUpdate
 from services.gamification_service import GamificationService
-from services.database import get_db
+from services.database import get_async_db
+from services.pagination import page_response
 
 router = APIRouter()
 
 @router.get("/profile/{user_id}", response_model=GamificationProfile)
-async def get_profile(user_id: int, db: Session = Depends(get_db)):
+async def get_profile(user_id: int, db: AsyncSession = Depends(get_async_db)):
     service = GamificationService(db)
-    return service.get_profile(user_id)
+    return await service.get_profile(user_id)
 
 @router.post("/goals/{user_id}", response_model=GoalResponse)
-async def create_goal(user_id: int, goal: GoalCreate, db: Session = Depends(get_db)):
+async def create_goal(user_id: int, goal: GoalCreate, db: AsyncSession = Depends(get_async_db)):
     service = GamificationService(db)
-    return service.create_goal(user_id, goal)
+    return await service.create_goal(user_id, goal)
 
 @router.get("/goals/{user_id}", response_model=List[GoalResponse])
-async def get_goals(user_id: int, db: Session = Depends(get_db)):
+async def get_goals(
+    user_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. title,is_completed"),
+    db: AsyncSession = Depends(get_async_db)
+):
     service = GamificationService(db)
-    return service.get_goals(user_id)
+    page = await service.get_goals_page(user_id, limit, cursor, fields)
+    return page_response(page, response)
 
 @router.put("/goals/{goal_id}", response_model=GoalResponse)
-async def update_goal(goal_id: int, goal_update: GoalUpdate, db: Session = Depends(get_db)):
+async def update_goal(goal_id: int, goal_update: GoalUpdate, db: AsyncSession = Depends(get_async_db)):
     service = GamificationService(db)
-    goal = service.update_goal(goal_id, goal_update)
+    goal = await service.update_goal(goal_id, goal_update)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
     return goal
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from schemas.mood import MoodEntryCreate, MoodResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.mood import MoodEntryCreate, MoodEntryResponse, MoodResponse
 from services.mood_service import MoodService
-from services.database import get_db
+from services.database import get_async_db
+from services.pagination import page_response
+from typing import List, Optional
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -11,11 +13,25 @@ class ActivityComplete(BaseModel):
     title: str
 
 @router.post("/log/{user_id}", response_model=MoodResponse)
-async def log_mood(user_id: int, entry: MoodEntryCreate, db: Session = Depends(get_db)):
+async def log_mood(user_id: int, entry: MoodEntryCreate, db: AsyncSession = Depends(get_async_db)):
     service = MoodService(db)
-    return service.log_mood(user_id, entry)
+    return await service.log_mood(user_id, entry)
 
 @router.post("/activity/{user_id}/complete")
-async def complete_activity(user_id: int, data: ActivityComplete, db: Session = Depends(get_db)):
+async def complete_activity(user_id: int, data: ActivityComplete, db: AsyncSession = Depends(get_async_db)):
     service = MoodService(db)
-    return service.complete_activity(user_id, data.title)
+    return await service.complete_activity(user_id, data.title)
+
+@router.get("/history/{user_id}", response_model=List[MoodEntryResponse])
+async def get_mood_history(
+    user_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. mood_category"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Logged moods, newest first; send X-Next-Cursor back as `cursor` for the next page"""
+    service = MoodService(db)
+    page = await service.get_mood_history_page(user_id, limit, cursor, fields)
+    return page_response(page, response)
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from schemas.prediction import PredictionInput, PredictionResponse
-from services.prediction_service import PredictionService
-from services.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from schemas.prediction import PredictionInput, PredictionBatchInput, PredictionResponse
+from services.prediction_service import PredictionService, PREDICTION_BATCHER
+from services.prediction_cache import prediction_cache
+from services.database import get_async_db
+from services.pagination import page_response
+from ml.registry import model_registry
 
 router = APIRouter()
 
@@ -11,23 +14,58 @@ router = APIRouter()
 async def create_prediction(
     prediction_input: PredictionInput,
     user_id: int,  # TODO: Get from JWT token
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new burnout prediction"""
     prediction_service = PredictionService(db)
-    return prediction_service.create_prediction(user_id, prediction_input)
+    return await prediction_service.create_prediction(user_id, prediction_input)
+
+@router.post("/batch", response_model=List[PredictionResponse], status_code=status.HTTP_201_CREATED)
+async def create_predictions_batch(
+    batch: PredictionBatchInput,
+    user_id: Optional[int] = None,  # TODO: Get from JWT token
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Score and store many predictions at once (e.g. a team's weekly survey).
+    Each record is filed under its own user_id, or `user_id` if it has none.
+    """
+    prediction_service = PredictionService(db)
+    return await prediction_service.create_predictions(user_id, batch.records)
 
 @router.get("/user/{user_id}", response_model=List[PredictionResponse])
-async def get_user_predictions(user_id: int, db: Session = Depends(get_db)):
-    """Get all predictions for a specific user"""
+async def get_user_predictions(
+    user_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. burnout_score,risk_level"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """A user's predictions, newest first; send X-Next-Cursor back as `cursor` for the next page"""
     prediction_service = PredictionService(db)
-    return prediction_service.get_user_predictions(user_id)
+    page = await prediction_service.get_user_predictions_page(user_id, limit, cursor, fields)
+    return page_response(page, response)
+
+@router.get("/model")
+async def get_model_info():
+    """Currently loaded model artifact (version, load time, format)"""
+    return model_registry.stats()
+
+@router.get("/stats")
+async def get_prediction_stats():
+    """Scoring metrics: active model, micro-batching and result cache"""
+    return {
+        "model": model_registry.stats(),
+        "batcher": PREDICTION_BATCHER.stats(),
+        "cache": prediction_cache.stats(),
+    }
 
 @router.get("/{prediction_id}", response_model=PredictionResponse)
-async def get_prediction(prediction_id: int, db: Session = Depends(get_db)):
+async def get_prediction(prediction_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific prediction by ID"""
     prediction_service = PredictionService(db)
-    prediction = prediction_service.get_prediction_by_id(prediction_id)
+    prediction = await prediction_service.get_prediction_by_id(prediction_id)
     if not prediction:
         raise HTTPException(status_code=404, detail="Prediction not found")
     return prediction
@@ -1,35 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from schemas.user import UserCreate, UserResponse, UserLogin
 from services.user_service import UserService
-from services.database import get_db
+from services.database import get_async_db
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     user_service = UserService(db)
-    return user_service.create_user(user)
+    return await user_service.create_user(user)
 
 @router.post("/login")
-async def login_user(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login_user(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return access token"""
     user_service = UserService(db)
-    return user_service.authenticate_user(credentials)
+    return await user_service.authenticate_user(credentials)
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(db: Session = Depends(get_db)):
+async def get_current_user(db: AsyncSession = Depends(get_async_db)):
     """Get current authenticated user details"""
     # TODO: Implement JWT authentication dependency
     raise HTTPException(status_code=501, detail="Authentication not implemented yet")
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get user by ID"""
     user_service = UserService(db)
-    user = user_service.get_user_by_id(user_id)
+    user = await user_service.get_user_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
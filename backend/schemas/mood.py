@@ -6,6 +6,15 @@ class MoodEntryCreate(BaseModel):
     mood_category: str # sad, angry, anxious, tired, bored, okay
     note: Optional[str] = None
 
+class MoodEntryResponse(BaseModel):
+    id: int
+    mood_category: str
+    note: Optional[str]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
 class MoodActivityResponse(BaseModel):
     id: int
     title: str
@@ -24,6 +24,13 @@ class PredictionInput(BaseModel):
             }
         }
 
+class PredictionBatchRecord(PredictionInput):
+    # Whose answers these are; defaults to the request's user_id
+    user_id: Optional[int] = None
+
+class PredictionBatchInput(BaseModel):
+    records: List[PredictionBatchRecord] = Field(..., min_length=1, max_length=10000)
+
 class PredictionResponse(BaseModel):
     id: int
     user_id: int
@@ -0,0 +1,120 @@
+import os
+import time
+import threading
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from models.gamification import Achievement
+
+
+class CatalogEntry(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+    icon_name: Optional[str]
+    points_reward: Optional[int]
+    condition_type: Optional[str]
+    condition_value: Optional[int]
+
+
+class Catalog(NamedTuple):
+    version: int
+    entries: Tuple[CatalogEntry, ...]
+    by_id: Mapping[int, CatalogEntry]
+
+
+COLUMNS = [getattr(Achievement, name) for name in CatalogEntry._fields]
+
+
+def _build(version: int, rows) -> Catalog:
+    entries = tuple(CatalogEntry(*row) for row in rows)
+    return Catalog(version, entries, MappingProxyType({entry.id: entry for entry in entries}))
+
+
+class AchievementCatalogCache:
+    """
+    The achievement catalog as one immutable snapshot shared by every
+    request. Committing a session that wrote Achievement rows bumps the
+    version and drops the snapshot; a load that raced with that bump is
+    not installed. Other workers' writes (and raw SQL) are picked up when
+    the TTL expires, or immediately via invalidate().
+    """
+
+    def __init__(self, ttl_seconds: float = 300, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._catalog: Optional[Catalog] = None
+        self._loaded_at = 0.0
+        self._version = 0
+        self.hits = 0
+        self.loads = 0
+        self.invalidations = 0
+
+    def _current(self) -> Tuple[Optional[Catalog], int]:
+        with self._lock:
+            if self._catalog is not None and self._clock() - self._loaded_at <= self.ttl_seconds:
+                self.hits += 1
+                return self._catalog, self._version
+            return None, self._version
+
+    def _install(self, version: int, rows) -> Catalog:
+        catalog = _build(version, rows)
+        with self._lock:
+            self.loads += 1
+            if version == self._version:
+                self._catalog = catalog
+                self._loaded_at = self._clock()
+        return catalog
+
+    async def get(self, db) -> Catalog:
+        catalog, version = self._current()
+        if catalog is None:
+            rows = (await db.execute(select(*COLUMNS).order_by(Achievement.id))).all()
+            catalog = self._install(version, rows)
+        return catalog
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._catalog = None
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        catalog = self._catalog
+        return {
+            "version": self._version,
+            "loaded": catalog is not None,
+            "achievements": len(catalog.entries) if catalog else 0,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "loads": self.loads,
+            "invalidations": self.invalidations,
+        }
+
+
+achievement_catalog = AchievementCatalogCache(
+    ttl_seconds=float(os.getenv("ACHIEVEMENT_CATALOG_TTL_SECONDS", "300")),
+)
+
+
+# Flushes only mark the session; the catalog is dropped once the change is
+# committed, so a concurrent reload can't cache the pre-commit rows
+@event.listens_for(Session, "after_flush")
+def _mark_catalog_changes(session, flush_context):
+    if any(isinstance(obj, Achievement) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["achievements_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("achievements_changed", False):
+        achievement_catalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("achievements_changed", None)
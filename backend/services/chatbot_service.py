@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.chat_history import ChatHistory
 from models.mood import MoodEntry
 from models.coaching import Goal
@@ -6,15 +7,31 @@ from models.user import User
 from models.prediction import Prediction
 from schemas.chatbot import ChatMessage
 from chatbot.engine import BurnAwareChatbot
-from typing import List, Optional, Dict
+from chatbot.bulkhead import BulkheadFull
+from fastapi import HTTPException, status
+from services.context_cache import user_context_cache
+from services.single_flight import chat_single_flight
+from services.pagination import Page, fetch_page
+from typing import AsyncIterator, List, Optional, Dict
+import hashlib
 
 class ChatbotService:
-    def __init__(self, db: Session):
+    """Personalized chat on an AsyncSession, with the awaited LLM and streaming paths"""
+    
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.bot = BurnAwareChatbot()
     
-    def _get_user_context(self, user_id: int) -> Dict:
+    async def _get_user_context(self, user_id: int) -> Dict:
         """Gather user context for personalized responses"""
+        snapshot = user_context_cache.get(user_id)
+        if snapshot is None:
+            snapshot = await self._load_user_snapshot(user_id)
+            user_context_cache.set(user_id, snapshot)
+        
+        return self._build_context(snapshot)
+    
+    def _build_context(self, snapshot: Dict) -> Dict:
         context = {
             'name': 'friend',
             'mood': 'okay',
@@ -23,75 +40,120 @@ class ChatbotService:
             'goals': [],
             'recent_history': []
         }
+        context.update(snapshot)
+        return context
+    
+    async def _load_user_snapshot(self, user_id: int) -> Dict:
+        """Fetch name, latest mood and latest stress level in one round trip"""
+        return self._parse_snapshot((await self.db.execute(self._snapshot_query(user_id))).one())
+    
+    def _snapshot_query(self, user_id: int):
+        name = select(
+            func.coalesce(func.nullif(User.full_name, ''), func.nullif(User.username, ''))
+        ).where(User.id == user_id).scalar_subquery()
         
-        # Get user's name
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if user:
-            context['name'] = user.full_name or user.username or "friend"
-        
-        # Get most recent mood
-        recent_mood = self.db.query(MoodEntry).filter(
+        mood = select(MoodEntry.mood_category).where(
             MoodEntry.user_id == user_id
-        ).order_by(MoodEntry.created_at.desc()).first()
-        
-        if recent_mood:
-            context['mood'] = recent_mood.mood_category
+        ).order_by(MoodEntry.created_at.desc()).limit(1).scalar_subquery()
         
-        # Get stress level from most recent prediction
-        recent_prediction = self.db.query(Prediction).filter(
+        # Only the stress_level field, not the whole input_features blob
+        stress = select(Prediction.input_features['stress_level'].as_integer()).where(
             Prediction.user_id == user_id
-        ).order_by(Prediction.created_at.desc()).first()
+        ).order_by(Prediction.created_at.desc()).limit(1).scalar_subquery()
         
-        if recent_prediction:
-            input_features = recent_prediction.input_features
-            if input_features and 'stress_level' in input_features:
-                context['stress'] = input_features['stress_level']
+        return select(name, mood, stress)
+    
+    def _parse_snapshot(self, row) -> Dict:
+        snapshot = {}
+        if row[0]:
+            snapshot['name'] = row[0]
+        if row[1]:
+            snapshot['mood'] = row[1]
+        if row[2] is not None:
+            snapshot['stress'] = row[2]
+        return snapshot
+    
+    async def process_message(self, user_id: int, message: ChatMessage) -> ChatHistory:
+        """
+        Process a message; the LLM call is awaited, not blocking.
         
-        return context
+        Identical submissions from the same user (double-taps, client retries)
+        that arrive while one is in flight, or just after it, share its LLM
+        call and its ChatHistory row.
+        """
+        key = (user_id, hashlib.sha256(message.message.encode("utf-8")).hexdigest())
+        return await chat_single_flight.do(key, lambda: self._aprocess_message(user_id, message))
     
-    def process_message(self, user_id: int, message: ChatMessage) -> ChatHistory:
-        """Process a user message and generate a personalized response"""
-        # Get user context for personalization
-        user_context = self._get_user_context(user_id)
+    async def _aprocess_message(self, user_id: int, message: ChatMessage) -> ChatHistory:
+        user_context = await self._get_user_context(user_id)
+        
+        try:
+            response_text = await self.bot.agenerate_reply(
+                user_id=str(user_id),
+                user_data=user_context,
+                message=message.message
+            )
+        except BulkheadFull:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Ember is talking to a lot of people right now. Please try again in a moment.",
+                headers={"Retry-After": "2"}
+            )
+        
+        return await self._save_chat(user_id, message.message, response_text)
+    
+    async def stream_message(self, user_id: int, message: ChatMessage) -> AsyncIterator[Dict]:
+        """
+        Stream a reply as it is generated.
+        
+        Yields {"token": str} events while the LLM produces text, then one final
+        {"done": ChatHistory} event once the full reply has been persisted.
+        """
+        user_context = await self._get_user_context(user_id)
         
-        # Generate personalized response with new engine
-        # Engine expects: user_id: str, user_data: dict, message: str
-        response_text = self.bot.generate_reply(
+        chunks = []
+        async for token in self.bot.astream_reply(
             user_id=str(user_id),
             user_data=user_context,
             message=message.message
-        )
-        
-        # Analyze sentiment (Basic fallback or implement in engine if needed)
-        # The new engine doesn't have analyze_sentiment, so we'll defaults to neutral 
-        # or implement a simple check here if needed.
-        # For now, let's keep it simple as "neutral" or a basic keyword check.
-        sentiment = "neutral" 
+        ):
+            chunks.append(token)
+            yield {"token": token}
         
-        # Save to database (Persistent history)
+        chat_record = await self._save_chat(user_id, message.message, "".join(chunks).strip())
+        yield {"done": chat_record}
+    
+    async def _save_chat(self, user_id: int, message_text: str, response_text: str) -> ChatHistory:
+        """Persist one message/response pair to the chat history"""
         chat_record = ChatHistory(
             user_id=user_id,
-            message=message.message,
+            message=message_text,
             response=response_text,
-            sentiment=sentiment
+            sentiment="neutral"
         )
         
         self.db.add(chat_record)
-        self.db.commit()
-        self.db.refresh(chat_record)
+        await self.db.commit()
+        await self.db.refresh(chat_record)
         return chat_record
     
-    def get_chat_history(self, user_id: int, limit: int = 50) -> List[ChatHistory]:
+    async def get_chat_history(self, user_id: int, limit: int = 50) -> List[ChatHistory]:
         """Get chat history for a user"""
-        return self.db.query(ChatHistory).filter(
+        result = await self.db.scalars(select(ChatHistory).where(
             ChatHistory.user_id == user_id
-        ).order_by(ChatHistory.created_at.desc()).limit(limit).all()
+        ).order_by(ChatHistory.created_at.desc()).limit(limit))
+        return list(result)
+    
+    async def get_chat_history_page(self, user_id: int, limit: int = 50, cursor: Optional[str] = None,
+                                    fields: Optional[str] = None) -> Page:
+        """One newest-first page of a user's chat history"""
+        return await fetch_page(self.db, ChatHistory, user_id, limit, cursor, fields)
     
-    def delete_message(self, chat_id: int) -> bool:
+    async def delete_message(self, chat_id: int) -> bool:
         """Delete a chat message"""
-        chat_record = self.db.query(ChatHistory).filter(ChatHistory.id == chat_id).first()
+        chat_record = await self.db.get(ChatHistory, chat_id)
         if chat_record:
-            self.db.delete(chat_record)
-            self.db.commit()
+            await self.db.delete(chat_record)
+            await self.db.commit()
             return True
         return False
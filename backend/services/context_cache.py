@@ -0,0 +1,72 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class UserContextCache:
+    """
+    Per-user snapshot of the data the chatbot personalizes on (name, latest
+    mood, latest stress level). Writers update cached entries in place, so a
+    hit is always as fresh as this process's last write; the TTL bounds how
+    stale an entry can get from writes made by other workers.
+    """
+
+    def __init__(self, max_users: int = 10000, ttl_seconds: float = 300, clock=time.monotonic):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or self._clock() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return dict(entry[1])
+
+    def set(self, user_id: int, snapshot: Dict) -> None:
+        with self._lock:
+            self._entries[user_id] = (self._clock(), dict(snapshot))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def update(self, user_id: int, **fields) -> None:
+        """Write-through: patch a cached snapshot if there is one"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                entry[1].update(fields)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "users": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+user_context_cache = UserContextCache(
+    max_users=int(os.getenv("CHAT_CONTEXT_CACHE_USERS", "10000")),
+    ttl_seconds=float(os.getenv("CHAT_CONTEXT_TTL_SECONDS", "300")),
+)
@@ -1,7 +1,12 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy import create_engine, event, exc, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import AsyncGenerator, Dict, List
 import os
+import time
+import threading
 
 # Database URL - using SQLite for development
 # Database URL - using SQLite for development, Postgres for production
@@ -11,20 +16,220 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./burnaware.db")
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Engine profiles; every value can be overridden through the environment.
+# Postgres (Render) drops idle connections, so connections are pinged on
+# checkout and recycled before the server-side idle timeout.
+PROFILES = {
+    "postgresql": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 30000,
+    },
+    "sqlite": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "busy_timeout_ms": 5000,
+        "cache_size_kb": 20000,
+        "mmap_size_mb": 256,
+    },
+}
+
+ENV_OVERRIDES = {
+    "pool_size": "DB_POOL_SIZE",
+    "max_overflow": "DB_MAX_OVERFLOW",
+    "pool_timeout": "DB_POOL_TIMEOUT",
+    "pool_recycle": "DB_POOL_RECYCLE",
+    "pool_pre_ping": "DB_POOL_PRE_PING",
+    "statement_timeout_ms": "DB_STATEMENT_TIMEOUT_MS",
+    "busy_timeout_ms": "SQLITE_BUSY_TIMEOUT_MS",
+    "cache_size_kb": "SQLITE_CACHE_SIZE_KB",
+    "mmap_size_mb": "SQLITE_MMAP_SIZE_MB",
+}
+
+def engine_profile(url: str) -> Dict:
+    """Profile settings for a database URL, with environment overrides applied"""
+    backend = make_url(url).get_backend_name()
+    profile = dict(PROFILES.get(backend, PROFILES["postgresql"]))
+    for key, default in profile.items():
+        value = os.getenv(ENV_OVERRIDES[key])
+        if value is None:
+            continue
+        if isinstance(default, bool):
+            profile[key] = value.lower() == "true"
+        else:
+            profile[key] = int(value)
+    profile["backend"] = backend
+    return profile
+
+def _is_memory_sqlite(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in url
+
+
+class PoolMetrics:
+    """Checkout counts and wait times of one engine's connection pool"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.pool = None
+    
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+    
+    def stats(self) -> Dict:
+        stats = {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_checkout_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_checkout_wait_ms": round(self.max_wait * 1000, 3),
+        }
+        if isinstance(self.pool, QueuePool):
+            stats.update(
+                pool_size=self.pool.size(),
+                checked_out=self.pool.checkedout(),
+                idle=self.pool.checkedin(),
+                # QueuePool counts overflow from -pool_size until the pool is full
+                overflow=max(0, self.pool.overflow()),
+            )
+        return stats
+
+
+def timed_pool(base: type, metrics: PoolMetrics) -> type:
+    """A pool class that reports how long each checkout waited to `metrics`"""
+    
+    class TimedPool(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # dispose() recreates the pool; metrics follow the live one
+            metrics.pool = self
+        
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                connection = super().connect()
+            except exc.TimeoutError:
+                metrics.record(time.perf_counter() - started, timed_out=True)
+                raise
+            metrics.record(time.perf_counter() - started)
+            return connection
+    
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+
+def _apply_sqlite_pragmas(engine, profile: Dict, memory: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not memory:
+            # Readers no longer block the writer; NORMAL is durable in WAL mode
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA mmap_size={profile['mmap_size_mb'] * 1024 * 1024}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={profile['busy_timeout_ms']}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{profile['cache_size_kb']}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
+def engine_options(url: str, metrics: PoolMetrics, is_async: bool = False) -> Dict:
+    """create_engine / create_async_engine keyword arguments for a URL's profile"""
+    profile = engine_profile(url)
+    options = {}
+    connect_args = {}
+    
+    if profile["backend"] == "sqlite":
+        if not is_async:
+            connect_args["check_same_thread"] = False
+        if _is_memory_sqlite(url):
+            # Each connection would be a separate empty database; keep the default pool
+            return {"connect_args": connect_args}
+    elif profile["backend"] == "postgresql" and profile["statement_timeout_ms"]:
+        timeout = str(profile["statement_timeout_ms"])
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": timeout}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+    
+    options.update(
+        poolclass=timed_pool(AsyncAdaptedQueuePool if is_async else QueuePool, metrics),
+        pool_size=profile["pool_size"],
+        max_overflow=profile["max_overflow"],
+        pool_timeout=profile["pool_timeout"],
+        pool_recycle=profile["pool_recycle"],
+        pool_pre_ping=profile["pool_pre_ping"],
+        connect_args=connect_args,
+    )
+    return options
+
+
+def configure_engine(engine, url: str) -> None:
+    """Attach per-connection setup (SQLite pragmas) to a sync engine"""
+    profile = engine_profile(url)
+    if profile["backend"] == "sqlite":
+        _apply_sqlite_pragmas(engine, profile, _is_memory_sqlite(url))
+
+
+def to_async_url(url: str) -> str:
+    """Same database through its asyncio driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
 # Create engine
-connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+POOL_METRICS = {"sync": PoolMetrics("sync"), "async": PoolMetrics("async")}
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, POOL_METRICS["sync"]))
+configure_engine(engine, DATABASE_URL)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def get_db() -> Generator[Session, None, None]:
-    """Dependency for getting database session"""
-    db = SessionLocal()
-    try:
+# Async engine for every request; the sync engine above stays for init_db
+# (create_all and ensure_indexes at startup) and SessionLocal in one-off scripts
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, POOL_METRICS["async"], is_async=True)
+)
+configure_engine(async_engine.sync_engine, ASYNC_DATABASE_URL)
+
+# expire_on_commit=False: attributes stay loaded after commit, since an
+# AsyncSession can't lazy-load them back when a response is serialized
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+def pool_stats() -> Dict:
+    """Profile and checkout metrics of both engines"""
+    return {
+        name: {"url": engine.url.render_as_string(hide_password=True),
+               "profile": engine_profile(str(engine.url)), **POOL_METRICS[name].stats()}
+        for name, engine in (("sync", engine), ("async", async_engine))
+    }
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 def init_db():
     """Initialize database tables"""
@@ -32,4 +237,31 @@ def init_db():
     import models.gamification
     import models.coaching
     import models.mood
+    import models.prediction
+    import models.chat_history
     Base.metadata.create_all(bind=engine)
+    created = ensure_indexes(Base.metadata, engine)
+    if created:
+        print(f"Created missing indexes: {', '.join(created)}")
+
+def ensure_indexes(metadata, bind) -> List[str]:
+    """
+    Schema upgrade for existing databases: create_all skips tables that
+    already exist, so indexes declared on them later are created here.
+    Returns the names of the indexes that were created.
+    """
+    existing = inspect(bind)
+    created = []
+    for table in metadata.sorted_tables:
+        if not existing.has_table(table.name):
+            continue
+        present = {index["name"] for index in existing.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present:
+                index.create(bind=bind, checkfirst=True)
+                created.append(index.name)
+    return created
+
+async def close_async_db():
+    """Dispose of the async engine's connection pool"""
+    await async_engine.dispose()
@@ -0,0 +1,173 @@
+import os
+import time
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+def cpu_count() -> int:
+    """CPUs this process may actually run on"""
+    if hasattr(os, "process_cpu_count"):
+        return os.process_cpu_count() or 1
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+    # Runs in the worker (thread or process); wall-clock stamps are
+    # comparable across processes, so the caller can derive queue wait
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return started, time.time(), result
+
+
+def load_model_in_worker(model_path: Optional[str] = None) -> None:
+    """
+    Process-pool initializer: load the model artifact once in each worker.
+    A spawned (or forkserver) worker starts with an empty registry, and
+    scoring there would silently fall back to the rules otherwise.
+    """
+    from ml.registry import model_registry
+    if model_path:
+        model_registry.path = model_path
+    model_registry.load()
+
+
+class ExecutorPool:
+    """
+    A named, lazily started thread or process pool that async code submits
+    CPU-bound work to, so the event loop keeps serving other requests.
+    Threads suit work that releases the GIL (bcrypt, NumPy); processes suit
+    pure-Python work (functions and arguments must be picklable).
+    Process workers are started with an explicit start_method, not the
+    platform default: forking a parent that already runs aiosqlite, executor
+    and model-reload threads can deadlock. Anything a worker needs (e.g. the
+    model) must be set up by `initializer`, which runs once per worker.
+    """
+
+    def __init__(self, name: str, kind: str = "thread", max_workers: int = None,
+                 start_method: str = "spawn", initializer: Callable = None, initargs: tuple = ()):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers or cpu_count()
+        self.start_method = start_method
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            mp_context=multiprocessing.get_context(self.start_method),
+                            initializer=self.initializer,
+                            initargs=self.initargs,
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                            thread_name_prefix=self.name)
+        return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        submitted_at = time.time()
+        try:
+            started, finished, result = await loop.run_in_executor(self.executor, _timed_call, fn, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+                self.failed += 1
+            raise
+
+        wait = max(0.0, started - submitted_at)
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.total_run += finished - started
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> Dict:
+        busy = min(self.in_flight, self.max_workers)
+        return {
+            "kind": self.kind,
+            **({"start_method": self.start_method} if self.kind == "process" else {}),
+            "max_workers": self.max_workers,
+            "started": self._executor is not None,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.max_workers),
+            "occupancy": round(busy / self.max_workers, 3),
+            "max_in_flight": self.max_in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_queue_wait_ms": round(self.total_wait / self.completed * 1000, 3) if self.completed else 0.0,
+            "max_queue_wait_ms": round(self.max_wait * 1000, 3),
+            "avg_run_ms": round(self.total_run / self.completed * 1000, 3) if self.completed else 0.0,
+        }
+
+
+# GIL-releasing work: bcrypt hashing, NumPy/compiled-forest scoring
+CPU_THREADS = ExecutorPool(
+    "cpu-threads",
+    kind="thread",
+    max_workers=int(os.getenv("EXECUTOR_THREADS", "0")) or cpu_count(),
+)
+
+# Pure-Python work that would otherwise hold the GIL; started on first use.
+# Each worker loads MODEL_PATH itself, so scoring there uses the same model.
+CPU_PROCESSES = ExecutorPool(
+    "cpu-processes",
+    kind="process",
+    max_workers=int(os.getenv("EXECUTOR_PROCESSES", "0")) or cpu_count(),
+    start_method=os.getenv("EXECUTOR_START_METHOD", "spawn"),
+    initializer=load_model_in_worker,
+)
+
+POOLS = {pool.name: pool for pool in (CPU_THREADS, CPU_PROCESSES)}
+
+
+def get_pool(kind: str) -> Optional[ExecutorPool]:
+    """Pool for a config value: 'thread', 'process' or 'inline' (None)"""
+    if kind == "inline":
+        return None
+    return CPU_PROCESSES if kind == "process" else CPU_THREADS
+
+
+def executor_stats() -> Dict:
+    return {name: pool.stats() for name, pool in POOLS.items()}
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    for pool in POOLS.values():
+        pool.shutdown(wait=wait)
@@ -1,19 +1,37 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select
 from models.gamification import Streak, Achievement, UserAchievement, Challenge
 from models.coaching import Goal, GoalCategory
 from models.user import User
 from schemas.gamification import GoalCreate, GoalUpdate
+from services.pagination import Page, fetch_page
+from services.achievement_catalog import Catalog, achievement_catalog
 from datetime import datetime, timedelta
+from typing import Optional
 
 class GamificationService:
-    def __init__(self, db: Session):
+    """Points, streaks, achievements and goals on an AsyncSession"""
+    
+    def __init__(self, db: AsyncSession):
         self.db = db
         
     # --- Profile & Points ---
-    def get_profile(self, user_id: int):
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
+    async def get_profile(self, user_id: int):
+        rows = (await self.db.execute(self._profile_query(user_id))).all()
+        return self._build_profile(rows, await achievement_catalog.get(self.db))
+    
+    def _profile_query(self, user_id: int):
+        """Points, level, streak and every earned achievement in one round trip"""
+        return select(
+            User.points, User.level, Streak, UserAchievement.achievement_id, UserAchievement.earned_at
+        ).select_from(User).outerjoin(
+            Streak, Streak.user_id == User.id
+        ).outerjoin(
+            UserAchievement, UserAchievement.user_id == User.id
+        ).where(User.id == user_id).order_by(UserAchievement.earned_at)
+    
+    def _build_profile(self, rows, catalog: Catalog):
+        if not rows:
             # Return default profile if user not found
             return {
                 "points": 0,
@@ -22,33 +40,31 @@ class GamificationService:
                 "achievements": []
             }
         
-        streak = self.db.query(Streak).filter(Streak.user_id == user_id).first()
+        # Earliest award wins if an achievement was recorded twice
+        earned = {}
+        for row in rows:
+            if row.achievement_id is not None:
+                earned.setdefault(row.achievement_id, row.earned_at)
         
-        # Determine earned achievements
-        user_achievements = self.db.query(UserAchievement).filter(UserAchievement.user_id == user_id).all()
-        earned_ids = {ua.achievement_id for ua in user_achievements}
-        
-        all_achievements = self.db.query(Achievement).all()
-        achievements_resp = []
-        for ach in all_achievements:
-            ach_dict = {
-                "id": ach.id,
-                "name": ach.name,
-                "description": ach.description,
-                "icon_name": ach.icon_name,
-                "earned_at": next((ua.earned_at for ua in user_achievements if ua.achievement_id == ach.id), None)
-            }
-            achievements_resp.append(ach_dict)
-            
+        points, level, streak = rows[0][:3]
         return {
-            "points": user.points if user.points is not None else 0,
-            "level": user.level if user.level is not None else 1,
+            "points": points if points is not None else 0,
+            "level": level if level is not None else 1,
             "streak": streak,
-            "achievements": achievements_resp
+            "achievements": [
+                {
+                    "id": ach.id,
+                    "name": ach.name,
+                    "description": ach.description,
+                    "icon_name": ach.icon_name,
+                    "earned_at": earned.get(ach.id)
+                }
+                for ach in catalog.entries
+            ]
         }
 
-    def award_points(self, user_id: int, points: int):
-        user = self.db.query(User).filter(User.id == user_id).first()
+    async def award_points(self, user_id: int, points: int):
+        user = await self.db.get(User, user_id)
         user.points += points
         
         # Simple level up logic: Level = 1 + (Points / 100)
@@ -57,7 +73,7 @@ class GamificationService:
             user.level = new_level
             # TODO: Create notification for level up
             
-        self.db.commit()
+        await self.db.commit()
         self.check_achievements(user_id)
         
     def check_achievements(self, user_id: int):
@@ -65,8 +81,8 @@ class GamificationService:
         pass
 
     # --- Streaks ---
-    def update_streak(self, user_id: int):
-        streak = self.db.query(Streak).filter(Streak.user_id == user_id).first()
+    async def update_streak(self, user_id: int):
+        streak = await self.db.scalar(select(Streak).where(Streak.user_id == user_id))
         if not streak:
             streak = Streak(user_id=user_id, current_streak=1, longest_streak=1)
             self.db.add(streak)
@@ -82,19 +98,19 @@ class GamificationService:
                 streak.current_streak += 1
                 if streak.current_streak > streak.longest_streak:
                     streak.longest_streak = streak.current_streak
-                self.db.commit() # Commit streak update
+                await self.db.commit() # Commit streak update
                 # Award streak points
-                self.award_points(user_id, 10)
+                await self.award_points(user_id, 10)
             else:
                 # Streak broken
                 streak.current_streak = 1
                 
             streak.last_activity_date = datetime.utcnow()
             
-        self.db.commit()
+        await self.db.commit()
 
     # --- Coaching / Goals ---
-    def create_goal(self, user_id: int, goal_data: GoalCreate):
+    async def create_goal(self, user_id: int, goal_data: GoalCreate):
         goal = Goal(
             user_id=user_id,
             title=goal_data.title,
@@ -103,21 +119,28 @@ class GamificationService:
             target_date=goal_data.target_date
         )
         self.db.add(goal)
-        self.db.commit()
-        self.db.refresh(goal)
+        await self.db.commit()
+        await self.db.refresh(goal)
         return goal
         
-    def get_goals(self, user_id: int):
-        return self.db.query(Goal).filter(Goal.user_id == user_id).order_by(desc(Goal.created_at)).all()
+    async def get_goals(self, user_id: int):
+        result = await self.db.scalars(
+            select(Goal).where(Goal.user_id == user_id).order_by(desc(Goal.created_at))
+        )
+        return list(result)
+    
+    async def get_goals_page(self, user_id: int, limit: int = 100, cursor: Optional[str] = None,
+                             fields: Optional[str] = None) -> Page:
+        return await fetch_page(self.db, Goal, user_id, limit, cursor, fields)
         
-    def update_goal(self, goal_id: int, update_data: GoalUpdate):
-        goal = self.db.query(Goal).filter(Goal.id == goal_id).first()
+    async def update_goal(self, goal_id: int, update_data: GoalUpdate):
+        goal = await self.db.get(Goal, goal_id)
         if goal:
             goal.is_completed = update_data.is_completed
             if goal.is_completed:
                 goal.completed_at = datetime.utcnow()
                 # Award points for goal completion
-                self.award_points(goal.user_id, 50)
-            self.db.commit()
-            self.db.refresh(goal)
+                await self.award_points(goal.user_id, 50)
+            await self.db.commit()
+            await self.db.refresh(goal)
         return goal
@@ -1,9 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.mood import MoodEntry, MoodActivity, ActivityLog
 from models.user import User
 from schemas.mood import MoodEntryCreate
 from datetime import datetime
 from services.gamification_service import GamificationService
+from services.context_cache import user_context_cache
+from services.pagination import Page, fetch_page
+from typing import Optional
 
 # Hardcoded activities based on user request
 MOOD_ACTIVITIES = {
@@ -62,11 +65,13 @@ REASSURANCE_MESSAGES = {
 }
 
 class MoodService:
-    def __init__(self, db: Session):
+    """Mood logging and activities on an AsyncSession"""
+    
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.gamification = GamificationService(db)
         
-    def log_mood(self, user_id: int, entry: MoodEntryCreate):
+    async def log_mood(self, user_id: int, entry: MoodEntryCreate):
         # 1. Save Mood Entry
         mood_entry = MoodEntry(
             user_id=user_id,
@@ -74,8 +79,11 @@ class MoodService:
             note=entry.note
         )
         self.db.add(mood_entry)
-        self.db.commit()
-        
+        await self.db.commit()
+        user_context_cache.update(user_id, mood=entry.mood_category)
+        return self._suggestions(entry)
+    
+    def _suggestions(self, entry: MoodEntryCreate):
         # 2. Return Reassurance + Activities
         # In a real app, we might store these in DB. here we mock them as "Activity" objects
         suggestions = []
@@ -96,7 +104,12 @@ class MoodService:
             "suggested_activities": suggestions
         }
 
-    def complete_activity(self, user_id: int, activity_title: str):
+    async def get_mood_history_page(self, user_id: int, limit: int = 100, cursor: Optional[str] = None,
+                                    fields: Optional[str] = None) -> Page:
+        """One newest-first page of a user's mood entries"""
+        return await fetch_page(self.db, MoodEntry, user_id, limit, cursor, fields)
+    
+    async def complete_activity(self, user_id: int, activity_title: str):
         # Log activity
         log = ActivityLog(
             user_id=user_id,
@@ -106,7 +119,7 @@ class MoodService:
         
         # Award Points via Gamification Service
         # We award 20 points for a mood activity
-        self.gamification.award_points(user_id, 20)
+        await self.gamification.award_points(user_id, 20)
         
-        self.db.commit()
+        await self.db.commit()
         return {"status": "completed", "points_awarded": 20}
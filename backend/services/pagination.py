@@ -0,0 +1,102 @@
+import base64
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, or_, select
+
+# Response header carrying the cursor of the next (older) page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]
+    projected: bool
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def projected_columns(model, fields: Optional[str]) -> Optional[list]:
+    """Columns for a comma-separated `fields` value; id and created_at are always included"""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    table_columns = model.__table__.columns
+    unknown = [name for name in names if name not in table_columns]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(table_columns.keys())}"
+        )
+    ordered = ["id", "created_at"] + [name for name in names if name not in ("id", "created_at")]
+    return [table_columns[name] for name in dict.fromkeys(ordered)]
+
+
+def page_query(model, user_id: int, limit: int, cursor: Optional[str] = None, columns: Optional[list] = None):
+    """
+    Newest-first page of a user's rows, keyed on (created_at, id) so each
+    page is an index range scan however deep the client pages. One extra
+    row is fetched to tell whether another page follows.
+    """
+    query = select(*columns) if columns else select(model)
+    query = query.where(model.user_id == user_id)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        ))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def to_page(rows: List[Any], limit: int, projected: bool) -> Page:
+    """Page from the limit + 1 rows a page_query returned"""
+    items = [row._asdict() for row in rows] if projected else list(rows)
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        if projected:
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+        else:
+            next_cursor = encode_cursor(last.created_at, last.id)
+    return Page(items, next_cursor, projected)
+
+
+async def fetch_page(db, model, user_id: int, limit: int, cursor: Optional[str] = None,
+                     fields: Optional[str] = None) -> Page:
+    columns = projected_columns(model, fields)
+    query = page_query(model, user_id, limit, cursor, columns)
+    rows = (await db.execute(query)).all() if columns else (await db.scalars(query)).all()
+    return to_page(rows, limit, columns is not None)
+
+
+def page_response(page: Page, response: Response):
+    """
+    Route return value for a Page: the items as a JSON array, the next
+    cursor in the X-Next-Cursor header. Projected rows bypass the route's
+    response_model, which describes the full record.
+    """
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    if page.projected:
+        return JSONResponse(content=jsonable_encoder(page.items), headers=headers)
+    response.headers.update(headers)
+    return page.items
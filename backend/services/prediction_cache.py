@@ -0,0 +1,97 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ml.predictor import FEATURES
+
+# (burnout_score, risk_level, recommendations)
+CachedPrediction = Tuple[float, str, List[str]]
+
+
+class PredictionCache:
+    """
+    Bounded LRU of finished predictions keyed on the feature tuple (every
+    feature in model order) plus the model version. A hit skips both
+    inference and recommendation generation. Keys are exact by default;
+    quantum > 0 rounds them, so near-identical inputs share the first one's
+    result (opt-in: e.g. 5.96 hours of sleep may then get 6.0's result).
+    Misses are always scored on the features as entered. The cache tracks
+    the version it was filled for: the first lookup under a different model
+    version empties it, so a hot-swapped model never serves the previous
+    model's scores.
+    """
+
+    def __init__(self, max_entries: int = 10000, quantum: float = 0.0, enabled: bool = True):
+        self.max_entries = max_entries
+        self.quantum = quantum
+        self.enabled = enabled
+        self._entries: "OrderedDict[tuple, CachedPrediction]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def key(self, features: Dict) -> tuple:
+        """Lookup key for a feature dict: model order, rounded to `quantum` if set"""
+        values = (float(features.get(name, default)) for name, default in FEATURES)
+        if self.quantum > 0:
+            return tuple(round(round(value / self.quantum) * self.quantum, 6) for value in values)
+        return tuple(values)
+
+    def _check_version(self, version: str) -> None:
+        if version != self._version:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+            self._version = version
+
+    def get(self, features: Dict, version: str) -> Optional[CachedPrediction]:
+        if not self.enabled:
+            return None
+        key = self.key(features)
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1], list(entry[2])
+
+    def put(self, features: Dict, version: str, prediction: CachedPrediction) -> None:
+        if not self.enabled:
+            return
+        score, risk_level, recommendations = prediction
+        with self._lock:
+            self._check_version(version)
+            self._entries[self.key(features)] = (score, risk_level, list(recommendations))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "quantum": self.quantum,
+            "model_version": self._version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+prediction_cache = PredictionCache(
+    max_entries=int(os.getenv("PREDICTION_CACHE_SIZE", "10000")),
+    quantum=float(os.getenv("PREDICTION_CACHE_QUANTUM", "0")),
+    enabled=os.getenv("PREDICTION_CACHE", "true").lower() == "true",
+)
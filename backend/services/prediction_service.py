@@ -1,25 +1,65 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
 from models.prediction import Prediction
-from schemas.prediction import PredictionInput
+from schemas.prediction import PredictionInput, PredictionResponse
 from ml.predictor import BurnoutPredictor
+from ml.registry import RULES_VERSION, model_registry
+from ml.batcher import MicroBatcher, score_records
+from services.executors import CPU_THREADS, get_pool
+from services.pagination import Page, fetch_page
+from services.context_cache import user_context_cache
+from services.prediction_cache import prediction_cache
 from typing import List, Optional
+import os
+
+# Concurrent single predictions are scored together, off the event loop
+# (PREDICT_EXECUTOR: thread, process or inline)
+PREDICTION_BATCHER = MicroBatcher(
+    score_records,
+    max_batch_size=int(os.getenv("PREDICT_BATCH_MAX_SIZE", "32")),
+    max_wait=float(os.getenv("PREDICT_BATCH_WINDOW_MS", "2")) / 1000,
+    enabled=os.getenv("PREDICT_MICRO_BATCHING", "true").lower() == "true",
+    executor=get_pool(os.getenv("PREDICT_EXECUTOR", "thread")),
+)
 
 class PredictionService:
-    def __init__(self, db: Session):
+    """Burnout predictions on an AsyncSession; scoring is micro-batched or runs on the CPU pool"""
+    
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.predictor = BurnoutPredictor()
+        loaded_model = model_registry.get()
+        self.predictor = BurnoutPredictor(loaded_model=loaded_model)
+        self.model_version = loaded_model.version if loaded_model else RULES_VERSION
     
-    def create_prediction(self, user_id: int, input_data: PredictionInput) -> Prediction:
-        """Create a new burnout prediction"""
-        # Convert input to dict
+    async def create_prediction(self, user_id: int, input_data: PredictionInput) -> Prediction:
+        """Create a prediction, scoring it together with other concurrent requests"""
         features = input_data.model_dump()
         
-        # Get prediction from ML model
-        burnout_score, risk_level = self.predictor.predict(features)
-        
-        # Generate recommendations based on risk level
+        cached = prediction_cache.get(features, self.model_version)
+        if cached is None:
+            # Scored with whichever model is active at flush time, which may
+            # already be a hot-swapped successor of self.model_version
+            burnout_score, risk_level, version = await PREDICTION_BATCHER.predict(features)
+            if version == RULES_VERSION != self.model_version:
+                # Only a process worker that never loaded the model falls back like this
+                raise RuntimeError(
+                    f"Prediction worker scored with the rule-based fallback while model "
+                    f"{self.model_version} is loaded; it could not load MODEL_PATH"
+                )
+            cached = self._finish(features, version, burnout_score, risk_level)
+        return await self._save_prediction(user_id, features, *cached)
+    
+    def _finish(self, features: dict, version: str, burnout_score: float, risk_level: str) -> tuple:
+        # Generate recommendations based on risk level, and cache the lot
+        # under the version of the model that produced the score
         recommendations = self._generate_recommendations(risk_level, features)
-        
+        result = (burnout_score, risk_level, recommendations)
+        prediction_cache.put(features, version, result)
+        return result
+    
+    async def _save_prediction(self, user_id: int, features: dict, burnout_score: float, risk_level: str,
+                               recommendations: List[str]) -> Prediction:
         # Save to database
         db_prediction = Prediction(
             user_id=user_id,
@@ -30,19 +70,87 @@ class PredictionService:
         )
         
         self.db.add(db_prediction)
-        self.db.commit()
-        self.db.refresh(db_prediction)
+        await self.db.commit()
+        await self.db.refresh(db_prediction)
+        user_context_cache.update(user_id, stress=features["stress_level"])
         return db_prediction
     
-    def get_user_predictions(self, user_id: int) -> List[Prediction]:
+    async def create_predictions(self, user_id: Optional[int], inputs: List[PredictionInput]) -> List[PredictionResponse]:
+        """
+        Score many inputs in one vectorized call and insert them in one
+        transaction. Each input is filed under its own user_id if it has
+        one (a team's weekly survey), else under `user_id`.
+        """
+        user_ids, records = self._split_batch(user_id, inputs)
+        # A 10k-row batch takes tens of milliseconds to score; keep it off the loop
+        results = await CPU_THREADS.run(self._score_many, records)
+        db_predictions = self._build_predictions(user_ids, records, results)
+        
+        # One flush batches the INSERTs; read the rows back before commit
+        # expires them, instead of refreshing each one afterwards
+        self.db.add_all(db_predictions)
+        await self.db.flush()
+        responses = [PredictionResponse.model_validate(p) for p in db_predictions]
+        await self.db.commit()
+        self._remember_stress(user_ids, records)
+        return responses
+    
+    def _split_batch(self, user_id: Optional[int], inputs: List[PredictionInput]) -> tuple:
+        """(user id per input, feature dict per input)"""
+        user_ids = [getattr(input_data, "user_id", None) for input_data in inputs]
+        user_ids = [user_id if uid is None else uid for uid in user_ids]
+        if None in user_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Every record needs a user_id when the request has none"
+            )
+        return user_ids, [input_data.model_dump(exclude={"user_id"}) for input_data in inputs]
+    
+    def _remember_stress(self, user_ids: List[int], records: List[dict]) -> None:
+        # Each user's latest answer in the batch feeds their chat context
+        latest = {uid: features["stress_level"] for uid, features in zip(user_ids, records)}
+        for uid, stress in latest.items():
+            user_context_cache.update(uid, stress=stress)
+    
+    def _score_many(self, records: List[dict]) -> List[tuple]:
+        """(score, risk, recommendations) per record; only cache misses go to the model"""
+        results = [prediction_cache.get(features, self.model_version) for features in records]
+        
+        # Misses are still scored in one vectorized call
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            scored = self.predictor.predict_batch([records[i] for i in misses])
+            for i, (burnout_score, risk_level) in zip(misses, scored):
+                results[i] = self._finish(records[i], self.model_version, burnout_score, risk_level)
+        return results
+    
+    def _build_predictions(self, user_ids: List[int], records: List[dict], results: List[tuple]) -> List[Prediction]:
+        return [
+            Prediction(
+                user_id=uid,
+                burnout_score=burnout_score,
+                risk_level=risk_level,
+                input_features=features,
+                recommendations=recommendations
+            )
+            for uid, features, (burnout_score, risk_level, recommendations) in zip(user_ids, records, results)
+        ]
+    
+    async def get_user_predictions(self, user_id: int) -> List[Prediction]:
         """Get all predictions for a user"""
-        return self.db.query(Prediction).filter(
+        result = await self.db.scalars(select(Prediction).where(
             Prediction.user_id == user_id
-        ).order_by(Prediction.created_at.desc()).all()
+        ).order_by(Prediction.created_at.desc()))
+        return list(result)
+    
+    async def get_user_predictions_page(self, user_id: int, limit: int = 100, cursor: Optional[str] = None,
+                                        fields: Optional[str] = None) -> Page:
+        """One newest-first page of a user's predictions, optionally only some fields"""
+        return await fetch_page(self.db, Prediction, user_id, limit, cursor, fields)
     
-    def get_prediction_by_id(self, prediction_id: int) -> Optional[Prediction]:
+    async def get_prediction_by_id(self, prediction_id: int) -> Optional[Prediction]:
         """Get a specific prediction by ID"""
-        return self.db.query(Prediction).filter(Prediction.id == prediction_id).first()
+        return await self.db.get(Prediction, prediction_id)
     
     def _generate_recommendations(self, risk_level: str, features: dict) -> List[str]:
         """Generate personalized recommendations based on risk level and features"""
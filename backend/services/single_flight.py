@@ -0,0 +1,87 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    De-duplicates concurrent async calls by key. While a call for a key is
+    running, callers with the same key await the same result instead of
+    starting their own; for `window` seconds after it finishes, repeats get
+    the finished result as well. If the leader fails, its followers get the
+    same exception; if the leader is cancelled, a follower takes over the call.
+    """
+
+    def __init__(self, window: float = 5.0, clock=time.monotonic):
+        self.window = window
+        self._clock = clock
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        # Finished results in completion order, so expiry only pops the front
+        self._recent: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.calls = 0
+        self.shared = 0
+
+    def _expire(self, now: float) -> None:
+        while self._recent:
+            key, (expires_at, _) = next(iter(self._recent.items()))
+            if expires_at > now:
+                break
+            self._recent.popitem(last=False)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            now = self._clock()
+            self._expire(now)
+
+            recent = self._recent.get(key)
+            if recent is not None:
+                self.shared += 1
+                return recent[1]
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            try:
+                # shield: a follower disconnecting must not cancel the leader's call
+                result = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not this caller: go round again,
+                # so the first follower back becomes the new leader
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+            self.shared += 1
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the exception as retrieved when nobody else is waiting on it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        self.calls += 1
+        try:
+            result = await fn()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(result)
+        if self.window > 0:
+            self._recent[key] = (self._clock() + self.window, result)
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "shared": self.shared,
+        }
+
+
+chat_single_flight = SingleFlight(window=float(os.getenv("CHAT_DEDUP_WINDOW_SECONDS", "5")))
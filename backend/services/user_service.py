@@ -1,30 +1,35 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import User
 from schemas.user import UserCreate, UserLogin
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from typing import Optional
+from services.context_cache import user_context_cache
+from services.executors import CPU_THREADS
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 class UserService:
-    def __init__(self, db: Session):
+    """User accounts on an AsyncSession; bcrypt runs on the CPU thread pool"""
+    
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def hash_password(self, password: str) -> str:
-        """Hash a password"""
-        return pwd_context.hash(password)
+    async def hash_password(self, password: str) -> str:
+        """Hash a password on the CPU thread pool (bcrypt releases the GIL)"""
+        return await CPU_THREADS.run(pwd_context.hash, password)
     
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash"""
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash on the CPU thread pool"""
+        return await CPU_THREADS.run(pwd_context.verify, plain_password, hashed_password)
     
-    def create_user(self, user_data: UserCreate) -> User:
+    async def create_user(self, user_data: UserCreate) -> User:
         """Create a new user"""
         # Check if user already exists
-        existing_user = self.db.query(User).filter(
+        existing_user = await self.db.scalar(select(User.id).where(
             (User.email == user_data.email) | (User.username == user_data.username)
-        ).first()
+        ).limit(1))
         
         if existing_user:
             raise HTTPException(
@@ -33,24 +38,24 @@ class UserService:
             )
         
         # Create new user
-        hashed_password = self.hash_password(user_data.password)
         db_user = User(
             email=user_data.email,
             username=user_data.username,
-            hashed_password=hashed_password,
+            hashed_password=await self.hash_password(user_data.password),
             full_name=user_data.full_name
         )
         
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
+        await self.db.refresh(db_user)
+        user_context_cache.invalidate(db_user.id)
         return db_user
     
-    def authenticate_user(self, credentials: UserLogin) -> dict:
+    async def authenticate_user(self, credentials: UserLogin) -> dict:
         """Authenticate user and return token"""
-        user = self.db.query(User).filter(User.email == credentials.email).first()
+        user = await self.get_user_by_email(credentials.email)
         
-        if not user or not self.verify_password(credentials.password, user.hashed_password):
+        if not user or not await self.verify_password(credentials.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -68,10 +73,10 @@ class UserService:
             "full_name": user.full_name
         }
     
-    def get_user_by_id(self, user_id: int) -> Optional[User]:
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
-        return self.db.query(User).filter(User.id == user_id).first()
+        return await self.db.get(User, user_id)
     
-    def get_user_by_email(self, email: str) -> Optional[User]:
+    async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
-        return self.db.query(User).filter(User.email == email).first()
+        return await self.db.scalar(select(User).where(User.email == email))
@@ -0,0 +1,142 @@
+"""
+Checks the cached achievement catalog and the single-query get_profile
+(earned timestamps, invalidation on commit and rollback) and
+benchmarks get_profile against the old per-achievement scan as the
+catalog and a user's earned set grow.
+Run: python test_achievement_catalog.py
+"""
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from conftest import TempDatabase
+from models.user import User
+from models.gamification import Achievement, Streak, UserAchievement
+from services.achievement_catalog import achievement_catalog, AchievementCatalogCache
+from services.gamification_service import GamificationService
+
+EARNED_AT = datetime(2026, 5, 1)
+
+
+def _database(achievements: int = 5, earned: int = 2) -> TempDatabase:
+    database = TempDatabase()
+    with database.Session() as db:
+        db.add(User(id=1, email="a@b.co", username="abc", hashed_password="x", points=120, level=2))
+        db.add(Streak(user_id=1, current_streak=3, longest_streak=4))
+        db.add_all(Achievement(id=i, name=f"a{i}", description="d", icon_name="star", points_reward=10)
+                   for i in range(1, achievements + 1))
+        db.add_all(UserAchievement(user_id=1, achievement_id=i, earned_at=EARNED_AT + timedelta(days=i))
+                   for i in range(1, earned + 1))
+        db.commit()
+    achievement_catalog.invalidate()  # the cache is process-wide; start from this database
+    return database
+
+
+def _count_statements(database: TempDatabase):
+    statements = []
+    event.listen(database.async_engine.sync_engine, "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_profile_resolves_earned_achievements():
+    async def check(db):
+        profile = await GamificationService(db).get_profile(1)
+        assert profile["points"] == 120 and profile["level"] == 2
+        assert profile["streak"].current_streak == 3
+        assert profile["streak"].longest_streak == 4
+        earned = {a["id"]: a["earned_at"] for a in profile["achievements"]}
+        assert earned == {1: EARNED_AT + timedelta(days=1), 2: EARNED_AT + timedelta(days=2),
+                          3: None, 4: None, 5: None}
+        assert await GamificationService(db).get_profile(999) == {
+            "points": 0, "level": 1, "streak": None, "achievements": []}
+
+    with _database() as database:
+        database.run(check)
+
+
+def test_warm_profile_is_one_query():
+    with _database() as database:
+        async def check(db):
+            await GamificationService(db).get_profile(1)  # loads the catalog
+            statements = _count_statements(database)
+            await GamificationService(db).get_profile(1)
+            assert len(statements) == 1, statements
+
+        database.run(check)
+
+
+def test_commit_invalidates_and_rollback_does_not():
+    async def check(db):
+        service = GamificationService(db)
+        assert len((await service.get_profile(1))["achievements"]) == 5
+        version = achievement_catalog.stats()["version"]
+
+        db.add(Achievement(id=50, name="rolled back", description="d", icon_name="x"))
+        await db.flush()
+        await db.rollback()
+        assert achievement_catalog.stats()["version"] == version
+
+        db.add(Achievement(id=6, name="new", description="d", icon_name="x"))
+        await db.commit()
+        assert achievement_catalog.stats()["version"] == version + 1
+        assert [a["name"] for a in (await service.get_profile(1))["achievements"]][-1] == "new"
+
+    with _database() as database:
+        database.run(check)
+
+
+def test_load_racing_an_invalidation_is_not_installed():
+    cache = AchievementCatalogCache()
+    _, version = cache._current()
+    cache.invalidate()
+    cache._install(version, [(1, "stale", None, None, None, None, None)])
+    assert not cache.stats()["loaded"]
+
+
+def legacy_get_profile(db, user_id: int):
+    """The previous implementation: four queries and an O(A x U) scan"""
+    user = db.query(User).filter(User.id == user_id).first()
+    streak = db.query(Streak).filter(Streak.user_id == user_id).first()
+    user_achievements = db.query(UserAchievement).filter(UserAchievement.user_id == user_id).all()
+    achievements = []
+    for ach in db.query(Achievement).all():
+        achievements.append({
+            "id": ach.id, "name": ach.name, "description": ach.description, "icon_name": ach.icon_name,
+            "earned_at": next((ua.earned_at for ua in user_achievements if ua.achievement_id == ach.id), None),
+        })
+    return {"points": user.points, "level": user.level, "streak": streak, "achievements": achievements}
+
+
+def benchmark(calls: int = 50):
+    print("get_profile latency (catalog size / achievements earned)")
+    for size in (10, 100, 1000):
+        with _database(achievements=size, earned=size // 2) as database:
+            timings = {}
+            with database.Session() as db:
+                expected = legacy_get_profile(db, 1)["achievements"]
+                started = time.perf_counter()
+                for _ in range(calls):
+                    db.expire_all()
+                    legacy_get_profile(db, 1)
+                timings["before"] = (time.perf_counter() - started) / calls * 1000
+
+            async def after(db):
+                service = GamificationService(db)
+                assert (await service.get_profile(1))["achievements"] == expected
+                started = time.perf_counter()
+                for _ in range(calls):
+                    db.expire_all()
+                    await service.get_profile(1)
+                timings["after"] = (time.perf_counter() - started) / calls * 1000
+
+            database.run(after)
+        print(f"  {size:5d} / {size // 2:4d}   before {timings['before']:8.2f} ms   after {timings['after']:6.2f} ms")
+
+if __name__ == "__main__":
+    test_profile_resolves_earned_achievements()
+    test_warm_profile_is_one_query()
+    test_commit_invalidates_and_rollback_does_not()
+    test_load_racing_an_invalidation_is_not_installed()
+    print("achievement catalog checks passed")
+    benchmark()
@@ -0,0 +1,149 @@
+"""
+Checks the services against a temporary SQLite file and
+benchmarks concurrent requests: sync sessions inside async handlers (the
+old routes, which block the event loop on every query) vs AsyncSession.
+Run: python test_async_db.py
+"""
+import time
+import asyncio
+
+from conftest import TempDatabase
+from schemas.user import UserCreate, UserLogin
+from schemas.gamification import GoalCreate, GoalUpdate
+from schemas.mood import MoodEntryCreate
+from schemas.prediction import PredictionInput
+from models.coaching import Goal
+from models.prediction import Prediction
+from services.database import to_async_url
+from services.user_service import UserService
+from services.gamification_service import GamificationService
+from services.mood_service import MoodService
+from services.prediction_service import PredictionService
+from services.chatbot_service import ChatbotService
+
+RECORD = {
+    "work_hours_per_week": 55, "sleep_hours_per_day": 5, "stress_level": 8, "job_satisfaction": 3,
+    "work_life_balance": 3, "physical_activity_hours": 1, "social_support": 4,
+}
+
+
+def test_async_url_conversion():
+    assert to_async_url("sqlite:///./burnaware.db") == "sqlite+aiosqlite:///./burnaware.db"
+    assert to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert to_async_url("postgresql+psycopg2://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert to_async_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_services_round_trip():
+    with TempDatabase() as database:
+        async def run():
+            async with database.AsyncSession() as db:
+                users = UserService(db)
+                user = await users.create_user(UserCreate(email="a@b.co", username="abc", password="password1"))
+                token = await users.authenticate_user(UserLogin(email="a@b.co", password="password1"))
+                assert token["user_id"] == user.id
+
+                gamification = GamificationService(db)
+                goal = await gamification.create_goal(user.id, GoalCreate(title="Sleep 8h", category="health"))
+                await gamification.update_goal(goal.id, GoalUpdate(is_completed=True))
+                assert [g.id for g in await gamification.get_goals(user.id)] == [goal.id]
+
+                mood = await MoodService(db).log_mood(user.id, MoodEntryCreate(mood_category="sad"))
+                assert mood["suggested_activities"]
+                await MoodService(db).complete_activity(user.id, "Walk")
+                profile = await gamification.get_profile(user.id)
+                assert profile["points"] == 70
+
+                predictions = PredictionService(db)
+                prediction = await predictions.create_prediction(user.id, PredictionInput(**RECORD))
+                batch = await predictions.create_predictions(user.id, [PredictionInput(**RECORD)] * 3)
+                assert len(batch) == 3
+                assert (await predictions.get_prediction_by_id(prediction.id)).id == prediction.id
+                assert len(await predictions.get_user_predictions(user.id)) == 4
+
+                chatbot = ChatbotService(db)
+                context = await chatbot._get_user_context(user.id)
+                assert context["mood"] == "sad" and context["stress"] == 8
+                chat = await chatbot._save_chat(user.id, "hi", "hello")
+                assert [c.id for c in await chatbot.get_chat_history(user.id)] == [chat.id]
+                assert await chatbot.delete_message(chat.id)
+                assert not await chatbot.get_chat_history(user.id)
+            await database.async_engine.dispose()
+
+        asyncio.run(run())
+
+
+async def _serve(handler, requests: int, concurrency: int):
+    """Run `requests` handler calls, `concurrency` at a time; returns (req/s, max loop lag)"""
+    lag = 0.0
+    done = False
+
+    async def heartbeat(interval: float = 0.005):
+        nonlocal lag
+        while not done:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lag = max(lag, time.perf_counter() - expected)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await handler(i)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    seconds = time.perf_counter() - started
+    done = True
+    await beat
+    return requests / seconds, lag
+
+
+def benchmark(requests: int = 2000, concurrency: int = 50, users: int = 20):
+    with TempDatabase() as database:
+        SyncSession, AsyncSession = database.Session, database.AsyncSession
+        with SyncSession() as db:
+            for user_id in range(1, users + 1):
+                db.add_all(Prediction(user_id=user_id, burnout_score=7.5, risk_level="high",
+                                      input_features=dict(RECORD), recommendations=["Rest"])
+                           for _ in range(10))
+                db.add(Goal(user_id=user_id, title="Walk", category="health"))
+            db.commit()
+
+        # The old routes: async def handlers doing blocking queries on the loop
+        async def sync_handler(i):
+            with SyncSession() as db:
+                user_id = i % users + 1
+                db.query(Prediction).filter(Prediction.user_id == user_id).order_by(
+                    Prediction.created_at.desc()).all()
+                db.query(Goal).filter(Goal.user_id == user_id).order_by(Goal.created_at.desc()).all()
+
+        async def async_handler(i):
+            async with AsyncSession() as db:
+                user_id = i % users + 1
+                await PredictionService(db).get_user_predictions(user_id)
+                await GamificationService(db).get_goals(user_id)
+
+        async def run():
+            await _serve(async_handler, 50, concurrency)  # warm up the pool
+            results = {
+                "sync session": await _serve(sync_handler, requests, concurrency),
+                "async session": await _serve(async_handler, requests, concurrency),
+            }
+            await database.async_engine.dispose()
+            return results
+
+        results = asyncio.run(run())
+
+    print(f"{requests} requests (2 queries each), {concurrency} concurrent, SQLite file")
+    for name, (rate, lag) in results.items():
+        print(f"  {name:14s} {rate:8.0f} req/s   max event-loop lag {lag * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    test_async_url_conversion()
+    test_services_round_trip()
+    print("service checks passed")
+    benchmark()
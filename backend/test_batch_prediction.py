@@ -0,0 +1,146 @@
+"""
+Checks the vectorized batch scorer against per-record scoring and benchmarks
+POST /api/predictions/batch style workloads (scoring + one-transaction insert)
+against the one-request-per-record path for 1, 100 and 10k rows.
+Run: python test_batch_prediction.py
+"""
+import random
+import time
+from ml.predictor import BurnoutPredictor
+from ml.registry import model_registry
+from conftest import TempDatabase
+from models.user import User
+from fastapi import HTTPException
+from schemas.prediction import PredictionBatchRecord, PredictionInput
+from services.context_cache import user_context_cache
+from services.prediction_service import PredictionService
+
+
+def legacy_rule_score(features: dict) -> float:
+    """The previous scalar rule-based scorer, kept here as the reference"""
+    work_hours_norm = min(features.get("work_hours_per_week", 40) / 80, 1.0)
+    sleep_deficit = max(0, (8 - features.get("sleep_hours_per_day", 7)) / 8)
+    stress_norm = features.get("stress_level", 5) / 10
+    job_sat_norm = 1 - (features.get("job_satisfaction", 5) / 10)
+    wlb_norm = 1 - (features.get("work_life_balance", 5) / 10)
+    exercise_deficit = max(0, (3 - features.get("physical_activity_hours", 2)) / 3)
+    social_deficit = 1 - (features.get("social_support", 5) / 10)
+    return round((
+        work_hours_norm * 0.20 + sleep_deficit * 0.15 + stress_norm * 0.25 + job_sat_norm * 0.15 +
+        wlb_norm * 0.10 + exercise_deficit * 0.10 + social_deficit * 0.05
+    ) * 100, 2)
+
+
+def random_records(n: int, seed: int = 13):
+    rng = random.Random(seed)
+    return [
+        {
+            "work_hours_per_week": round(rng.uniform(10, 90), 1),
+            "sleep_hours_per_day": round(rng.uniform(3, 10), 1),
+            "stress_level": rng.randint(1, 10),
+            "job_satisfaction": rng.randint(0, 10),
+            "work_life_balance": rng.randint(1, 10),
+            "physical_activity_hours": round(rng.uniform(0, 8), 1),
+            "social_support": rng.randint(1, 10),
+        }
+        for _ in range(n)
+    ]
+
+
+def test_rule_based_batch_matches_scalar():
+    predictor = BurnoutPredictor()
+    records = random_records(2000)
+    batch = predictor.predict_batch(records)
+    for features, (score, risk) in zip(records, batch):
+        assert score == legacy_rule_score(features), features
+        assert (score, risk) == predictor.predict(features)
+    # Missing keys fall back to the same defaults as before
+    assert predictor.predict({})[0] == legacy_rule_score({})
+
+
+def test_model_batch_matches_single():
+    loaded = model_registry.load()
+    if loaded is None:
+        return
+    predictor = BurnoutPredictor(loaded_model=loaded)
+    records = random_records(300)
+    assert predictor.predict_batch(records) == [predictor.predict(r) for r in records]
+
+
+def test_batch_insert_single_transaction():
+    async def check(service, db):
+        inputs = [PredictionInput(**r) for r in random_records(50)]
+        created = await service.create_predictions(1, inputs)
+        assert len(created) == 50
+        assert len({p.id for p in created}) == 50
+        assert [p.burnout_score for p in created] == [s for s, _ in service.predictor.predict_batch([i.model_dump() for i in inputs])]
+        assert len(await service.get_user_predictions(1)) == 50
+
+    _run(check)
+
+
+def test_batch_files_each_record_under_its_user():
+    async def check(service, db):
+        db.add(User(id=2, email="two@example.com", username="two", hashed_password="x"))
+        await db.commit()
+        user_context_cache.set(1, {"name": "one", "stress": 1})
+        user_context_cache.set(2, {"name": "two", "stress": 1})
+        first, second, third = random_records(3)
+        created = await service.create_predictions(1, [
+            PredictionBatchRecord(**first, user_id=2),
+            PredictionBatchRecord(**second),
+            PredictionBatchRecord(**third, user_id=2),
+        ])
+        assert [p.user_id for p in created] == [2, 1, 2]
+        assert all("user_id" not in p.input_features for p in created)
+        assert user_context_cache.get(1)["stress"] == second["stress_level"]
+        assert user_context_cache.get(2)["stress"] == third["stress_level"]
+
+        try:
+            await service.create_predictions(None, [PredictionBatchRecord(**first, user_id=2),
+                                                    PredictionBatchRecord(**second)])
+        except HTTPException as e:
+            assert e.status_code == 400
+        else:
+            raise AssertionError("a record without any user_id was accepted")
+
+    _run(check)
+
+
+def _run(check):
+    """Await check(service, db) on a fresh database holding user 1"""
+    with TempDatabase() as database:
+        with database.Session() as db:
+            db.add(User(id=1, email="bench@example.com", username="bench", hashed_password="x"))
+            db.commit()
+        return database.run(lambda db: check(PredictionService(db), db))
+
+
+def benchmark():
+    model_registry.load()
+    for n in (1, 100, 10000):
+        inputs = [PredictionInput(**r) for r in random_records(n)]
+
+        async def per_row(service, db):
+            started = time.perf_counter()
+            for input_data in inputs:
+                await service.create_prediction(1, input_data)
+            return time.perf_counter() - started
+
+        async def batch(service, db):
+            started = time.perf_counter()
+            await service.create_predictions(1, inputs)
+            return time.perf_counter() - started
+
+        per_row, batched = _run(per_row), _run(batch)
+        print(f"{n:>6} rows: per-row {per_row * 1000:9.1f} ms | batch {batched * 1000:8.1f} ms | "
+              f"{per_row / batched:5.1f}x")
+
+
+if __name__ == "__main__":
+    test_rule_based_batch_matches_scalar()
+    test_model_batch_matches_single()
+    test_batch_insert_single_transaction()
+    test_batch_files_each_record_under_its_user()
+    print("Parity checks passed")
+    benchmark()
@@ -0,0 +1,162 @@
+"""
+Checks for the LLM bulkhead (queue limit, queue deadline) and how callers
+handle its rejections: the engine falls back after a queue timeout, a full
+queue becomes a 429 with Retry-After, and neither counts against the breaker.
+Run: python test_bulkhead.py
+"""
+import asyncio
+
+from fastapi import HTTPException
+
+from conftest import FakeClock
+from chatbot.engine import BurnAwareChatbot
+from chatbot.breaker import CircuitBreaker, HALF_OPEN
+from chatbot.bulkhead import Bulkhead, BulkheadFull, BulkheadTimeout
+from chatbot.memory import BoundedMemoryStore
+from chatbot.reply_cache import ReplyCache
+from chatbot.router import ReplyRouter
+from schemas.chatbot import ChatMessage
+from services.chatbot_service import ChatbotService
+from services.context_cache import user_context_cache
+
+USER = {"name": "Sam", "mood": "sad", "stress": 9}
+MESSAGE = "Everything at work is piling up and I can't keep up with it anymore"
+
+
+async def _settle():
+    """Let the other tasks run until they are all waiting"""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def _collect(stream):
+    return [token async for token in stream]
+
+
+async def _while_busy(bulkhead: Bulkhead, fn, queued: int = 0):
+    """Await fn() while every slot is held and `queued` more callers wait"""
+    release = asyncio.Event()
+
+    async def hold():
+        async with bulkhead.slot():
+            await release.wait()
+
+    holders = [asyncio.create_task(hold()) for _ in range(bulkhead.max_concurrent + queued)]
+    await _settle()
+    try:
+        return await fn()
+    finally:
+        release.set()
+        await asyncio.gather(*holders)
+
+
+def _bot(bulkhead: Bulkhead, breaker: CircuitBreaker = None):
+    return BurnAwareChatbot(
+        memory=BoundedMemoryStore(), router=ReplyRouter(local_intents=()),
+        breaker=breaker or CircuitBreaker(), reply_cache=ReplyCache(), bulkhead=bulkhead,
+    )
+
+
+def _half_open_breaker():
+    """A breaker with its single probe slot free"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=10, half_open_max_calls=1, clock=clock)
+    breaker.allow()
+    breaker.record_failure()
+    clock.now = 10
+    return breaker
+
+
+def test_full_queue_rejects_immediately():
+    async def run():
+        bulkhead = Bulkhead(max_concurrent=1, max_queue=1, queue_timeout=5)
+
+        async def enter():
+            assert bulkhead.stats()["in_flight"] == 1 and bulkhead.stats()["queue_depth"] == 1
+            try:
+                async with bulkhead.slot():
+                    raise AssertionError("admitted past a full queue")
+            except BulkheadFull:
+                pass
+
+        await _while_busy(bulkhead, enter, queued=1)
+        stats = bulkhead.stats()
+        assert (stats["admitted"], stats["rejected"], stats["in_flight"], stats["queue_depth"]) == (2, 1, 0, 0)
+    asyncio.run(run())
+
+
+def test_queue_deadline_times_out():
+    async def run():
+        bulkhead = Bulkhead(max_concurrent=1, max_queue=4, queue_timeout=0.01)
+
+        async def enter():
+            try:
+                async with bulkhead.slot():
+                    raise AssertionError("admitted while the slot was held")
+            except BulkheadTimeout:
+                pass
+
+        await _while_busy(bulkhead, enter)
+        stats = bulkhead.stats()
+        assert (stats["timed_out"], stats["rejected"], stats["queue_depth"]) == (1, 0, 0)
+        async with bulkhead.slot():  # the slot is usable again
+            assert bulkhead.stats()["in_flight"] == 1
+    asyncio.run(run())
+
+
+def test_queue_timeout_falls_back_without_judging_the_llm():
+    async def run():
+        breaker = _half_open_breaker()
+        bot = _bot(Bulkhead(max_concurrent=1, max_queue=1, queue_timeout=0.01), breaker)
+        reply = await _while_busy(bot.bulkhead, lambda: bot.agenerate_reply("u1", dict(USER), MESSAGE))
+        assert reply.strip()
+        assert bot.memory.get_turns("u1")[-1][1] == reply
+        assert bot.reply_cache.stats()["entries"] == 0
+
+        tokens = await _while_busy(bot.bulkhead, lambda: _collect(bot.astream_reply("u2", dict(USER), MESSAGE)))
+        assert len(tokens) == 1 and tokens[0].strip()
+        assert breaker.stats()["failures"] == 1 and breaker.state == HALF_OPEN
+        assert breaker.allow()  # the probe permit was handed back each time
+    asyncio.run(run())
+
+
+def test_full_queue_propagates_without_judging_the_llm():
+    async def run():
+        breaker = _half_open_breaker()
+        bot = _bot(Bulkhead(max_concurrent=1, max_queue=0), breaker)
+        try:
+            await _while_busy(bot.bulkhead, lambda: bot.agenerate_reply("u1", dict(USER), MESSAGE))
+        except BulkheadFull:
+            pass
+        else:
+            raise AssertionError("BulkheadFull was swallowed")
+        assert not bot.memory.get_turns("u1")
+        assert breaker.stats()["failures"] == 1 and breaker.state == HALF_OPEN
+        assert breaker.allow()
+    asyncio.run(run())
+
+
+def test_service_maps_a_full_queue_to_429():
+    async def run():
+        user_context_cache.set(7, {"name": "Sam", "stress": 9})  # no database round trip
+        service = ChatbotService(db=None)
+        service.bot = _bot(Bulkhead(max_concurrent=1, max_queue=0))
+        try:
+            await _while_busy(service.bot.bulkhead,
+                              lambda: service._aprocess_message(7, ChatMessage(message=MESSAGE)))
+        except HTTPException as e:
+            assert e.status_code == 429 and e.headers == {"Retry-After": "2"}
+        else:
+            raise AssertionError("a full bulkhead was not turned into a 429")
+        finally:
+            user_context_cache.invalidate(7)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_full_queue_rejects_immediately()
+    test_queue_deadline_times_out()
+    test_queue_timeout_falls_back_without_judging_the_llm()
+    test_full_queue_propagates_without_judging_the_llm()
+    test_service_maps_a_full_queue_to_429()
+    print("Bulkhead checks passed.")
@@ -0,0 +1,76 @@
+"""
+Checks for the LLM circuit breaker state machine.
+Run: python test_circuit_breaker.py
+"""
+from conftest import FakeClock
+from chatbot.breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+def make_breaker(clock):
+    return CircuitBreaker(failure_threshold=3, slow_call_seconds=2.0, recovery_seconds=10.0,
+                          half_open_max_calls=1, success_threshold=2, clock=clock)
+
+
+def test_opens_after_failures_and_slow_calls():
+    breaker = make_breaker(FakeClock())
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_success(5.0)  # too slow, counts against the circuit
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_success_resets_failure_run():
+    breaker = make_breaker(FakeClock())
+    for _ in range(2):
+        breaker.allow()
+        breaker.record_failure()
+    breaker.allow()
+    breaker.record_success(0.1)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probes_close_or_reopen():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(3):
+        breaker.allow()
+        breaker.record_failure()
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 20
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+
+
+def test_release_frees_probe():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(3):
+        breaker.allow()
+        breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+if __name__ == "__main__":
+    test_opens_after_failures_and_slow_calls()
+    test_success_resets_failure_run()
+    test_half_open_probes_close_or_reopen()
+    test_release_frees_probe()
+    print("Circuit breaker checks passed.")
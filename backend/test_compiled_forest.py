@@ -0,0 +1,88 @@
+"""
+Checks the flat-array forest against sklearn and benchmarks single-row and
+batched latency for both.
+Run: python test_compiled_forest.py
+"""
+import time
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor, ExtraTreesRegressor
+from ml.compiled import compile_forest
+from ml.registry import DEFAULT_MODEL_PATH, load_artifact
+
+
+def training_data(n: int = 500, seed: int = 42):
+    """Same feature ranges as create_model.py"""
+    rng = np.random.RandomState(seed)
+    X = np.column_stack([
+        rng.uniform(10, 70, n), rng.uniform(4, 10, n), rng.randint(1, 11, n), rng.randint(1, 11, n),
+        rng.randint(1, 11, n), rng.uniform(0, 10, n), rng.randint(1, 11, n),
+    ]).astype(np.float64)
+    y = X[:, 0] / 70 * 20 + (10 - X[:, 1]) * 2 + X[:, 2] * 2.5 + rng.normal(0, 5, n)
+    return X, np.clip(y, 0, 100)
+
+
+def test_regressor_matches_sklearn():
+    X, y = training_data()
+    for model in (RandomForestRegressor(n_estimators=50, max_depth=10, random_state=0),
+                  ExtraTreesRegressor(n_estimators=20, random_state=0)):
+        model.fit(X, y)
+        compiled = compile_forest(model)
+        X_new, _ = training_data(2000, seed=1)
+        np.testing.assert_allclose(compiled.predict(X_new), model.predict(X_new), rtol=1e-9, atol=1e-9)
+        # Rows sitting exactly on split thresholds take the same branch
+        np.testing.assert_allclose(compiled.predict(X), model.predict(X), rtol=1e-9, atol=1e-9)
+
+
+def test_classifier_matches_sklearn():
+    X, y = training_data()
+    model = RandomForestClassifier(n_estimators=50, max_depth=6, random_state=0).fit(X, (y > 45).astype(int))
+    compiled = compile_forest(model)
+    X_new, _ = training_data(2000, seed=2)
+    np.testing.assert_allclose(compiled.predict(X_new), model.predict_proba(X_new), rtol=1e-9, atol=1e-12)
+
+
+def test_shipped_artifact_uses_compiled_path():
+    loaded = load_artifact(DEFAULT_MODEL_PATH)
+    assert loaded.compiled is not None
+    reference = load_artifact(DEFAULT_MODEL_PATH, compile=False)
+    X, _ = training_data(500, seed=3)
+    np.testing.assert_allclose(loaded.predict_scores(X), reference.predict_scores(X), rtol=1e-9, atol=1e-9)
+
+
+def test_unsupported_estimator_rejected():
+    from sklearn.linear_model import LinearRegression
+    X, y = training_data(50)
+    try:
+        compile_forest(LinearRegression().fit(X, y))
+    except ValueError:
+        return
+    raise AssertionError("LinearRegression should not compile")
+
+
+def _time(fn, repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def benchmark():
+    X, y = training_data()
+    model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1).fit(X, y)
+    compiled = compile_forest(model)
+    print(f"create_model.py forest: {compiled.info()}")
+    for rows, repeat in ((1, 200), (100, 100), (10000, 5)):
+        batch, _ = training_data(rows, seed=5)
+        sk = _time(lambda: model.predict(batch), repeat)
+        flat = _time(lambda: compiled.predict(batch), repeat)
+        print(f"{rows:>6} rows: sklearn {sk * 1000:8.3f} ms | compiled {flat * 1000:8.3f} ms | {sk / flat:5.1f}x")
+
+
+if __name__ == "__main__":
+    test_regressor_matches_sklearn()
+    test_classifier_matches_sklearn()
+    test_shipped_artifact_uses_compiled_path()
+    test_unsupported_estimator_rejected()
+    print("Parity checks passed")
+    benchmark()
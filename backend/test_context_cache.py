@@ -0,0 +1,89 @@
+"""
+Checks the per-user chat context cache (TTL, LRU bound, write-through
+updates) and that logging a mood or a prediction keeps a cached context as
+fresh as the database, without another snapshot query.
+Run: python test_context_cache.py
+"""
+from sqlalchemy import event
+
+from conftest import FakeClock, TempDatabase
+from models.user import User
+from schemas.mood import MoodEntryCreate
+from schemas.prediction import PredictionInput
+from services.chatbot_service import ChatbotService
+from services.context_cache import UserContextCache, user_context_cache
+from services.mood_service import MoodService
+from services.prediction_service import PredictionService
+
+RECORD = {
+    "work_hours_per_week": 55, "sleep_hours_per_day": 5, "stress_level": 8, "job_satisfaction": 3,
+    "work_life_balance": 3, "physical_activity_hours": 1, "social_support": 4,
+}
+
+
+def test_ttl_expiry_and_lru_eviction():
+    clock = FakeClock()
+    cache = UserContextCache(max_users=2, ttl_seconds=60, clock=clock)
+    cache.set(1, {"mood": "okay"})
+    cache.set(2, {"mood": "sad"})
+    assert cache.get(1) == {"mood": "okay"}  # 1 is now the most recent
+    cache.set(3, {"mood": "great"})
+    assert cache.get(2) is None and cache.get(1) is not None
+
+    clock.now = 61
+    assert cache.get(1) is None and cache.get(3) is None
+    assert cache.stats() == {"users": 0, "hits": 2, "misses": 3, "hit_rate": 0.4}
+
+
+def test_update_patches_only_cached_users():
+    cache = UserContextCache()
+    cache.set(1, {"name": "Sam", "mood": "okay"})
+    cache.update(1, mood="sad")
+    cache.update(2, mood="sad")  # not cached: the next read loads it
+    assert cache.get(1) == {"name": "Sam", "mood": "sad"}
+    assert cache.get(2) is None
+
+    cache.get(1)["mood"] = "mutated"
+    assert cache.get(1)["mood"] == "sad"
+    cache.invalidate(1)
+    assert cache.get(1) is None
+
+
+def test_writes_keep_the_cached_context_fresh():
+    user_context_cache.clear()
+    with TempDatabase() as database:
+        with database.Session() as db:
+            db.add(User(id=1, email="a@b.co", username="sam", hashed_password="x"))
+            db.commit()
+
+        async def check(db):
+            chatbot = ChatbotService(db)
+            assert (await chatbot._get_user_context(1))["mood"] == "okay"  # loads and caches
+
+            await MoodService(db).log_mood(1, MoodEntryCreate(mood_category="sad"))
+            await PredictionService(db).create_prediction(1, PredictionInput(**RECORD))
+
+            statements = []
+
+            def capture(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            engine = database.async_engine.sync_engine
+            event.listen(engine, "before_cursor_execute", capture)
+            context = await chatbot._get_user_context(1)
+            event.remove(engine, "before_cursor_execute", capture)
+            assert (context["name"], context["mood"], context["stress"]) == ("sam", "sad", 8)
+            assert statements == []
+
+            # The written-through snapshot matches what the database now says
+            assert await chatbot._load_user_snapshot(1) == user_context_cache.get(1)
+
+        database.run(check)
+    user_context_cache.clear()
+
+
+if __name__ == "__main__":
+    test_ttl_expiry_and_lru_eviction()
+    test_update_patches_only_cached_users()
+    test_writes_keep_the_cached_context_fresh()
+    print("Context cache checks passed.")
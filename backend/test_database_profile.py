@@ -0,0 +1,119 @@
+"""
+Checks the engine profiles in services.database: SQLite pragmas on every
+connection, environment overrides, Postgres pool/timeout options, and the
+pool checkout-wait metrics (including timeouts on an exhausted pool).
+Run: python test_database_profile.py
+"""
+import os
+import time
+import tempfile
+import threading
+from sqlalchemy import create_engine, exc, text
+
+from services.database import PoolMetrics, configure_engine, engine_options, engine_profile
+
+
+def _sqlite_engine(path: str, metrics: PoolMetrics):
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, **engine_options(url, metrics))
+    configure_engine(engine, url)
+    return engine
+
+
+def test_sqlite_pragmas_applied_on_connect():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = _sqlite_engine(os.path.join(tmp, "p.db"), PoolMetrics("test"))
+        with engine.connect() as conn:
+            pragma = lambda name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("busy_timeout") == 5000
+            assert pragma("cache_size") == -20000
+            assert pragma("mmap_size") == 256 * 1024 * 1024
+        engine.dispose()
+
+
+def test_memory_sqlite_keeps_default_pool():
+    options = engine_options("sqlite://", PoolMetrics("test"))
+    assert "poolclass" not in options
+
+
+def test_environment_overrides_profile():
+    os.environ["DB_POOL_SIZE"] = "12"
+    os.environ["DB_POOL_PRE_PING"] = "false"
+    try:
+        profile = engine_profile("postgresql://u:p@db/app")
+        assert profile["pool_size"] == 12 and profile["pool_pre_ping"] is False
+        assert profile["pool_recycle"] == 1800
+    finally:
+        del os.environ["DB_POOL_SIZE"], os.environ["DB_POOL_PRE_PING"]
+
+
+def test_postgres_statement_timeout_per_driver():
+    metrics = PoolMetrics("test")
+    sync = engine_options("postgresql://u:p@db/app", metrics)
+    assert sync["connect_args"] == {"options": "-c statement_timeout=30000"}
+    assert sync["pool_pre_ping"] and sync["pool_recycle"] == 1800
+    async_ = engine_options("postgresql+asyncpg://u:p@db/app", metrics, is_async=True)
+    assert async_["connect_args"] == {"server_settings": {"statement_timeout": "30000"}}
+
+
+def test_checkout_waits_and_timeouts_are_recorded():
+    os.environ["DB_POOL_SIZE"] = "1"
+    os.environ["DB_MAX_OVERFLOW"] = "0"
+    os.environ["DB_POOL_TIMEOUT"] = "1"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            metrics = PoolMetrics("test")
+            engine = _sqlite_engine(os.path.join(tmp, "w.db"), metrics)
+
+            held = engine.connect()
+            released = threading.Timer(0.2, held.close)
+            released.start()
+            with engine.connect():  # waits for the timer to return the only connection
+                pass
+            released.join()
+            stats = metrics.stats()
+            assert stats["checkouts"] == 2
+            assert stats["max_checkout_wait_ms"] >= 150
+            assert stats["pool_size"] == 1 and stats["checked_out"] == 0
+
+            held = engine.connect()
+            try:
+                engine.connect()
+                assert False, "expected a pool timeout"
+            except exc.TimeoutError:
+                pass
+            held.close()
+            assert metrics.stats()["timeouts"] == 1
+            engine.dispose()
+    finally:
+        for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_TIMEOUT"):
+            del os.environ[name]
+
+
+def benchmark(rows: int = 2000):
+    """Committed single-row inserts: default settings vs the SQLite profile"""
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = create_engine(f"sqlite:///{os.path.join(tmp, 'plain.db')}")
+        tuned = _sqlite_engine(os.path.join(tmp, "tuned.db"), PoolMetrics("bench"))
+        for name, engine in (("defaults", plain), ("profile", tuned)):
+            with engine.begin() as conn:
+                conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)"))
+            started = time.perf_counter()
+            for i in range(rows):
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO t (v) VALUES (:v)"), {"v": str(i)})
+            seconds = time.perf_counter() - started
+            print(f"  {name:9s} {rows / seconds:8.0f} committed inserts/s")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    test_sqlite_pragmas_applied_on_connect()
+    test_memory_sqlite_keeps_default_pool()
+    test_environment_overrides_profile()
+    test_postgres_statement_timeout_per_driver()
+    test_checkout_waits_and_timeouts_are_recorded()
+    print("database profile checks passed")
+    benchmark()
@@ -0,0 +1,132 @@
+"""
+Checks that CPU-bound work submitted to the executor pools keeps the event
+loop responsive, and measures event-loop lag with bcrypt inline vs offloaded.
+Run: python test_executors.py
+"""
+import time
+import asyncio
+from services.executors import ExecutorPool, CPU_THREADS, load_model_in_worker
+from services.user_service import pwd_context
+from ml.batcher import score_records
+from ml.predictor import BurnoutPredictor
+from ml.registry import RULES_VERSION, model_registry
+
+RECORD = {
+    "work_hours_per_week": 55, "sleep_hours_per_day": 5, "stress_level": 8, "job_satisfaction": 3,
+    "work_life_balance": 3, "physical_activity_hours": 1, "social_support": 4,
+}
+
+
+async def _max_loop_lag(work, interval: float = 0.005) -> float:
+    """Run `work` while a heartbeat measures the worst scheduling delay"""
+    lag = 0.0
+    done = False
+
+    async def heartbeat():
+        nonlocal lag
+        while not done:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lag = max(lag, time.perf_counter() - expected)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    await work()
+    done = True
+    await beat
+    return lag
+
+
+def test_thread_pool_runs_work_and_reports_metrics():
+    pool = ExecutorPool("test-threads", kind="thread", max_workers=2)
+
+    async def run():
+        return await asyncio.gather(*(pool.run(sum, range(n)) for n in range(10)))
+
+    assert asyncio.run(run()) == [sum(range(n)) for n in range(10)]
+    stats = pool.stats()
+    assert stats["submitted"] == stats["completed"] == 10
+    assert stats["in_flight"] == 0 and stats["max_in_flight"] == 10
+    pool.shutdown()
+    assert not pool.stats()["started"]
+
+
+def test_failures_are_counted_and_raised():
+    pool = ExecutorPool("test-fail", kind="thread", max_workers=1)
+
+    async def run():
+        return await pool.run(int, "not a number")
+
+    try:
+        asyncio.run(run())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError should propagate")
+    assert pool.stats()["failed"] == 1
+    pool.shutdown()
+
+
+def test_process_pool_scores_with_the_parents_model():
+    loaded = model_registry.load()
+    assert loaded is not None, f"no model artifact at {model_registry.path}"
+    expected = score_records([RECORD])
+    assert expected[0][2] == loaded.version
+    assert expected[0][0] != BurnoutPredictor().predict(RECORD)[0]  # not the rule-based score
+
+    # spawn: the worker starts empty and only has the model the initializer loads
+    with_model = ExecutorPool("test-processes", kind="process", max_workers=1, start_method="spawn",
+                              initializer=load_model_in_worker, initargs=(model_registry.path,))
+    without_model = ExecutorPool("test-bare-processes", kind="process", max_workers=1, start_method="spawn")
+
+    async def run():
+        return await asyncio.gather(with_model.run(score_records, [RECORD]),
+                                    without_model.run(score_records, [RECORD]))
+
+    scored, bare = asyncio.run(run())
+    assert scored == expected
+    assert bare[0][2] == RULES_VERSION
+    with_model.shutdown()
+    without_model.shutdown()
+
+
+def test_bcrypt_offload_keeps_loop_responsive():
+    hashed = pwd_context.hash("password123")
+
+    async def offloaded():
+        assert await CPU_THREADS.run(pwd_context.verify, "password123", hashed)
+
+    # One bcrypt verify takes far longer than the heartbeat interval, but the
+    # loop keeps ticking while it runs on the pool
+    assert asyncio.run(_max_loop_lag(offloaded)) < 0.1
+    CPU_THREADS.shutdown()
+
+
+def benchmark():
+    hashed = pwd_context.hash("password123")
+    logins = 8
+
+    async def inline():
+        for _ in range(logins):
+            pwd_context.verify("password123", hashed)
+
+    async def offloaded():
+        await asyncio.gather(*(CPU_THREADS.run(pwd_context.verify, "password123", hashed) for _ in range(logins)))
+
+    for label, work in (("inline", inline), (f"{CPU_THREADS.max_workers} threads", offloaded)):
+        started = time.perf_counter()
+        lag = asyncio.run(_max_loop_lag(work))
+        elapsed = time.perf_counter() - started
+        print(f"{label:>10}: {logins} bcrypt verifies in {elapsed * 1000:7.1f} ms | "
+              f"worst event-loop stall {lag * 1000:7.1f} ms")
+    print(CPU_THREADS.stats())
+    CPU_THREADS.shutdown()
+
+
+if __name__ == "__main__":
+    test_thread_pool_runs_work_and_reports_metrics()
+    test_failures_are_counted_and_raised()
+    test_process_pool_scores_with_the_parents_model()
+    test_bcrypt_offload_keeps_loop_responsive()
+    print("Executor checks passed")
+    benchmark()
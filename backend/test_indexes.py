@@ -0,0 +1,141 @@
+"""
+Checks that the per-user latest-first queries use the (user_id, created_at)
+indexes: the SQL the services actually run is captured and fed to SQLite's
+EXPLAIN QUERY PLAN, on a database created without the indexes (an existing
+deployment) and again after ensure_indexes has upgraded it.
+Run: python test_indexes.py
+"""
+import time
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import event, text
+
+from conftest import TempDatabase
+from models.user import Base, User
+from models.chat_history import ChatHistory
+from models.coaching import Goal
+from models.mood import MoodEntry
+from models.prediction import Prediction
+from services.database import ensure_indexes
+from services.chatbot_service import ChatbotService
+from services.gamification_service import GamificationService
+from services.prediction_service import PredictionService
+
+HOT_INDEXES = {
+    "ix_mood_entries_user_id_created_at",
+    "ix_predictions_user_id_created_at",
+    "ix_chat_history_user_id_created_at",
+    "ix_goals_user_id_created_at",
+}
+
+
+def _legacy_database() -> TempDatabase:
+    """A database as created before the indexes were declared"""
+    database = TempDatabase()
+    with database.engine.begin() as conn:
+        for name in HOT_INDEXES:
+            conn.execute(text(f"DROP INDEX {name}"))
+    return database
+
+
+def _seed(database: TempDatabase, users: int = 3, rows: int = 20):
+    start = datetime(2026, 1, 1)
+    with database.Session() as db:
+        for u in range(1, users + 1):
+            db.add(User(id=u, email=f"u{u}@x.co", username=f"user{u}", hashed_password="x"))
+        for u in range(1, users + 1):
+            for i in range(rows):
+                at = start + timedelta(hours=i)
+                db.add(MoodEntry(user_id=u, mood_category="okay", created_at=at))
+                db.add(Prediction(user_id=u, burnout_score=5.0, risk_level="medium",
+                                  input_features={"stress_level": 5}, created_at=at))
+                db.add(ChatHistory(user_id=u, message="hi", response="hello", created_at=at))
+                db.add(Goal(user_id=u, title="walk", created_at=at))
+        db.commit()
+
+
+def _hot_query_plans(database: TempDatabase, user_id: int = 2):
+    """EXPLAIN QUERY PLAN of every SELECT the hot service reads issue"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    async def run():
+        engine = database.async_engine
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        async with database.AsyncSession() as db:
+            await ChatbotService(db)._load_user_snapshot(user_id)
+            await ChatbotService(db).get_chat_history(user_id)
+            await PredictionService(db).get_user_predictions(user_id)
+            await GamificationService(db).get_goals(user_id)
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+        await engine.dispose()
+
+    asyncio.run(run())
+    plans = []
+    with database.engine.connect() as conn:
+        raw = conn.connection.dbapi_connection
+        for statement, parameters in statements:
+            rows = raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append(" | ".join(row[-1] for row in rows))
+    return plans
+
+
+def test_legacy_database_scans_and_sorts():
+    with _legacy_database() as database:
+        _seed(database)
+        plans = _hot_query_plans(database)
+        assert not any("_user_id_created_at" in plan for plan in plans)
+        assert any("TEMP B-TREE FOR ORDER BY" in plan for plan in plans)
+
+
+def test_ensure_indexes_upgrades_and_queries_use_them():
+    with _legacy_database() as database:
+        _seed(database)
+        assert set(ensure_indexes(Base.metadata, database.engine)) == HOT_INDEXES
+        assert ensure_indexes(Base.metadata, database.engine) == []  # idempotent
+
+        plans = _hot_query_plans(database)
+        # snapshot (mood + stress subqueries), chat history, predictions, goals
+        joined = " || ".join(plans)
+        for name in HOT_INDEXES:
+            assert name in joined, (name, plans)
+        assert not any("TEMP B-TREE" in plan for plan in plans), plans
+
+
+def benchmark(users: int = 500, rows: int = 400, lookups: int = 500):
+    """Latest-first per-user reads on a legacy database, before and after ensure_indexes"""
+    with _legacy_database() as database:
+        start = datetime(2026, 1, 1)
+        with database.engine.begin() as conn:
+            conn.execute(ChatHistory.__table__.insert(), [
+                {"user_id": u, "message": "hi", "response": "hello", "sentiment": "neutral",
+                 "created_at": start + timedelta(minutes=i * users + u)}
+                for i in range(rows) for u in range(1, users + 1)
+            ])
+
+        async def run():
+            async with database.AsyncSession() as db:
+                service = ChatbotService(db)
+                started = time.perf_counter()
+                for i in range(lookups):
+                    await service.get_chat_history(i % users + 1)
+                elapsed = time.perf_counter() - started
+            await database.async_engine.dispose()
+            return elapsed / lookups * 1000
+
+        before = asyncio.run(run())
+        ensure_indexes(Base.metadata, database.engine)
+        after = asyncio.run(run())
+    print(f"get_chat_history over {users * rows} rows ({users} users)")
+    print(f"  without index {before:7.3f} ms/query")
+    print(f"  with index    {after:7.3f} ms/query")
+
+
+if __name__ == "__main__":
+    test_legacy_database_scans_and_sorts()
+    test_ensure_indexes_upgrades_and_queries_use_them()
+    print("index checks passed")
+    benchmark()
@@ -0,0 +1,99 @@
+"""
+Benchmark the compiled intent matcher against the old per-keyword regex scan.
+Also checks both return the same intent for every message in the corpus.
+Run: python test_intent_speed.py
+"""
+import re
+import random
+import time
+from chatbot.intents import detect_intent, detect_intents, match_intent, RULES
+from chatbot.bot_legacy import MentalHealthBot, KEYWORDS
+
+
+def legacy_detect_intent(text: str) -> str:
+    """The previous chatbot.intents.detect_intent, kept here as the reference"""
+    text = text.lower()
+    if text in ["no", "nah", "nope"]:
+        return "disagreement"
+    if text in ["yes", "yeah", "yep", "ok", "okay"]:
+        return "agreement"
+    for intent, keywords in RULES.items():
+        for k in keywords:
+            pattern = r'\b' + re.escape(k) + r'\b'
+            if re.search(pattern, text):
+                return intent
+    return "general"
+
+
+def legacy_bot_intent(message: str) -> str:
+    for intent, keywords in KEYWORDS.items():
+        for keyword in keywords:
+            if re.search(r'\b' + re.escape(keyword) + r'\b', message):
+                return intent
+    return "general"
+
+
+MESSAGES = [
+    "hi", "no", "yes", "Hey", "bye", "I'm so stressed and overwhelmed with exams",
+    "I can't sleep at all", "Thanks for your help", "I hate everything right now",
+    "stayed up late night again", "good night!", "hello, I have a test tomorrow",
+    "I feel stuck and unmotivated", "nothing much going on today", "hell of a day",
+    "I've had 3 coffees already and I'm still exhausted", "not really", "okay",
+    "I'm feeling fun, crack some jokes!", "Tell me a joke to cheer me up",
+]
+
+VOCAB = sorted({w for ks in list(RULES.values()) + list(KEYWORDS.values()) for k in ks for w in k.split()}
+               | {"the", "and", "i", "am", "so", "really", "today", "work", "hell", "hiyaa", "nothing"})
+
+
+def random_corpus(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(VOCAB) for _ in range(rng.randint(1, 15))) for _ in range(n)]
+
+
+def test_parity():
+    bot = MentalHealthBot()
+    corpus = MESSAGES + random_corpus(5000)
+    for text in corpus:
+        assert detect_intent(text) == legacy_detect_intent(text), text
+        assert bot._detect_intent(text.lower()) == legacy_bot_intent(text.lower()), text
+    assert detect_intents(corpus) == [legacy_detect_intent(t) for t in corpus]
+
+
+def test_match_details():
+    m = match_intent("stayed up late night again")
+    assert m.intent == "farewell"
+    assert ("sleep_problem", 10, 20) in m.spans and ("farewell", 15, 20) in m.spans
+    assert match_intent("hi").confidence == 1.0
+    assert match_intent("nothing to report").confidence == 0.0
+
+
+def bench(fn, corpus, rounds=5):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def test_intent_speed():
+    corpus = MESSAGES + random_corpus(2000)
+    old_us = bench(legacy_detect_intent, corpus)
+    new_us = bench(detect_intent, corpus)
+    start = time.perf_counter()
+    detect_intents(corpus)
+    batch_us = (time.perf_counter() - start) / len(corpus) * 1e6
+
+    print(f"Legacy per-keyword scan: {old_us:8.2f} µs/message")
+    print(f"Compiled matcher:        {new_us:8.2f} µs/message")
+    print(f"Compiled batch API:      {batch_us:8.2f} µs/message")
+    print(f"Speedup: {old_us / new_us:.1f}x")
+
+
+if __name__ == "__main__":
+    test_parity()
+    test_match_details()
+    print("Parity check passed.")
+    test_intent_speed()
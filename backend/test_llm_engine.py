@@ -0,0 +1,148 @@
+"""
+Checks how the chatbot engine handles LLM responses that carry no text
+(e.g. a safety block): the user gets the template fallback, nothing blank is
+cached or remembered, and the breaker doesn't count it either way. Also
+checks that the call deadline covers a streamed reply from start to end.
+Run: python test_llm_engine.py
+"""
+import time
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+
+import chatbot.engine as engine
+from chatbot.engine import BurnAwareChatbot
+from chatbot.breaker import CircuitBreaker
+from chatbot.bulkhead import Bulkhead
+from chatbot.memory import BoundedMemoryStore
+from chatbot.reply_cache import ReplyCache
+from chatbot.router import ReplyRouter
+
+USER = {"name": "Sam", "mood": "sad", "stress": 9}
+MESSAGE = "Everything at work is piling up and I can't keep up with it anymore"
+
+
+class FakeModels:
+    """Stands in for client.models / client.aio.models"""
+
+    def __init__(self, texts, pause: float = 0.0):
+        self.texts = texts
+        self.pause = pause
+
+    def generate_content(self, model, contents):
+        return SimpleNamespace(text="".join(t or "" for t in self.texts) or None)
+
+    async def agenerate_content(self, model, contents):
+        return self.generate_content(model, contents)
+
+    async def generate_content_stream(self, model, contents):
+        async def chunks():
+            for i, text in enumerate(self.texts):
+                if i and self.pause:
+                    await asyncio.sleep(self.pause)
+                yield SimpleNamespace(text=text)
+        return chunks()
+
+
+@contextmanager
+def fake_gemini(texts, pause: float = 0.0):
+    """Swap the module's Gemini client for one that returns `texts`, `pause` seconds apart"""
+    models = FakeModels(texts, pause)
+    original = engine._client
+    engine._client = SimpleNamespace(
+        models=models,
+        aio=SimpleNamespace(models=SimpleNamespace(
+            generate_content=models.agenerate_content,
+            generate_content_stream=models.generate_content_stream,
+        )),
+    )
+    try:
+        yield
+    finally:
+        engine._client = original
+
+
+def _bot():
+    return BurnAwareChatbot(
+        memory=BoundedMemoryStore(), router=ReplyRouter(local_intents=()), breaker=CircuitBreaker(),
+        reply_cache=ReplyCache(), bulkhead=Bulkhead(),
+    )
+
+
+def _stream(bot):
+    async def collect():
+        return [token async for token in bot.astream_reply("u1", dict(USER), MESSAGE)]
+    return asyncio.run(collect())
+
+
+def test_empty_stream_yields_and_remembers_fallback():
+    bot = _bot()
+    with fake_gemini([None, "", "   "]):
+        tokens = _stream(bot)
+    assert len(tokens) == 1 and tokens[0].strip()
+    assert bot.memory.get_turns("u1")[-1][1] == tokens[0]
+    assert bot.reply_cache.stats()["entries"] == 0
+    assert bot.breaker.stats()["failures"] == 0
+
+
+def test_empty_reply_falls_back_on_every_path():
+    bot = _bot()
+    with fake_gemini([None]):
+        assert asyncio.run(bot.agenerate_reply("u2", dict(USER), MESSAGE)).strip()
+        assert bot.generate_reply("u3", dict(USER), MESSAGE).strip()
+    assert bot.reply_cache.stats()["entries"] == 0
+    assert bot.breaker.stats()["failures"] == 0
+
+
+def test_streamed_text_is_kept():
+    bot = _bot()
+    with fake_gemini(["  Take ", "a short walk."]):
+        assert "".join(_stream(bot)) == "Take a short walk."
+    assert bot.memory.get_turns("u1")[-1][1] == "Take a short walk."
+    assert bot.reply_cache.stats()["entries"] == 1
+
+
+def test_replies_built_on_a_conversation_are_not_shared():
+    bot = _bot()
+    bot.reply_cache = ReplyCache(pool_size=1)
+    with fake_gemini(["Hello Sam."]):
+        asyncio.run(bot.agenerate_reply("a", dict(USER), "Good morning, long week ahead"))
+    with fake_gemini(["Last time you said your manager keeps adding tasks."]):
+        asyncio.run(bot.agenerate_reply("a", dict(USER), MESSAGE))
+    with fake_gemini(["What is piling up the most?"]):
+        reply = asyncio.run(bot.agenerate_reply("b", dict(USER, name="Bob"), MESSAGE))
+    assert reply == "What is piling up the most?"
+    assert bot.reply_cache.stats()["bypassed_context"] == 1
+
+
+def test_deadline_covers_the_whole_stream():
+    async def slow_reader(bot):
+        tokens = []
+        async for token in bot.astream_reply("u2", dict(USER), MESSAGE):
+            tokens.append(token)
+            await asyncio.sleep(0.2)
+        return tokens
+
+    with mock.patch.object(engine, "LLM_DEADLINE_SECONDS", 0.05):
+        # A stalled upstream
+        bot = _bot()
+        started = time.monotonic()
+        with fake_gemini(["Take ", "a short walk."], pause=1.0):
+            assert _stream(bot) == ["Take "]
+        assert time.monotonic() - started < 0.5
+        # A slow reader holding the bulkhead slot
+        with fake_gemini(["Take ", "a short walk."]):
+            assert asyncio.run(slow_reader(bot)) == ["Take "]
+    assert bot.breaker.stats()["failures"] == 2
+    assert bot.bulkhead.stats()["in_flight"] == 0
+    assert bot.reply_cache.stats()["entries"] == 0
+
+
+if __name__ == "__main__":
+    test_empty_stream_yields_and_remembers_fallback()
+    test_empty_reply_falls_back_on_every_path()
+    test_streamed_text_is_kept()
+    test_replies_built_on_a_conversation_are_not_shared()
+    test_deadline_covers_the_whole_stream()
+    print("llm engine checks passed")
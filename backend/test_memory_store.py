@@ -0,0 +1,60 @@
+"""
+Checks for the bounded chatbot memory store (LRU, idle TTL, turn limit).
+Run: python test_memory_store.py
+"""
+from conftest import FakeClock
+from chatbot.memory import BoundedMemoryStore, MemoryStore
+
+
+def test_reads_do_not_create_entries():
+    store = BoundedMemoryStore(max_users=10)
+    assert store.get_history("ghost") == ""
+    assert len(store) == 0
+    assert store.stats()["misses"] == 1
+
+
+def test_turn_limit_and_lru_eviction():
+    store = BoundedMemoryStore(max_users=2, max_turns=2)
+    for i in range(3):
+        store.save_message("a", f"m{i}", f"r{i}")
+    assert store.get_turns("a") == [("m1", "r1"), ("m2", "r2")]
+
+    store.save_message("b", "hi", "hey")
+    store.get_turns("a")  # touch "a" so "b" is least recently used
+    store.save_message("c", "yo", "hello")
+    assert store.get_turns("b") == []
+    assert store.get_turns("a") and store.get_turns("c")
+    assert store.stats()["evictions"] == 1
+
+
+def test_idle_ttl_expiry():
+    clock = FakeClock()
+    store = BoundedMemoryStore(ttl_seconds=60, clock=clock)
+    store.save_message("a", "hi", "hey")
+    clock.now = 30
+    store.save_message("b", "hi", "hey")
+    clock.now = 61
+    assert store.get_turns("a") == []
+    assert store.get_turns("b") == [("hi", "hey")]
+    assert store.stats()["expirations"] == 1
+
+
+def test_store_must_implement_the_interface():
+    class Partial(MemoryStore):
+        def get_turns(self, user_id):
+            return []
+
+    try:
+        Partial()
+    except TypeError as e:
+        assert "save_message" in str(e) and "clear" in str(e)
+    else:
+        raise AssertionError("a store without save_message/clear was instantiated")
+
+
+if __name__ == "__main__":
+    test_reads_do_not_create_entries()
+    test_turn_limit_and_lru_eviction()
+    test_idle_ttl_expiry()
+    test_store_must_implement_the_interface()
+    print("Memory store checks passed.")
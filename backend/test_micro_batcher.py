@@ -0,0 +1,88 @@
+"""
+Checks that concurrent predictions are coalesced into batches with the same
+results as scoring one at a time, and benchmarks a burst of requests with
+and without micro-batching.
+Run: python test_micro_batcher.py
+"""
+import time
+import random
+import asyncio
+from ml.batcher import MicroBatcher, score_records
+from ml.registry import model_registry
+
+
+def _records(n: int, seed: int = 21):
+    rng = random.Random(seed)
+    return [
+        {
+            "work_hours_per_week": rng.uniform(10, 90),
+            "sleep_hours_per_day": rng.uniform(3, 10),
+            "stress_level": rng.randint(1, 10),
+            "job_satisfaction": rng.randint(0, 10),
+            "work_life_balance": rng.randint(1, 10),
+            "physical_activity_hours": rng.uniform(0, 8),
+            "social_support": rng.randint(1, 10),
+        }
+        for _ in range(n)
+    ]
+
+
+async def _burst(batcher: MicroBatcher, records):
+    return await asyncio.gather(*(batcher.predict(r) for r in records))
+
+
+def test_concurrent_requests_share_batches():
+    batcher = MicroBatcher(score_records, max_batch_size=16, max_wait=0.005)
+    records = _records(100)
+    results = asyncio.run(_burst(batcher, records))
+    assert results == [score_records([r])[0] for r in records]
+    stats = batcher.stats()
+    assert stats["items"] == 100
+    # 6 full batches of 16 plus the 4 left over when the window closes
+    assert stats["batches"] == 7 and stats["full_batches"] == 6
+
+
+def test_lone_request_waits_for_window_only():
+    batcher = MicroBatcher(score_records, max_batch_size=16, max_wait=0.01)
+    started = time.perf_counter()
+    asyncio.run(_burst(batcher, _records(1)))
+    elapsed = time.perf_counter() - started
+    assert 0.009 <= elapsed < 0.5
+    assert batcher.stats()["last_batch_size"] == 1
+
+
+def test_errors_reach_every_caller():
+    def broken(records):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(broken, max_batch_size=4, max_wait=0.001)
+
+    async def run():
+        return await asyncio.gather(*(batcher.predict(r) for r in _records(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert batcher.stats()["errors"] == 1
+
+
+def benchmark():
+    model_registry.load()
+    records = _records(2000)
+    for label, batcher in (
+        ("unbatched", MicroBatcher(score_records, enabled=False)),
+        ("batched (32, 2 ms)", MicroBatcher(score_records, max_batch_size=32, max_wait=0.002)),
+    ):
+        started = time.perf_counter()
+        asyncio.run(_burst(batcher, records))
+        elapsed = time.perf_counter() - started
+        stats = batcher.stats()
+        print(f"{label:>20}: {len(records)} concurrent predictions in {elapsed * 1000:8.1f} ms | "
+              f"avg batch {stats['avg_batch_size']:5.1f} | avg queue wait {stats['avg_queue_wait_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_batches()
+    test_lone_request_waits_for_window_only()
+    test_errors_reach_every_caller()
+    print("Micro-batching checks passed")
+    benchmark()
@@ -0,0 +1,154 @@
+"""
+Round-trips burnout.pkl through the memory-mapped artifact format, checks
+the registry's background hot swap across both formats and its feature
+column check, and compares cold-load time against unpickling.
+Run: python test_model_artifact.py
+"""
+import os
+import time
+import pickle
+import shutil
+import tempfile
+import threading
+from unittest import mock
+import joblib
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
+import ml.registry
+from ml.artifact import MANIFEST, convert, load_mmap_artifact
+from ml.registry import DEFAULT_MODEL_PATH, ModelRegistry, load_artifact
+
+
+def _rows(n: int = 1000, seed: int = 4):
+    rng = np.random.RandomState(seed)
+    return np.column_stack([
+        rng.uniform(10, 70, n), rng.uniform(4, 10, n), rng.randint(1, 11, n), rng.randint(0, 11, n),
+        rng.randint(1, 11, n), rng.uniform(0, 10, n), rng.randint(1, 11, n),
+    ])
+
+
+def test_round_trip_matches_pickle():
+    with tempfile.TemporaryDirectory() as directory:
+        manifest = convert(DEFAULT_MODEL_PATH, directory)
+        mapped = load_mmap_artifact(directory)
+        assert mapped.version == manifest["version"]
+        assert mapped.model is None
+        assert isinstance(mapped.compiled.value, np.memmap)
+        reference = load_artifact(DEFAULT_MODEL_PATH, compile=False)
+        X = _rows()
+        np.testing.assert_allclose(mapped.predict_scores(X), reference.predict_scores(X), rtol=1e-9, atol=1e-9)
+
+
+def test_conversion_is_deterministic_and_replaces_old_files():
+    with tempfile.TemporaryDirectory() as directory:
+        first = convert(DEFAULT_MODEL_PATH, directory)
+        # A stale array file from an older version is cleaned up on re-export
+        open(os.path.join(directory, "value.0000deadbeef.npy"), "wb").close()
+        second = convert(DEFAULT_MODEL_PATH, directory)
+        assert first["version"] == second["version"]
+        assert sorted(f for f in os.listdir(directory) if f.endswith(".npy")) == sorted(second["arrays"].values())
+
+
+def test_registry_serves_artifact_directory():
+    with tempfile.TemporaryDirectory() as directory:
+        convert(DEFAULT_MODEL_PATH, directory)
+        registry = ModelRegistry(directory, check_interval=0)
+        loaded = registry.load()
+        assert loaded.artifact_format == "mmap"
+        # Re-writing the manifest is what triggers a hot swap
+        _touch(os.path.join(directory, MANIFEST))
+        registry.get()
+        registry._reload_thread.join()
+        assert registry.get() is not loaded
+        assert registry.stats()["reloads"] == 1
+
+
+def _touch(path: str) -> None:
+    later = time.time() + 5
+    os.utime(path, (later, later))
+
+
+def test_hot_swap_loads_off_the_request_path():
+    with tempfile.TemporaryDirectory() as directory:
+        path = shutil.copy(DEFAULT_MODEL_PATH, os.path.join(directory, "burnout.pkl"))
+        registry = ModelRegistry(path, check_interval=0)
+        loaded = registry.load()
+        started, release = threading.Event(), threading.Event()
+
+        def slow_load(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return load_artifact(*args, **kwargs)
+
+        _touch(path)
+        with mock.patch.object(ml.registry, "load_artifact", slow_load):
+            assert registry.get() is loaded  # returns at once; the load runs on a thread
+            assert started.wait(5)
+            assert registry.get() is loaded
+            release.set()
+            registry._reload_thread.join()
+        assert registry.get() is not loaded and registry.stats()["reloads"] == 1
+
+
+def test_swaps_between_joblib_and_raw_pickle():
+    rows = _rows(200)
+    model = DecisionTreeClassifier(max_depth=3, random_state=0).fit(rows, (rows[:, 2] > 5).astype(int))
+    with tempfile.TemporaryDirectory() as directory:
+        path = shutil.copy(DEFAULT_MODEL_PATH, os.path.join(directory, "burnout.pkl"))
+        registry = ModelRegistry(path, check_interval=0)
+        assert registry.load().artifact_format == "joblib"
+
+        with open(path, "wb") as f:
+            pickle.dump(model, f)
+        _touch(path)
+        registry.get()
+        registry._reload_thread.join()
+        swapped = registry.get()
+        assert swapped.artifact_format == "pickle" and swapped.estimator == "DecisionTreeClassifier"
+        assert np.allclose(swapped.predict_scores(rows[:20]), model.predict_proba(rows[:20])[:, 1] * 100)
+
+
+def test_mismatched_feature_columns_are_rejected():
+    reference = joblib.load(DEFAULT_MODEL_PATH)
+    with tempfile.TemporaryDirectory() as directory:
+        path = shutil.copy(DEFAULT_MODEL_PATH, os.path.join(directory, "burnout.pkl"))
+        registry = ModelRegistry(path, check_interval=0)
+        loaded = registry.load()
+
+        columns = list(reference["feature_columns"])
+        columns[0], columns[1] = columns[1], columns[0]
+        joblib.dump({**reference, "feature_columns": columns}, path)
+        try:
+            load_artifact(path)
+        except ValueError as e:
+            assert "columns" in str(e)
+        else:
+            raise AssertionError("a model with reordered columns was loaded")
+
+        _touch(path)
+        registry.get()
+        registry._reload_thread.join()
+        assert registry.get() is loaded and registry.stats()["load_errors"] == 1
+
+
+def benchmark():
+    with tempfile.TemporaryDirectory() as directory:
+        convert(DEFAULT_MODEL_PATH, directory)
+        for label, path in (("pickle/joblib", DEFAULT_MODEL_PATH), ("mmap artifact", directory)):
+            timings = []
+            for _ in range(5):
+                started = time.perf_counter()
+                load_artifact(path)
+                timings.append(time.perf_counter() - started)
+            print(f"{label:>14}: cold load {min(timings) * 1000:8.2f} ms (best of 5)")
+
+
+if __name__ == "__main__":
+    test_round_trip_matches_pickle()
+    test_conversion_is_deterministic_and_replaces_old_files()
+    test_registry_serves_artifact_directory()
+    test_hot_swap_loads_off_the_request_path()
+    test_swaps_between_joblib_and_raw_pickle()
+    test_mismatched_feature_columns_are_rejected()
+    print("Artifact checks passed")
+    benchmark()
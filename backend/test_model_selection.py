@@ -0,0 +1,52 @@
+"""
+Checks the latency-aware model search on a small synthetic survey set.
+Run: python test_model_selection.py
+"""
+import numpy as np
+from ml.selection import candidate_grid, report_row, select_model
+
+
+def survey_data(n: int = 200, seed: int = 0):
+    rng = np.random.RandomState(seed)
+    X = np.column_stack([
+        rng.uniform(10, 70, n), rng.uniform(4, 10, n), rng.randint(1, 11, n), rng.randint(1, 11, n),
+        rng.randint(1, 11, n), rng.uniform(0, 10, n), rng.randint(1, 11, n),
+    ])
+    risk = X[:, 0] / 70 + (10 - X[:, 1]) / 6 + X[:, 2] / 10 - X[:, 6] / 20 + rng.normal(0, 0.2, n)
+    return X, (risk > np.median(risk)).astype(int)
+
+
+def test_grid_expands_every_family():
+    grid = candidate_grid(["decision_tree", "logistic_regression"])
+    assert [family for family, _ in grid] == ["decision_tree"] * 3 + ["logistic_regression"] * 3
+    try:
+        candidate_grid(["svm"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown family should be rejected")
+
+
+def test_selects_most_accurate_within_budget():
+    X, y = survey_data()
+    best, results = select_model(X, y, latency_budget_ms=50.0, folds=3, n_jobs=2,
+                                 families=["decision_tree", "logistic_regression"])
+    assert len(results) == 6
+    assert best is results[0] and best["within_budget"]
+    assert best["cv_accuracy"] == max(r["cv_accuracy"] for r in results if r["within_budget"])
+    assert best["single_p99_ms"] >= best["single_p50_ms"] > 0
+    assert "model" not in report_row(best)
+
+
+def test_falls_back_when_nothing_fits_the_budget():
+    X, y = survey_data()
+    best, results = select_model(X, y, latency_budget_ms=0.0, folds=3, n_jobs=1, families=["decision_tree"])
+    assert not any(r["within_budget"] for r in results)
+    assert best["cv_accuracy"] == max(r["cv_accuracy"] for r in results)
+
+
+if __name__ == "__main__":
+    test_grid_expands_every_family()
+    test_selects_most_accurate_within_budget()
+    test_falls_back_when_nothing_fits_the_budget()
+    print("Model selection checks passed")
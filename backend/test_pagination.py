@@ -0,0 +1,137 @@
+"""
+Checks keyset pagination and field projection on the history endpoints
+(predictions, chat history, goals, mood entries) against a temporary
+SQLite file, and measures payload size and query time per page.
+Run: python test_pagination.py
+"""
+import time
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from conftest import TempDatabase
+from models.user import Base
+from models.chat_history import ChatHistory
+from models.coaching import Goal
+from models.mood import MoodEntry
+from models.prediction import Prediction
+from routes import chatbot_routes, gamification_routes, mood_routes, prediction_routes
+from services.database import ensure_indexes, get_async_db
+from services.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+FEATURES = {
+    "work_hours_per_week": 50, "sleep_hours_per_day": 6, "stress_level": 7, "job_satisfaction": 5,
+    "work_life_balance": 4, "physical_activity_hours": 2, "social_support": 6,
+}
+
+
+def _client(database: TempDatabase, user_id: int = 1, rows: int = 25, other_rows: int = 5):
+    """App with the history routers on a seeded database; every 3 rows share a timestamp"""
+    start = datetime(2026, 3, 1)
+    with database.engine.begin() as conn:
+        for uid, count in ((user_id, rows), (user_id + 1, other_rows)):
+            stamps = [start + timedelta(hours=i // 3) for i in range(count)]
+            conn.execute(Prediction.__table__.insert(), [
+                {"user_id": uid, "burnout_score": float(i % 10), "risk_level": "medium",
+                 "input_features": FEATURES, "recommendations": ["Rest"] * 5, "created_at": at}
+                for i, at in enumerate(stamps)])
+            conn.execute(ChatHistory.__table__.insert(), [
+                {"user_id": uid, "message": f"m{i}", "response": "r", "sentiment": "neutral", "created_at": at}
+                for i, at in enumerate(stamps)])
+            conn.execute(Goal.__table__.insert(), [
+                {"user_id": uid, "title": f"g{i}", "category": "personal", "is_completed": False, "created_at": at}
+                for i, at in enumerate(stamps)])
+            conn.execute(MoodEntry.__table__.insert(), [
+                {"user_id": uid, "mood_category": "okay", "created_at": at} for at in stamps])
+    AsyncSession = database.AsyncSession
+
+    async def override():
+        async with AsyncSession() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(prediction_routes.router, prefix="/api/predictions")
+    app.include_router(chatbot_routes.router, prefix="/api/chatbot")
+    app.include_router(gamification_routes.router, prefix="/api/gamification")
+    app.include_router(mood_routes.router, prefix="/api/mood")
+    app.dependency_overrides[get_async_db] = override
+    return TestClient(app)
+
+
+def _walk(client, path: str, limit: int, **params):
+    pages, cursor = [], None
+    while True:
+        query = {"limit": limit, **params}
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get(path, params=query)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return pages
+
+
+def test_cursor_round_trip():
+    at = datetime(2026, 3, 1, 12, 30, 5, 123456)
+    assert decode_cursor(encode_cursor(at, 42)) == (at, 42)
+
+
+def test_pages_cover_every_row_once_in_order():
+    with TempDatabase() as database, _client(database) as client:
+        for path in ("/api/predictions/user/1", "/api/chatbot/history/1",
+                     "/api/gamification/goals/1", "/api/mood/history/1"):
+            pages = _walk(client, path, limit=4)
+            rows = [row for page in pages for row in page]
+            assert [len(page) for page in pages] == [4] * 6 + [1], path
+            keys = [(row["created_at"], row["id"]) for row in rows]
+            assert keys == sorted(keys, reverse=True), path
+            assert len(set(keys)) == 25, path
+
+
+def test_projection_returns_only_requested_fields():
+    with TempDatabase() as database, _client(database) as client:
+        pages = _walk(client, "/api/predictions/user/1", limit=10, fields="burnout_score,risk_level")
+        assert sum(len(page) for page in pages) == 25
+        assert set(pages[0][0]) == {"id", "created_at", "burnout_score", "risk_level"}
+
+        response = client.get("/api/chatbot/history/1", params={"fields": "message,secret"})
+        assert response.status_code == 400 and "secret" in response.json()["detail"]
+
+
+def test_bad_cursor_is_rejected():
+    with TempDatabase() as database, _client(database) as client:
+        response = client.get("/api/gamification/goals/1", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+
+def benchmark(rows: int = 5000, limit: int = 50):
+    with TempDatabase() as database, _client(database, rows=rows) as client:
+        ensure_indexes(Base.metadata, database.engine)
+
+        def timed(params, repeat=20):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                response = client.get("/api/predictions/user/1", params=params)
+            return (time.perf_counter() - started) / repeat * 1000, len(response.content), response
+
+        full_ms, full_bytes, _ = timed({"limit": 500}, repeat=5)
+        first_ms, first_bytes, first = timed({"limit": limit})
+        lean_ms, lean_bytes, _ = timed({"limit": limit, "fields": "burnout_score,risk_level"})
+        deep_cursor = encode_cursor(datetime(2026, 3, 1) + timedelta(hours=(rows - 100) // 3 // 2), 10)
+        deep_ms, _, _ = timed({"limit": limit, "cursor": deep_cursor})
+
+    print(f"GET /api/predictions/user/1 with {rows} predictions")
+    print(f"  limit=500 full rows          {full_ms:7.2f} ms  {full_bytes / 1024:7.1f} KiB")
+    print(f"  limit={limit} first page        {first_ms:7.2f} ms  {first_bytes / 1024:7.1f} KiB")
+    print(f"  limit={limit} deep cursor page  {deep_ms:7.2f} ms")
+    print(f"  limit={limit} score/risk only   {lean_ms:7.2f} ms  {lean_bytes / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    test_cursor_round_trip()
+    test_pages_cover_every_row_once_in_order()
+    test_projection_returns_only_requested_fields()
+    test_bad_cursor_is_rejected()
+    print("pagination checks passed")
+    benchmark()
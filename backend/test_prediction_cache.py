@@ -0,0 +1,202 @@
+"""
+Checks the prediction result cache (exact and quantized keys, model-version
+invalidation, LRU bound, scoring what was entered, keying results on the
+model that scored them) and measures hit rate and latency on survey-like
+inputs: integer sliders and mostly whole-number hours.
+Run: python test_prediction_cache.py
+"""
+import time
+import random
+from conftest import TempDatabase
+from models.user import User
+from schemas.prediction import PredictionInput
+from services.prediction_cache import PredictionCache, prediction_cache
+from services.prediction_service import PredictionService, PREDICTION_BATCHER
+from ml.registry import RULES_VERSION, model_registry
+
+BASE = {
+    "work_hours_per_week": 45, "sleep_hours_per_day": 7, "stress_level": 6, "job_satisfaction": 7,
+    "work_life_balance": 6, "physical_activity_hours": 3, "social_support": 8,
+}
+
+
+def survey_answers(n: int, people: int = 300, seed: int = 3):
+    """Weekly check-ins: each person mostly repeats last week's answers"""
+    rng = random.Random(seed)
+    profiles = [
+        {
+            "work_hours_per_week": rng.choice([35, 40, 40, 45, 50, 55, 60]),
+            "sleep_hours_per_day": rng.choice([5, 6, 6.5, 7, 7, 8]),
+            "stress_level": rng.randint(4, 8),
+            "job_satisfaction": rng.randint(4, 8),
+            "work_life_balance": rng.randint(4, 7),
+            "physical_activity_hours": rng.choice([0, 1, 2, 3]),
+            "social_support": rng.randint(5, 8),
+        }
+        for _ in range(people)
+    ]
+    answers = []
+    for _ in range(n):
+        person = rng.randrange(people)
+        if rng.random() < 0.2:
+            profiles[person] = {**profiles[person], "stress_level": rng.randint(3, 9)}
+        answers.append(dict(profiles[person]))
+    return answers
+
+
+def test_keys_are_exact_unless_quantized():
+    exact = PredictionCache()
+    near = {**BASE, "sleep_hours_per_day": 7.04}
+    assert exact.key(BASE) == exact.key({**BASE, "sleep_hours_per_day": 7.0})
+    assert exact.key(BASE) != exact.key(near)
+
+    coarse = PredictionCache(quantum=0.1)
+    assert coarse.key(BASE) == coarse.key(near)
+    coarse.put(BASE, "v1", (42.0, "medium", ["tip"]))
+    assert coarse.get(near, "v1") == (42.0, "medium", ["tip"])
+    assert coarse.get({**BASE, "sleep_hours_per_day": 7.2}, "v1") is None
+
+
+def test_model_change_invalidates():
+    cache = PredictionCache()
+    cache.put(BASE, "v1", (42.0, "medium", []))
+    assert cache.get(BASE, "v2") is None
+    assert cache.stats()["entries"] == 0 and cache.stats()["invalidations"] == 1
+    assert cache.get(BASE, "v1") is None
+
+
+def test_lru_bound_and_copies():
+    cache = PredictionCache(max_entries=2)
+    inputs = [{**BASE, "stress_level": s} for s in (1, 2, 3)]
+    for features in inputs:
+        cache.put(features, "v", (1.0, "low", ["a"]))
+    assert cache.get(inputs[0], "v") is None
+    hit = cache.get(inputs[2], "v")
+    hit[2].append("mutated")
+    assert cache.get(inputs[2], "v")[2] == ["a"]
+
+
+def test_misses_score_the_features_as_entered():
+    async def check(service):
+        features = {**BASE, "sleep_hours_per_day": 5.96}
+        prediction = await service.create_prediction(1, PredictionInput(**features))
+        assert prediction.burnout_score == service.predictor.predict(features)[0]
+        assert "Prioritize getting 7-8 hours of sleep per night" in prediction.recommendations
+        batch = await service.create_predictions(1, [PredictionInput(**{**features, "work_hours_per_week": 50.04})])
+        assert "Try to reduce work hours and set boundaries" in batch[0].recommendations
+
+    _run(check)
+
+
+def test_hits_skip_inference_and_recommendations():
+    async def check(service):
+        calls = {"predict": 0, "recommend": 0}
+        score_batch, recommend = PREDICTION_BATCHER.score_batch, service._generate_recommendations
+
+        def counting_score(records):
+            calls["predict"] += len(records)
+            return score_batch(records)
+
+        def counting_recommend(risk_level, features):
+            calls["recommend"] += 1
+            return recommend(risk_level, features)
+
+        PREDICTION_BATCHER.score_batch = counting_score
+        service._generate_recommendations = counting_recommend
+        try:
+            first = await service.create_prediction(1, PredictionInput(**BASE))
+            second = await service.create_prediction(1, PredictionInput(**BASE))
+        finally:
+            PREDICTION_BATCHER.score_batch = score_batch
+        assert calls == {"predict": 1, "recommend": 1}
+        assert (first.burnout_score, first.recommendations) == (second.burnout_score, second.recommendations)
+
+    _run(check)
+
+
+def test_results_are_cached_under_the_model_that_scored_them():
+    async def check(service):
+        score_batch = PREDICTION_BATCHER.score_batch
+        # The registry swapped models between the service starting and the batch flushing
+        PREDICTION_BATCHER.score_batch = lambda records: [(42.0, "medium", "swapped") for _ in records]
+        try:
+            prediction = await service.create_prediction(1, PredictionInput(**BASE))
+        finally:
+            PREDICTION_BATCHER.score_batch = score_batch
+        assert prediction.burnout_score == 42.0
+        assert prediction_cache.get(BASE, "swapped")[0] == 42.0
+        assert service.model_version != "swapped"
+        assert prediction_cache.get(BASE, service.model_version) is None
+
+    _run(check)
+
+
+def test_worker_without_the_model_fails_loudly():
+    model_registry.load()
+
+    async def check(service):
+        assert service.model_version != RULES_VERSION
+        score_batch = PREDICTION_BATCHER.score_batch
+        # What a process worker that never loaded the model returns
+        PREDICTION_BATCHER.score_batch = lambda records: [(66.5, "medium", RULES_VERSION) for _ in records]
+        try:
+            await service.create_prediction(1, PredictionInput(**BASE))
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("a rule-based score was accepted while a model is loaded")
+        finally:
+            PREDICTION_BATCHER.score_batch = score_batch
+        assert prediction_cache.stats()["entries"] == 0
+
+    _run(check)
+
+
+def _run(check):
+    """Await check(service) with a fresh PredictionService, cache and user 1"""
+    prediction_cache.clear()
+    with TempDatabase() as database:
+        with database.Session() as db:
+            db.add(User(id=1, email="cache@example.com", username="cache", hashed_password="x"))
+            db.commit()
+        database.run(lambda db: check(PredictionService(db)))
+
+
+def benchmark():
+    model_registry.load()
+    answers = survey_answers(5000)
+    cache = PredictionCache()
+    service = PredictionService(None)  # scoring helpers only; no session
+    version = service.model_version
+
+    def score(features):
+        if cache.get(features, version) is None:
+            burnout_score, risk_level = service.predictor.predict(features)
+            cache.put(features, version, (burnout_score, risk_level,
+                                          service._generate_recommendations(risk_level, features)))
+
+    started = time.perf_counter()
+    for features in answers:
+        burnout_score, risk_level = service.predictor.predict(features)
+        service._generate_recommendations(risk_level, features)
+    uncached = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for features in answers:
+        score(features)
+    cached = time.perf_counter() - started
+    stats = cache.stats()
+    print(f"{len(answers)} survey answers: uncached {uncached * 1000:7.1f} ms | cached {cached * 1000:7.1f} ms | "
+          f"hit rate {stats['hit_rate']:.1%} ({stats['entries']} distinct)")
+
+
+if __name__ == "__main__":
+    test_keys_are_exact_unless_quantized()
+    test_model_change_invalidates()
+    test_lru_bound_and_copies()
+    test_misses_score_the_features_as_entered()
+    test_hits_skip_inference_and_recommendations()
+    test_results_are_cached_under_the_model_that_scored_them()
+    test_worker_without_the_model_fails_loudly()
+    print("Prediction cache checks passed")
+    benchmark()
@@ -0,0 +1,61 @@
+"""
+Checks for the LLM reply cache (reply pool, TTL, LRU, distress bypass and
+the name placeholder).
+Run: python test_reply_cache.py
+"""
+from conftest import FakeClock
+from chatbot.reply_cache import ReplyCache, is_distress
+
+USER = {"name": "Sam", "mood": "tired", "stress": 8}
+
+
+def test_pool_fills_before_serving():
+    cache = ReplyCache(pool_size=2)
+    key = cache.key_for(USER, "How do I stop procrastinating?")
+    assert cache.get(key, USER) is None
+    cache.put(key, USER, "one")
+    assert cache.get(key, USER) is None  # pool not full yet
+    cache.put(key, USER, "two")
+    cache.put(key, USER, "three")  # pool is full; dropped
+    assert {cache.get(key, USER) for _ in range(30)} == {"one", "two"}
+    assert cache.key_for(USER, "how do i stop  procrastinating") == key
+    assert cache.key_for({**USER, "stress": 2}, "How do I stop procrastinating?") != key
+    assert cache.key_for(USER, "How do I stop procrastinating?", has_context=True) is None
+
+
+def test_ttl_expiry_and_lru_eviction():
+    clock = FakeClock()
+    cache = ReplyCache(max_entries=2, ttl_seconds=60, pool_size=1, clock=clock)
+    keys = [cache.key_for(USER, f"question number {i}") for i in range(3)]
+    cache.put(keys[0], USER, "a")
+    clock.now = 61
+    assert cache.get(keys[0], USER) is None
+    for key in keys:
+        cache.put(key, USER, "b")
+    assert cache.stats()["entries"] == 2 and cache.stats()["evictions"] == 1
+    assert cache.get(keys[0], USER) is None and cache.get(keys[2], USER) == "b"
+
+
+def test_distress_messages_are_never_cached():
+    cache = ReplyCache()
+    for message in ("I feel like dying", "I don't want to be here anymore", "thinking about an overdose",
+                    "I want to die", "there's nothing to live for"):
+        assert is_distress(message), message
+        assert cache.key_for(USER, message) is None, message
+    assert cache.stats()["bypassed_distress"] == 5
+    assert not is_distress("I have a deadline tomorrow")
+
+
+def test_name_is_replaced_as_a_whole_word():
+    cache = ReplyCache(pool_size=1)
+    key = cache.key_for({"name": "Al"}, "any tips for focus?")
+    cache.put(key, {"name": "Al"}, "Also, Al, try a timer. Good luck Al!")
+    assert cache.get(key, {"name": "Bob"}) == "Also, Bob, try a timer. Good luck Bob!"
+
+
+if __name__ == "__main__":
+    test_pool_fills_before_serving()
+    test_ttl_expiry_and_lru_eviction()
+    test_distress_messages_are_never_cached()
+    test_name_is_replaced_as_a_whole_word()
+    print("Reply cache checks passed.")
@@ -0,0 +1,36 @@
+"""
+Checks which messages the reply router answers from local templates: only
+short small talk; negated, emotional or distress messages go to the LLM.
+Run: python test_router.py
+"""
+from chatbot.router import ReplyRouter
+
+USER = {"name": "Sam", "stress": 5}
+
+
+def test_small_talk_is_served_locally():
+    router = ReplyRouter()
+    for message in ("hi", "Hello!", "ok", "yes please", "thanks", "bye"):
+        assert router.route(USER, message), message
+    assert router.stats()["served_locally"] == 6
+
+
+def test_negated_and_emotional_messages_go_to_llm():
+    router = ReplyRouter()
+    for message in ("I'm not ok", "I am not okay", "not ok", "I’m not ok", "im not okay",
+                    "never ok", "no, I don't", "I feel sad", "hey, I'm so overwhelmed",
+                    "hi, I want to die", "thanks, I feel like dying", "okay I need help"):
+        assert router.route(USER, message) is None, message
+    assert router.stats()["served_locally"] == 0
+
+
+def test_long_or_disabled_goes_to_llm():
+    assert ReplyRouter(max_words=3).route(USER, "hi hi hi hi there") is None
+    assert ReplyRouter(enabled=False).route(USER, "hi") is None
+
+
+if __name__ == "__main__":
+    test_small_talk_is_served_locally()
+    test_negated_and_emotional_messages_go_to_llm()
+    test_long_or_disabled_goes_to_llm()
+    print("Router checks passed.")
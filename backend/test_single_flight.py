@@ -0,0 +1,117 @@
+"""
+Checks for the single-flight de-duplication of concurrent async calls
+(coalescing, the result window, failures and cancellation).
+Run: python test_single_flight.py
+"""
+import asyncio
+
+from conftest import FakeClock
+from services.single_flight import SingleFlight
+
+
+class Counter:
+    """An async call that records how often it ran and can be held open"""
+
+    def __init__(self, result="done", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return f"{self.result}-{self.calls}"
+
+
+async def _started(*tasks):
+    """Let the tasks run until they are all waiting"""
+    for _ in range(3):
+        await asyncio.sleep(0)
+    return tasks
+
+
+def test_concurrent_calls_share_one_run():
+    async def run():
+        flight = SingleFlight(window=0)
+        fn, other_fn = Counter("k"), Counter("other")
+        tasks = await _started(*(asyncio.create_task(flight.do("k", fn)) for _ in range(5)))
+        other = asyncio.create_task(flight.do("other", other_fn))
+        await _started(other)
+        assert flight.stats()["in_flight"] == 2
+        fn.release.set()
+        other_fn.release.set()
+        assert await asyncio.gather(*tasks, other) == ["k-1"] * 5 + ["other-1"]
+        assert flight.stats() == {"in_flight": 0, "calls": 2, "shared": 4}
+    asyncio.run(run())
+
+
+def test_window_reuses_finished_results():
+    async def run():
+        clock = FakeClock()
+        flight = SingleFlight(window=5, clock=clock)
+        fn = Counter()
+        fn.release.set()
+        assert await flight.do("k", fn) == "done-1"
+        clock.now = 4
+        assert await flight.do("k", fn) == "done-1"
+        clock.now = 6
+        assert await flight.do("k", fn) == "done-2"
+    asyncio.run(run())
+
+
+def test_failure_reaches_every_caller_and_is_not_kept():
+    async def run():
+        flight = SingleFlight(window=5, clock=FakeClock())
+        fn = Counter(error=ValueError("boom"))
+        tasks = await _started(*(asyncio.create_task(flight.do("k", fn)) for _ in range(3)))
+        fn.release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results) and fn.calls == 1
+
+        fn.error = None
+        assert await flight.do("k", fn) == "done-2"
+    asyncio.run(run())
+
+
+def test_cancelled_leader_hands_over_to_a_follower():
+    async def run():
+        flight = SingleFlight(window=0)
+        fn = Counter()
+        leader = asyncio.create_task(flight.do("k", fn))
+        await _started(leader)
+        followers = await _started(*(asyncio.create_task(flight.do("k", fn)) for _ in range(3)))
+        leader.cancel()
+        await _started(*followers)
+        fn.release.set()
+        results = await asyncio.gather(*followers)
+        assert leader.cancelled()
+        assert results == ["done-2"] * 3 and fn.calls == 2
+    asyncio.run(run())
+
+
+def test_cancelled_follower_leaves_the_leader_running():
+    async def run():
+        flight = SingleFlight(window=0)
+        fn = Counter()
+        leader = asyncio.create_task(flight.do("k", fn))
+        await _started(leader)
+        follower = asyncio.create_task(flight.do("k", fn))
+        await _started(follower)
+        follower.cancel()
+        await _started(follower)
+        fn.release.set()
+        assert await leader == "done-1"
+        assert follower.cancelled()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_run()
+    test_window_reuses_finished_results()
+    test_failure_reaches_every_caller_and_is_not_kept()
+    test_cancelled_leader_hands_over_to_a_follower()
+    test_cancelled_follower_leaves_the_leader_running()
+    print("Single-flight checks passed.")
@@ -1,16 +1,30 @@
 """
 Training Script for Burnout Prediction Model
-Reads dataset.csv, trains logistic regression, and saves burnout.pkl
+Reads dataset.csv, searches several model families in parallel, picks the
+most accurate model within an inference latency budget and saves burnout.pkl
+plus the memory-mapped burnout_model/ artifact. Only tree models have an
+artifact form: if another family wins, the old artifact is moved aside and
+the run fails, so MODEL_PATH never keeps serving an older model.
+
+Usage:
+    python training.py [--data dataset.csv] [--latency-budget-ms 1.0]
+                       [--families random_forest extra_trees ...] [--jobs -1]
+
+For CSVs too large to load at once, --stream trains chunk by chunk
+(incremental scaler + SGD logistic regression) with flat peak memory:
+    python training.py --stream --data surveys.csv [--chunksize 100000] [--epochs 3]
 """
 
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import joblib
+import json
 import os
+import sys
+import shutil
+import argparse
 
 def load_data(filepath='dataset.csv'):
     """Load the dataset from CSV file"""
@@ -70,33 +84,6 @@ def prepare_features(df):
     
     return X, y, feature_columns
 
-def train_model(X_train, y_train, feature_columns=None):
-    """Train Random Forest model and analyze feature importance"""
-    print("\n🤖 Training Random Forest model...")
-    
-    # Initialize and train the model
-    model = RandomForestClassifier(
-        n_estimators=100,
-        max_depth=10,
-        random_state=42
-    )
-    
-    model.fit(X_train, y_train)
-    
-    print("✅ Model trained successfully!")
-    
-    # Feature Importance Analysis
-    if feature_columns:
-        print("\n📈 Feature Importance:")
-        importances = model.feature_importances_
-        indices = np.argsort(importances)[::-1]
-        
-        for f in range(len(feature_columns)):
-            idx = indices[f]
-            print(f"   {f+1}. {feature_columns[idx]}: {importances[idx]:.4f}")
-            
-    return model
-
 def evaluate_model(model, X_test, y_test):
     """Evaluate the trained model"""
     print("\n📊 Evaluating model performance...")
@@ -137,15 +124,110 @@ def save_model(model, scaler, feature_columns, filepath='burnout.pkl'):
     print(f"   File: {filepath}")
     print(f"   Size: {file_size:.2f} KB")
 
+def retire_artifact(directory):
+    """Move a memory-mapped artifact that no longer matches burnout.pkl out of MODEL_PATH's way"""
+    if not os.path.isdir(directory):
+        return None
+    stale = directory.rstrip(os.sep) + ".stale"
+    shutil.rmtree(stale, ignore_errors=True)
+    os.replace(directory, stale)
+    print(f"⚠️  Moved the previous artifact {directory}/ to {stale}/: it holds an older model")
+    return stale
+
+def select_best_model(X_train, y_train, latency_budget_ms, folds=5, n_jobs=-1, families=None):
+    """Parallel cross-validated search over model families, latency-aware"""
+    from ml.selection import select_model
+    
+    print(f"\n🔎 Searching models (p99 single-row budget: {latency_budget_ms} ms)...")
+    best, results = select_model(
+        X_train, y_train, latency_budget_ms=latency_budget_ms, folds=folds, n_jobs=n_jobs, families=families
+    )
+    
+    print(f"\n   {'family':<20} {'params':<50} {'cv acc':>7} {'p99 ms':>8} {'batch µs/row':>13}")
+    for r in results:
+        params = ", ".join(f"{k}={v}" for k, v in sorted(r["params"].items()))
+        flag = "" if r["within_budget"] else "  (over budget)"
+        print(f"   {r['family']:<20} {params:<50} {r['cv_accuracy']:>7.4f} {r['single_p99_ms']:>8.3f} "
+              f"{r['batch_us_per_row']:>13.3f}{flag}")
+    
+    if not best["within_budget"]:
+        print("\n⚠️  No candidate met the latency budget; using the most accurate one anyway")
+    print(f"\n✅ Selected {best['family']} {best['params']}")
+    return best, results
+
+def write_report(path, best, results, test_accuracy, latency_budget_ms, feature_columns):
+    """Write the selection metrics report as JSON"""
+    from ml.selection import report_row
+    
+    report = {
+        "latency_budget_ms": latency_budget_ms,
+        "feature_columns": feature_columns,
+        "selected": {**report_row(best), "test_accuracy": test_accuracy},
+        "candidates": [report_row(r) for r in results],
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📝 Metrics report written to {path}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the burnout prediction model")
+    parser.add_argument("--data", default="dataset.csv", help="training CSV")
+    parser.add_argument("--output", default="burnout.pkl", help="joblib model file to write")
+    parser.add_argument("--artifact", default="burnout_model", help="memory-mapped artifact directory to write")
+    parser.add_argument("--report", default="training_report.json", help="metrics report to write")
+    parser.add_argument("--latency-budget-ms", type=float,
+                        default=float(os.getenv("TRAIN_LATENCY_BUDGET_MS", "1.0")),
+                        help="max p99 single-row inference latency for the selected model")
+    parser.add_argument("--families", nargs="+", default=None,
+                        help="model families to search (default: all)")
+    parser.add_argument("--folds", type=int, default=5, help="cross-validation folds")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel workers (-1 = all cores)")
+    parser.add_argument("--stream", action="store_true", help="out-of-core training for large CSVs")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows per chunk in --stream mode")
+    parser.add_argument("--epochs", type=int, default=3, help="passes over the data in --stream mode")
+    return parser.parse_args()
+
+def train_streaming_model(args):
+    """Out-of-core pipeline: never holds more than one chunk of the CSV in memory"""
+    import resource
+    from ml.streaming import FEATURE_COLUMNS, train_streaming
+    
+    if not os.path.exists(args.data):
+        raise FileNotFoundError(f"Dataset file '{args.data}' not found!")
+    
+    print(f"🌊 Streaming {args.data} in chunks of {args.chunksize:,} rows ({args.epochs} epochs)...")
+    model, scaler, metrics = train_streaming(args.data, chunksize=args.chunksize, epochs=args.epochs)
+    # ru_maxrss is KB on Linux
+    metrics["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    
+    print(f"✅ Trained on {metrics['rows']:,} rows in {metrics['seconds']:.1f}s")
+    print(f"   Throughput: {metrics['rows_per_second']:,} rows/s")
+    print(f"   Peak memory: {metrics['peak_rss_mb']} MB")
+    print(f"   Holdout accuracy: {metrics['test_accuracy']:.4f} on {metrics['test_rows']:,} rows")
+    
+    save_model(model, scaler, FEATURE_COLUMNS, args.output)
+    with open(args.report, "w") as f:
+        json.dump({"mode": "stream", "estimator": type(model).__name__, **metrics}, f, indent=2)
+    print(f"📝 Metrics report written to {args.report}")
+    
+    # SGD models have no memory-mapped form; an old artifact would keep being served
+    retire_artifact(args.artifact)
+    print(f"   Serve this model with MODEL_PATH={args.output}")
+
 def main():
     """Main training pipeline"""
+    args = parse_args()
     print("\n" + "="*60)
     print("  BURNOUT PREDICTION MODEL TRAINING")
     print("="*60 + "\n")
     
     try:
+        if args.stream:
+            train_streaming_model(args)
+            return
+        
         # 1. Load data
-        df = load_data('dataset.csv')
+        df = load_data(args.data)
         
         # 2. Prepare features
         X, y, feature_columns = prepare_features(df)
@@ -158,27 +240,38 @@ def main():
         print(f"   Training set: {len(X_train)} samples")
         print(f"   Test set: {len(X_test)} samples")
         
-        # 4. Scale features
-        print("\n⚖️  Scaling features...")
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        print("✅ Features scaled!")
-        
-        # 5. Train model
-        model = train_model(X_train_scaled, y_train, feature_columns)
+        # 4. Search models (each candidate is scaled inside its own CV folds)
+        best, results = select_best_model(
+            X_train.to_numpy(dtype=np.float64), y_train.to_numpy(),
+            args.latency_budget_ms, folds=args.folds, n_jobs=args.jobs, families=args.families
+        )
+        model, scaler = best["model"], best["scaler"]
         
-        # 6. Evaluate model
+        # 5. Evaluate model
+        X_test_scaled = scaler.transform(X_test.to_numpy(dtype=np.float64))
         accuracy = evaluate_model(model, X_test_scaled, y_test)
         
-        # 7. Save model
-        save_model(model, scaler, feature_columns, 'burnout.pkl')
+        # 6. Save model and report
+        save_model(model, scaler, feature_columns, args.output)
+        write_report(args.report, best, results, accuracy, args.latency_budget_ms, feature_columns)
+        
+        # 7. Export the memory-mapped artifact; never leave an older one in its place
+        from ml.artifact import convert
+        try:
+            manifest = convert(args.output, args.artifact)
+        except ValueError as e:
+            retire_artifact(args.artifact)
+            raise RuntimeError(
+                f"No memory-mapped artifact for this model ({e}). Serve it with MODEL_PATH={args.output}, "
+                f"or retrain with --families random_forest extra_trees decision_tree"
+            ) from e
+        print(f"✅ Memory-mapped artifact {manifest['version']} written to {args.artifact}/")
         
         print("\n" + "="*60)
         print("  ✅ TRAINING COMPLETED SUCCESSFULLY!")
         print("="*60)
         print("\n📝 Next steps:")
-        print("   1. Use 'burnout.pkl' in your FastAPI application")
+        print(f"   1. Use '{args.output}' or '{args.artifact}/' (MODEL_PATH) in your FastAPI application")
         print("   2. The model expects these features in order:")
         for i, col in enumerate(feature_columns, 1):
             print(f"      {i}. {col}")
@@ -197,11 +290,13 @@ def main():
         print("   - physical_activity_hours")
         print("   - family_support")
         print("   - burnout (target: 0 or 1)")
+        sys.exit(1)
         
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
         import traceback
         traceback.print_exc()
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()